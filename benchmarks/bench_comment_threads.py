@@ -0,0 +1,136 @@
+"""
+Measure the threaded comment reads on wide threads (many replies to one comment) and deep
+threads (long reply chains), against loading every comment of the post.
+
+Seeds the comments inside a transaction on the first post of the database configured in .env
+and rolls it back at the end:
+
+    python -m benchmarks.bench_comment_threads --threads 200 --width 500 --chains 20 --depth 64
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select, text
+
+from database.db import sessionmanager
+from src.comments.repository import CommentRepository
+from src.posts.models import Post
+
+SET_PATHS = """
+    UPDATE comments c
+    SET path = COALESCE((SELECT p.path FROM comments p WHERE p.id = c.parent_id), '') || lpad(c.id::text, 10, '0') || '/'
+    WHERE c.path = ''
+"""
+
+RECURSIVE_SUBTREE = """
+    WITH RECURSIVE subtree AS (
+        SELECT id, ARRAY[id] AS sort_key FROM comments WHERE parent_id = :root
+        UNION ALL
+        SELECT c.id, s.sort_key || c.id FROM comments c JOIN subtree s ON c.parent_id = s.id
+    )
+    SELECT comments.* FROM subtree JOIN comments USING (id) ORDER BY sort_key LIMIT :limit
+"""
+
+
+async def seed(session, post_id: int, user_id: int, threads: int, width: int, chains: int, depth: int) -> tuple:
+    started = time.perf_counter()
+    params = {"post_id": post_id, "user_id": user_id}
+    insert = """
+        INSERT INTO comments (post_id, user_id, comment, comment_hash, parent_id, path, depth, reply_count, created_at, updated_at)
+    """
+    await session.execute(text(insert + """
+        SELECT :post_id, :user_id, 'bench-wide', repeat('0', 64), NULL, '', 0, :width, now() - g * interval '1 second', now()
+        FROM generate_series(1, :threads) g
+    """), {**params, "threads": threads, "width": width})
+    await session.execute(text(insert + """
+        SELECT :post_id, :user_id, 'bench-deep', repeat('0', 64), NULL, '', 0, 1, now() - interval '1 day', now()
+        FROM generate_series(1, :chains) g
+    """), {**params, "chains": chains})
+    await session.execute(text(SET_PATHS))
+
+    await session.execute(text(insert + """
+        SELECT p.post_id, p.user_id, 'bench-reply', repeat('0', 64), p.id, '', 1, 0, now(), now()
+        FROM comments p CROSS JOIN generate_series(1, :width) g
+        WHERE p.post_id = :post_id AND p.comment = 'bench-wide'
+    """), {**params, "width": width})
+    await session.execute(text(SET_PATHS))
+
+    tips = (await session.execute(text(
+        "SELECT id FROM comments WHERE post_id = :post_id AND comment = 'bench-deep'"
+    ), params)).scalars().all()
+    deep_root = tips[0]
+    for level in range(1, depth + 1):
+        tips = (await session.execute(text(insert + """
+            SELECT post_id, user_id, 'bench-chain', repeat('0', 64), id, '', :level, :replies, now(), now()
+            FROM comments WHERE id = ANY(:tips) RETURNING id
+        """), {"tips": list(tips), "level": level, "replies": int(level < depth)})).scalars().all()
+        await session.execute(text(SET_PATHS))
+
+    await session.execute(text("ANALYZE comments"))
+    wide_root = (await session.execute(text(
+        "SELECT min(id) FROM comments WHERE post_id = :post_id AND comment = 'bench-wide'"
+    ), params)).scalar_one()
+    rows = threads * (width + 1) + chains * (depth + 1)
+    print(f"Seeded {rows} comments in {time.perf_counter() - started:.1f}s")
+    return wide_root, deep_root
+
+
+async def measure(session, name: str, read, rounds: int) -> None:
+    rows = len(await read())
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await read()
+        session.expunge_all()
+    elapsed = (time.perf_counter() - started) / rounds * 1000
+    print(f"{name:<48}{rows:>8} rows{elapsed:>10.2f} ms")
+
+
+async def main(threads: int, width: int, chains: int, depth: int, rounds: int) -> None:
+    async with sessionmanager.session() as session:
+        post = (await session.execute(select(Post.id, Post.user_id).limit(1))).first()
+        if post is None:
+            print("The database has no posts")
+            return
+        wide_root, deep_root = await seed(session, post.id, post.user_id, threads, width, chains, depth)
+        repository = CommentRepository(session)
+
+        async def threads_page():
+            comments = await repository.get_top_level_comments(post.id, 20)
+            replies = await repository.get_first_replies([comment.id for comment in comments], 3)
+            return comments + replies
+
+        async def last_replies():
+            after_id = (await session.execute(text(
+                "SELECT id FROM comments WHERE parent_id = :root ORDER BY id DESC OFFSET 50 LIMIT 1"
+            ), {"root": wide_root})).scalar_one()
+            return await repository.get_replies(wide_root, 50, after_id)
+
+        async def subtree():
+            root = await repository.get_comment_by_id(deep_root)
+            return await repository.get_subtree(root, depth)
+
+        async def recursive_subtree():
+            return (await session.execute(text(RECURSIVE_SUBTREE), {"root": deep_root, "limit": depth})).all()
+
+        async def every_comment():
+            return await repository.get_comment_by_post_all(post.id, threads * (width + 1) + chains * (depth + 1), 0)
+
+        await measure(session, "20 threads with 3 replies each (2 queries)", threads_page, rounds)
+        await measure(session, "last 50 replies of a wide thread (cursor)", last_replies, rounds)
+        await measure(session, "deep reply chain (materialized path)", subtree, rounds)
+        await measure(session, "deep reply chain (recursive CTE)", recursive_subtree, rounds)
+        await measure(session, "every comment of the post", every_comment, max(rounds // 20, 1))
+
+        await session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--width", type=int, default=500)
+    parser.add_argument("--chains", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.threads, args.width, args.chains, args.depth, args.rounds))
@@ -0,0 +1,145 @@
+"""
+Compare the JSON encoders of the list endpoints and the size of their pages on the wire.
+
+Builds synthetic pages of the maximum size for ``GET /posts``, ``GET /comments/{post_id}``
+and ``GET /admin/user/search`` and measures the CPU time of encoding them through
+``jsonable_encoder`` + ``json.dumps`` (the stock ``JSONResponse`` path), ``json.dumps`` alone
+and ``orjson``, followed by the gzip and brotli sizes at the configured levels:
+
+    python -m benchmarks.bench_json_encoding --pages 100 500 --rounds 50
+"""
+import argparse
+import json
+import time
+import zlib
+from datetime import datetime, timedelta
+
+import orjson
+from faker import Faker
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from conf.config import app_config
+from src.comments.schema import CommentUpdateResponse
+from src.posts.schemas import PostResponseSchema
+from src.tags.schemas import TagResponseSchema
+from src.users.schemas import UserResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+fake = Faker()
+now = datetime.now()
+
+
+def make_posts(count: int) -> list[PostResponseSchema]:
+    return [
+        PostResponseSchema(
+            id=i,
+            image_url=fake.image_url(),
+            tags=[TagResponseSchema(id=i * 5 + j, name=fake.word()) for j in range(5)],
+            description=fake.text(max_nb_chars=300),
+            user_id=i % 50 + 1,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now - timedelta(minutes=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_comments(count: int) -> list[CommentUpdateResponse]:
+    return [
+        CommentUpdateResponse(
+            id=i,
+            post_id=1,
+            user_id=i % 50 + 1,
+            comment=fake.text(max_nb_chars=200),
+            created_at=now - timedelta(minutes=i),
+            is_update=bool(i % 3),
+            updated_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_users(count: int) -> list[UserResponse]:
+    return [
+        UserResponse.model_construct(
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            phone=None,
+            username=fake.user_name(),
+            email=fake.email(),
+            avatar_url=fake.image_url(),
+            id=i,
+            role_name="user",
+            post_count=i % 20,
+            is_confirmed=True,
+            is_banned=False,
+            created_at=now - timedelta(days=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def stdlib_dumps(content) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def encode_default(adapter: TypeAdapter, page: list) -> bytes:
+    return stdlib_dumps(jsonable_encoder(adapter.dump_python(page, mode="json")))
+
+
+def encode_stdlib(adapter: TypeAdapter, page: list) -> bytes:
+    return stdlib_dumps(adapter.dump_python(page, mode="json"))
+
+
+def encode_orjson(adapter: TypeAdapter, page: list) -> bytes:
+    return orjson.dumps(adapter.dump_python(page, mode="json"))
+
+
+def cpu_ms(encode, adapter: TypeAdapter, page: list, rounds: int) -> float:
+    started = time.process_time()
+    for _ in range(rounds):
+        encode(adapter, page)
+    return (time.process_time() - started) / rounds * 1000
+
+
+def main(pages: list[int], rounds: int) -> None:
+    endpoints = [
+        ("GET /posts", PostResponseSchema, make_posts),
+        ("GET /comments/{post_id}", CommentUpdateResponse, make_comments),
+        ("GET /admin/user/search", UserResponse, make_users),
+    ]
+    print(f"{'endpoint':<26}{'items':>6}{'jsonable':>11}{'json':>9}{'orjson':>9}"
+          f"{'raw B':>10}{'gzip B':>10}{'br B':>10}{'gzip ms':>9}{'br ms':>8}")
+    for name, schema, factory in endpoints:
+        adapter = TypeAdapter(list[schema])
+        for size in pages:
+            page = factory(size)
+            default = cpu_ms(encode_default, adapter, page, rounds)
+            stdlib = cpu_ms(encode_stdlib, adapter, page, rounds)
+            fast = cpu_ms(encode_orjson, adapter, page, rounds)
+
+            body = encode_orjson(adapter, page)
+            started = time.process_time()
+            gzip_size = len(zlib.compress(body, app_config.GZIP_COMPRESS_LEVEL, wbits=zlib.MAX_WBITS | 16))
+            gzip_ms = (time.process_time() - started) * 1000
+            br_size, br_ms = "-", "-"
+            if brotli is not None:
+                started = time.process_time()
+                br_size = len(brotli.compress(body, quality=app_config.BROTLI_QUALITY))
+                br_ms = f"{(time.process_time() - started) * 1000:.2f}"
+
+            print(f"{name:<26}{size:>6}{default:>9.2f}ms{stdlib:>7.2f}ms{fast:>7.2f}ms"
+                  f"{len(body):>10}{gzip_size:>10}{br_size:>10}{gzip_ms:>9.2f}{br_ms:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    main(args.pages, args.rounds)
@@ -0,0 +1,53 @@
+"""
+Compare the ORM and the column-projected read paths of the post listing.
+
+Runs against the database configured in .env and needs at least ``--limit`` posts:
+
+    python -m benchmarks.bench_post_listing --limit 100 --rounds 200
+"""
+import argparse
+import asyncio
+import time
+
+from database.db import sessionmanager
+from src.posts.repository import PostRepository
+from src.posts.schemas import PostResponseSchema
+
+
+async def orm_page(repository: PostRepository, limit: int) -> list[PostResponseSchema]:
+    posts = await repository.get_posts(limit, 0, None, None)
+    return [PostResponseSchema.model_validate(post) for post in posts]
+
+
+async def projected_page(repository: PostRepository, limit: int) -> list[PostResponseSchema]:
+    rows = await repository.get_post_rows(limit, 0, None, None)
+    return [PostResponseSchema.from_row(row) for row in rows]
+
+
+async def measure(name: str, page, limit: int, rounds: int) -> None:
+    async with sessionmanager.session() as session:
+        repository = PostRepository(session)
+        rows = len(await page(repository, limit))
+        if rows < limit:
+            print(f"Only {rows} posts in the database, the page is not full")
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await page(repository, limit)
+            session.expunge_all()
+        elapsed = time.perf_counter() - started
+
+    print(f"{name:>10}: {rounds * rows / elapsed:>10.0f} rows/sec, {elapsed / rounds * 1000:.2f} ms/page")
+
+
+async def main(limit: int, rounds: int) -> None:
+    await measure("orm", orm_page, limit, rounds)
+    await measure("projected", projected_page, limit, rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.limit, args.rounds))
@@ -0,0 +1,95 @@
+"""
+Measure the score listings per post and per user on a large table, before and after the
+(post_id, id) and (user_id, id) indexes, with offset and with cursor pagination.
+
+Works on a temporary copy of the scores table shape in the database configured in .env,
+so no application data is touched:
+
+    python -m benchmarks.bench_score_listing --rows 10000000 --posts 10000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+
+from database.db import sessionmanager
+
+OFFSET_QUERY = "SELECT * FROM bench_scores WHERE {column} = :key ORDER BY id LIMIT :limit OFFSET :offset"
+CURSOR_QUERY = "SELECT * FROM bench_scores WHERE {column} = :key AND id > :after ORDER BY id LIMIT :limit"
+
+
+async def seed(session, rows: int, posts: int) -> None:
+    await session.execute(text(
+        "CREATE TEMP TABLE bench_scores (id integer PRIMARY KEY, post_id integer, user_id integer, score integer)"
+    ))
+    started = time.perf_counter()
+    await session.execute(text("""
+        INSERT INTO bench_scores (id, post_id, user_id, score)
+        SELECT g, g % :posts + 1, g / :posts + 1, g % 5 + 1 FROM generate_series(1, :rows) g
+    """), {"rows": rows, "posts": posts})
+    await session.execute(text("ANALYZE bench_scores"))
+    print(f"Seeded {rows} scores for {posts} posts in {time.perf_counter() - started:.1f}s")
+
+
+async def measure(session, name: str, query: str, params, rounds: int) -> None:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await session.execute(text(query), params())
+    elapsed = (time.perf_counter() - started) / rounds * 1000
+    print(f"{name:<44}{elapsed:>10.2f} ms/page")
+
+
+async def run_listings(session, rows: int, posts: int, limit: int, rounds: int) -> None:
+    users = rows // posts + 1
+    per_post, per_user = rows // posts, posts
+    deep_post, deep_user = max(per_post - limit, 0), max(per_user - limit, 0)
+
+    def post_params(offset):
+        return lambda: {"key": random.randint(1, posts), "limit": limit, "offset": offset}
+
+    def user_params(offset):
+        return lambda: {"key": random.randint(1, users - 1), "limit": limit, "offset": offset}
+
+    await measure(session, "post, first page (offset 0)", OFFSET_QUERY.format(column="post_id"), post_params(0), rounds)
+    await measure(session, f"post, last page (offset {deep_post})", OFFSET_QUERY.format(column="post_id"),
+                  post_params(deep_post), rounds)
+    await measure(session, "post, last page (cursor)", CURSOR_QUERY.format(column="post_id"),
+                  lambda: {"key": random.randint(1, posts), "limit": limit, "after": rows - limit * posts}, rounds)
+    await measure(session, "user, first page (offset 0)", OFFSET_QUERY.format(column="user_id"), user_params(0), rounds)
+    await measure(session, f"user, last page (offset {deep_user})", OFFSET_QUERY.format(column="user_id"),
+                  user_params(deep_user), rounds)
+    def user_cursor_params():
+        key = random.randint(1, users - 1)
+        return {"key": key, "limit": limit, "after": key * posts - limit}
+
+    await measure(session, "user, last page (cursor)", CURSOR_QUERY.format(column="user_id"),
+                  user_cursor_params, rounds)
+
+
+async def main(rows: int, posts: int, limit: int, rounds: int) -> None:
+    async with sessionmanager.session() as session:
+        await seed(session, rows, posts)
+
+        print("\nWithout indexes")
+        await run_listings(session, rows, posts, limit, max(rounds // 10, 1))
+
+        started = time.perf_counter()
+        await session.execute(text("CREATE INDEX ON bench_scores (post_id, id)"))
+        await session.execute(text("CREATE INDEX ON bench_scores (user_id, id)"))
+        await session.execute(text("ANALYZE bench_scores"))
+        print(f"\nWith (post_id, id) and (user_id, id) indexes, built in {time.perf_counter() - started:.1f}s")
+        await run_listings(session, rows, posts, limit, rounds)
+
+        await session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.posts, args.limit, args.rounds))
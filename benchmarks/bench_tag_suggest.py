@@ -0,0 +1,47 @@
+"""
+Measure tag suggestions from the in-memory tag cache for uncached and memoized prefixes. Tags and
+usage counts are generated, no database is needed:
+
+    python -m benchmarks.bench_tag_suggest --tags 100000 --prefixes 1000
+"""
+import argparse
+import random
+import string
+import time
+
+from src.tags.cache import TagCache
+from src.tags.models import Tag
+
+
+def measure(name: str, cache: TagCache, prefixes: list[str], limit: int) -> None:
+    started = time.perf_counter()
+    for prefix in prefixes:
+        cache.suggest(prefix, limit)
+    elapsed = (time.perf_counter() - started) / len(prefixes) * 1000 * 1000
+    print(f"{name:<40}{elapsed:>10.1f} us per prefix")
+
+
+def main(tags: int, prefixes: int, limit: int) -> None:
+    rng = random.Random(42)
+    names = {"".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12))) for _ in range(tags)}
+    cache = TagCache()
+    started = time.perf_counter()
+    for tag_id, name in enumerate(sorted(names), start=1):
+        for _ in range(int(rng.paretovariate(1.2))):
+            cache.add({Tag(id=tag_id, name=name)})
+    print(f"Cached {len(names)} tags in {time.perf_counter() - started:.1f}s")
+
+    for length in (1, 2, 3):
+        sample = ["".join(rng.choices(string.ascii_lowercase, k=length)) for _ in range(prefixes)]
+        cache._suggestions.clear()
+        measure(f"{length}-letter prefixes, first request", cache, sample, limit)
+        measure(f"{length}-letter prefixes, memoized", cache, sample, limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tags", type=int, default=100000)
+    parser.add_argument("--prefixes", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    main(args.tags, args.prefixes, args.limit)
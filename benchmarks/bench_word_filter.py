@@ -0,0 +1,58 @@
+"""
+Measure the throughput of the word filter in MB/s against checking every term on its own, for
+growing term lists. Terms and text are generated, no database is needed:
+
+    python -m benchmarks.bench_word_filter --terms 100 1000 10000 --size 1
+"""
+import argparse
+import random
+import re
+import string
+import time
+
+from src.moderation.word_filter import WordFilter
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+def naive_check(patterns: list[re.Pattern], text: str) -> list[str]:
+    text = text.lower()
+    return [pattern.pattern for pattern in patterns if pattern.search(text)]
+
+
+def measure(name: str, check, text: str, rounds: int) -> None:
+    check(text)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        check(text)
+    elapsed = (time.perf_counter() - started) / rounds
+    megabytes = len(text.encode()) / 1024 / 1024
+    print(f"{name:<40}{elapsed * 1000:>10.2f} ms{megabytes / elapsed:>10.1f} MB/s")
+
+
+def main(term_counts: list[int], size: float, rounds: int) -> None:
+    rng = random.Random(42)
+    words = [random_word(rng) for _ in range(int(size * 1024 * 1024 / 7))]
+    text = " ".join(words)
+    for count in term_counts:
+        terms = sorted({random_word(rng) for _ in range(count)})
+        word_filter = WordFilter()
+        started = time.perf_counter()
+        word_filter.load_terms(terms)
+        print(f"{len(terms)} terms compiled in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        measure("  compiled trie", word_filter.check, text, rounds)
+        if count <= 1000:
+            patterns = [re.compile(rf"(?<!\w){re.escape(term)}(?!\w)") for term in terms]
+            measure("  one expression per term", lambda text: naive_check(patterns, text), text, 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--size", type=float, default=1, help="Text size in MB")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.terms, args.size, args.rounds)
@@ -52,6 +52,34 @@ class Settings(BaseSettings):
         f"cloudinary://{CLOUDINARY_API_KEY}:{CLOUDINARY_API_SECRET}@{CLOUDINARY_NAME}"
     )
 
+    # Background jobs --------------------------------------------------------------------------------------
+    RANKING_REFRESH_INTERVAL: int = 30  # Seconds
+    VIEW_COUNT_FLUSH_INTERVAL: int = 5  # Seconds, view counts lag behind by up to this interval
+    TAG_CACHE_REFRESH_INTERVAL: int = 30  # Seconds, tags created by other workers are cached after up to this interval
+    TAG_USAGE_PRUNE_INTERVAL: int = 3600  # Seconds between deletions of usage buckets older than the trending window
+
+    # Comments --------------------------------------------------------------------------------------
+    COMMENT_DUPLICATE_WINDOW: int = 300  # Seconds a user cannot repeat a comment, 0 disables the check
+
+    # Word filter --------------------------------------------------------------------------------------
+    WORD_FILTER_PATH: Path | None = None  # Filtered terms, one per line, "~term" only flags; None disables the filter
+    WORD_FILTER_RELOAD_INTERVAL: int = 30  # Seconds between checks of the term file for changes
+
+    # Live events --------------------------------------------------------------------------------------
+    EVENTS_BUFFER_SIZE: int = 100  # Events a stream may lag behind before it is reset
+    EVENTS_HEARTBEAT_INTERVAL: int = 15  # Seconds
+    EVENTS_REDIS_ENABLED: bool = False  # Share events between workers through Redis pub/sub at REDIS_URL
+
+    # Score ingestion --------------------------------------------------------------------------------------
+    SCORE_INGESTION_ENABLED: bool = False  # Coalesce concurrent score submissions into batched inserts
+    SCORE_INGESTION_BATCH_SIZE: int = 500
+    SCORE_INGESTION_MAX_DELAY_MS: int = 20  # Milliseconds a score may wait for others to join its batch
+
+    # Response compression --------------------------------------------------------------------------------------
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes, smaller responses are sent uncompressed
+    GZIP_COMPRESS_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
     # Temporary code --------------------------------------------------------------------------------------
     TEMP_CODE_LIFETIME: int = 15  # minutes
 
@@ -1,18 +1,42 @@
+from datetime import datetime
+
 POST_DESCRIPTION_MAX_LENGTH = 1500
 POST_DESCRIPTION_MIN_LENGTH = 2
 
+POST_IMAGE_URL_MAX_LENGTH = 500
+POST_IMPORT_MAX_ROWS = 100000
+EXPORT_YIELD_PER = 1000
+MODERATION_BATCH_SIZE = 1000  # Rows deleted or hidden per transaction by a moderation job
+
+TRENDING_EPOCH = datetime(2025, 1, 1)
+TRENDING_HALF_LIFE_HOURS = 12
+TRENDING_POST_WEIGHT = 1.0
+TRENDING_SCORE_WEIGHT = 1.0
+TRENDING_COMMENT_WEIGHT = 1.0
+TRENDING_VIEW_WEIGHT = 0.05
+
 COMMENT_MAX_LENGTH = 1500
 COMMENT_MIN_LENGTH = 2
+COMMENT_MAX_DEPTH = 64  # Levels of replies below a top-level comment
+COMMENT_THREAD_MAX_REPLIES = 20  # Replies per thread returned with a page of threads
 
 TAG_NUMBER_LIMIT=5
 TAG_MAX_LENGTH = 30
 TAG_MIN_LENGTH = 2
+TAG_SUGGEST_MAX_LIMIT = 20
+TAG_SUGGEST_CACHE_SIZE = 10000  # Prefixes whose suggestions are memoized by the tag cache
+TAG_TRENDING_WINDOW_HOURS = 24  # Hourly usage buckets counted by the trending tags, older ones are pruned
 
 SCORE_MAX_VALUE = 5
 SCORE_MIN_VALUE = 1
+SCORE_AVERAGES_BATCH_LIMIT = 100
+SCORE_PAGE_MAX_LIMIT = 500
+SCORE_STATS_SHARDS = 16  # Rows of the score_stats table, see the weighted rating migration
+WEIGHTED_RATING_PRIOR_COUNT = 10  # Number of votes at the global mean every post starts with
 
 EDITED_IMAGE_URL = "edited_image_url"
 ORIGINAL_IMAGE_URL = "original_image_url"
+IMAGE_HASH_CHUNK_SIZE = 1024 * 1024  # Bytes
 
 FILTER_DICT = {
     "grayscale": {"effect": "grayscale"},
@@ -38,8 +38,23 @@ UPLOAD_IMAGE_ERROR = "Upload image failed"
 FILTER_IMAGE_ERROR = "Filter image failed"
 FILTER_IMAGE_ERROR_DETAIL = "Filter name is incorrect"
 
+IMPORT_FORMAT_ERROR = "Manifest format is not supported, use 'ndjson' or 'csv'"
+IMPORT_ROWS_LIMIT = f"Manifest may contain up to {const.POST_IMPORT_MAX_ROWS} rows"
+IMPORT_ROW_INVALID = "Row is not a valid manifest entry"
+IMPORT_IMAGE_URL_REQUIRED = "Field 'image_url' is required"
+IMPORT_IMAGE_URL_LIMIT = f"Maximum length of image url is {const.POST_IMAGE_URL_MAX_LENGTH}"
+
 QR_NOT_FOUND = "QR code not found"
 
 NOT_COMMENT = "Comment not found or not available."
+DUPLICATE_COMMENT = "You have already posted this comment recently"
+COMMENT_TOO_DEEP = f"Replies may be nested up to {const.COMMENT_MAX_DEPTH} levels"
+BANNED_TERMS = "The text contains terms that are not allowed"
+
+INVALID_CURSOR = "Invalid pagination cursor"
+
+MODERATION_JOB_NOT_FOUND = "Moderation job not found"
+MODERATION_JOB_EMPTY = "The job must moderate comments, scores or both"
+MODERATION_JOB_RANGE = "created_after must be earlier than created_before"
 
 # TODO REPLACE ALL ERROR MESSAGES IN PROJECT
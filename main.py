@@ -9,12 +9,14 @@ from fastapi_limiter import FastAPILimiter
 from redis import asyncio as aioredis
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from sqlalchemy.exc import IntegrityError
 
 from database.db import get_db
 from conf.config import app_config
 from src.services import healthchecker
+from src.services.compression import CompressionMiddleware
+from src.services.events import event_broker
 from src.services.auth.routes import router as auth_router
 from src.users.routes import router as users_router
 from src.users.routes import router_admin as users_router_admin
@@ -23,6 +25,15 @@ from src.posts.routes import router_admin as posts_router_admin
 from src.scores.routes import router as scores_router
 from src.comments.router import router as comment_router
 from src.comments.router import router_admin as comment_admin_router
+from src.moderation.routes import router_admin as moderation_router_admin
+from src.moderation.word_filter import word_filter
+from src.posts.rankings import ranking_tracker
+from src.posts.views import view_counter
+from src.scores.ingestion import score_ingestion_queue
+from src.services.periodic import PeriodicTask
+from src.tags.cache import tag_cache
+from src.tags.routes import router as tags_router
+from src.tags.tag_service import prune_tag_usage
 from src.users.users_service import UserService
 
 
@@ -46,12 +57,31 @@ async def lifespan(fastapi_app: FastAPI):
     # FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
     # await FastAPILimiter.init(redis)
 
+    await word_filter.reload()
+    await tag_cache.load()
+    periodic_tasks = [
+        PeriodicTask("post-views", app_config.VIEW_COUNT_FLUSH_INTERVAL, view_counter.flush),
+        PeriodicTask("post-rankings", app_config.RANKING_REFRESH_INTERVAL, ranking_tracker.flush),
+        PeriodicTask("tag-cache", app_config.TAG_CACHE_REFRESH_INTERVAL, tag_cache.refresh),
+        PeriodicTask("tag-usage-prune", app_config.TAG_USAGE_PRUNE_INTERVAL, prune_tag_usage),
+        PeriodicTask("word-filter", app_config.WORD_FILTER_RELOAD_INTERVAL, word_filter.reload),
+    ]
+    for task in periodic_tasks:
+        task.start()
+    if app_config.SCORE_INGESTION_ENABLED:
+        score_ingestion_queue.start()
+    await event_broker.start()
+
     yield
 
+    await event_broker.stop()
+    await score_ingestion_queue.stop()
+    for task in periodic_tasks:
+        await task.stop()
     # await redis.close()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -59,6 +89,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=app_config.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=app_config.GZIP_COMPRESS_LEVEL,
+    brotli_quality=app_config.BROTLI_QUALITY,
 )
 
 app.mount("/static", StaticFiles(directory=static_files_path), name="static")
@@ -71,6 +108,8 @@ app.include_router(users_router_admin, prefix="/api")
 app.include_router(scores_router, prefix="/api")
 app.include_router(comment_router, prefix="/api")
 app.include_router(comment_admin_router, prefix="/api")
+app.include_router(moderation_router_admin, prefix="/api")
+app.include_router(tags_router, prefix="/api")
 
 
 @app.get("/", response_class=HTMLResponse)
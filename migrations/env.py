@@ -8,11 +8,12 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from conf.config import Base, app_config
 from src.comments.models import Comment
-from src.urls.models import URLs
-from src.posts.models import Post, PostTag
-from src.tags.models import Tag
+from src.moderation.models import ModerationJob
+from src.urls.models import StoredImage, URLs
+from src.posts.models import Post, PostRanking, PostTag
+from src.tags.models import Tag, TagUsageBucket
 from src.users.models import Role, Token, User
-from src.scores.models import Score
+from src.scores.models import PostScoreHistogram, Score, ScoreStats
 
 
 # this is the Alembic Config object, which provides
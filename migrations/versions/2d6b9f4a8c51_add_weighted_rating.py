@@ -0,0 +1,51 @@
+"""Add weighted rating and global score stats
+
+Revision ID: 2d6b9f4a8c51
+Revises: e7a1c3f95d28
+Create Date: 2026-10-18 16:02:14.573920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6b9f4a8c51'
+down_revision: Union[str, None] = 'e7a1c3f95d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('score_stats',
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('score_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('score_sum', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('shard')
+    )
+    # One row per shard (SCORE_STATS_SHARDS), the current totals go to shard 0
+    op.execute("INSERT INTO score_stats (shard) SELECT generate_series(0, 15)")
+    op.execute("""
+        UPDATE score_stats
+        SET score_count = (SELECT COUNT(*) FROM scores), score_sum = (SELECT COALESCE(SUM(score), 0) FROM scores)
+        WHERE shard = 0
+    """)
+
+    op.add_column('post_rankings', sa.Column('weighted_rating', sa.Float(), server_default='0', nullable=False))
+    # Bayesian average with WEIGHTED_RATING_PRIOR_COUNT = 10 votes at the global mean
+    op.execute("""
+        UPDATE post_rankings
+        SET weighted_rating = (score_sum + 10 * s.mean) / (score_count + 10)
+        FROM (SELECT COALESCE(SUM(score)::float / NULLIF(COUNT(*), 0), 0) AS mean FROM scores) s
+    """)
+    op.drop_index('ix_post_rankings_rating', table_name='post_rankings')
+    op.create_index('ix_post_rankings_weighted', 'post_rankings', [sa.text('weighted_rating DESC'), sa.text('post_id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_rankings_weighted', table_name='post_rankings')
+    op.create_index('ix_post_rankings_rating', 'post_rankings', [sa.text('rating_score DESC'), sa.text('post_id DESC')], unique=False)
+    op.drop_column('post_rankings', 'weighted_rating')
+    op.drop_table('score_stats')
@@ -0,0 +1,54 @@
+"""Add post rankings
+
+Revision ID: 3f9c2a7d41e5
+Revises: b606553cbd2d
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41e5'
+down_revision: Union[str, None] = 'b606553cbd2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('post_rankings',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('trending_score', sa.Float(), server_default='0', nullable=False),
+    sa.Column('rating_score', sa.Float(), server_default='0', nullable=False),
+    sa.Column('score_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('score_sum', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index('ix_post_rankings_trending', 'post_rankings', [sa.text('trending_score DESC'), sa.text('post_id DESC')], unique=False)
+    op.create_index('ix_post_rankings_rating', 'post_rankings', [sa.text('rating_score DESC'), sa.text('post_id DESC')], unique=False)
+
+    # Seed rankings of existing posts, the trending score starts from the post creation time
+    # (half-lives of 12 hours since 2025-01-01, see TRENDING_EPOCH and TRENDING_HALF_LIFE_HOURS)
+    op.execute("""
+        INSERT INTO post_rankings (post_id, trending_score, rating_score, score_count, score_sum, refreshed_at)
+        SELECT p.id,
+               GREATEST(EXTRACT(EPOCH FROM p.created_at - TIMESTAMP '2025-01-01') / 43200.0, 0),
+               COALESCE(AVG(s.score), 0),
+               COUNT(s.id),
+               COALESCE(SUM(s.score), 0),
+               now()
+        FROM posts p
+        LEFT JOIN scores s ON s.post_id = p.id
+        GROUP BY p.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_rankings_rating', table_name='post_rankings')
+    op.drop_index('ix_post_rankings_trending', table_name='post_rankings')
+    op.drop_table('post_rankings')
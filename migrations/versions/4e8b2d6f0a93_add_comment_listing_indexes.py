@@ -0,0 +1,28 @@
+"""Add comment listing indexes
+
+Revision ID: 4e8b2d6f0a93
+Revises: 9c3e5a1f7b02
+Create Date: 2026-10-18 23:52:31.604218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8b2d6f0a93'
+down_revision: Union[str, None] = '9c3e5a1f7b02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_comments_post_id_created_at_id', 'comments', ['post_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_comments_post_id_user_id', 'comments', ['post_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_post_id_user_id', table_name='comments')
+    op.drop_index('ix_comments_post_id_created_at_id', table_name='comments')
@@ -0,0 +1,26 @@
+"""Add post view count
+
+Revision ID: 5a2e7c9d1b36
+Revises: c1d8e4b27a90
+Create Date: 2026-10-18 14:05:51.902317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a2e7c9d1b36'
+down_revision: Union[str, None] = 'c1d8e4b27a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('view_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'view_count')
@@ -0,0 +1,48 @@
+"""Add threaded comment replies
+
+Revision ID: 6f1a9c3e7b24
+Revises: 4e8b2d6f0a93
+Create Date: 2026-10-19 00:21:47.918305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1a9c3e7b24'
+down_revision: Union[str, None] = '4e8b2d6f0a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column('parent_id', sa.Integer(), nullable=True))
+    op.add_column('comments', sa.Column('path', sa.String(collation='C'), nullable=True))
+    op.add_column('comments', sa.Column('depth', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('comments', sa.Column('reply_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_foreign_key(
+        'comments_parent_id_fkey', 'comments', 'comments', ['parent_id'], ['id'], ondelete='CASCADE'
+    )
+    # Existing comments are top-level, their path is their own zero-padded id
+    op.execute("UPDATE comments SET path = lpad(id::text, 10, '0') || '/'")
+    op.alter_column('comments', 'path', nullable=False)
+
+    op.create_index('ix_comments_top_level', 'comments', ['post_id', sa.text('created_at DESC'), sa.text('id DESC')],
+                    unique=False, postgresql_where=sa.text('parent_id IS NULL'))
+    op.create_index('ix_comments_parent_id_id', 'comments', ['parent_id', 'id'], unique=False)
+    op.create_index('ix_comments_path', 'comments', ['path'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_path', table_name='comments')
+    op.drop_index('ix_comments_parent_id_id', table_name='comments')
+    op.drop_index('ix_comments_top_level', table_name='comments')
+    op.execute("DELETE FROM comments WHERE parent_id IS NOT NULL")
+    op.drop_constraint('comments_parent_id_fkey', 'comments', type_='foreignkey')
+    op.drop_column('comments', 'reply_count')
+    op.drop_column('comments', 'depth')
+    op.drop_column('comments', 'path')
+    op.drop_column('comments', 'parent_id')
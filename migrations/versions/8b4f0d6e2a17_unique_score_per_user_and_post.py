@@ -0,0 +1,42 @@
+"""Unique score per user and post
+
+Revision ID: 8b4f0d6e2a17
+Revises: 5a2e7c9d1b36
+Create Date: 2026-10-18 14:48:22.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4f0d6e2a17'
+down_revision: Union[str, None] = '5a2e7c9d1b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the first score of every user and post pair, then refresh the ratings of the rankings
+    op.execute("""
+        DELETE FROM scores a
+        USING scores b
+        WHERE a.post_id = b.post_id AND a.user_id = b.user_id AND a.id > b.id
+    """)
+    op.execute("""
+        UPDATE post_rankings r
+        SET rating_score = s.rating_score, score_count = s.score_count, score_sum = s.score_sum
+        FROM (
+            SELECT post_id, AVG(score) AS rating_score, COUNT(*) AS score_count, SUM(score) AS score_sum
+            FROM scores
+            GROUP BY post_id
+        ) s
+        WHERE r.post_id = s.post_id
+    """)
+    op.create_unique_constraint('uq_scores_post_id_user_id', 'scores', ['post_id', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_scores_post_id_user_id', 'scores', type_='unique')
@@ -0,0 +1,28 @@
+"""Add score listing indexes
+
+Revision ID: 9c3e5a1f7b02
+Revises: 2d6b9f4a8c51
+Create Date: 2026-10-18 16:55:09.284117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5a1f7b02'
+down_revision: Union[str, None] = '2d6b9f4a8c51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_scores_post_id_id', 'scores', ['post_id', 'id'], unique=False)
+    op.create_index('ix_scores_user_id_id', 'scores', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scores_user_id_id', table_name='scores')
+    op.drop_index('ix_scores_post_id_id', table_name='scores')
@@ -0,0 +1,36 @@
+"""Add comment hash for duplicate detection
+
+Revision ID: a3d7f1b95e62
+Revises: 6f1a9c3e7b24
+Create Date: 2026-10-19 00:58:12.407731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d7f1b95e62'
+down_revision: Union[str, None] = '6f1a9c3e7b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column('comment_hash', sa.String(length=64), nullable=True))
+    # Same normalization as Comment.hash_comment: NFKC, lower case, whitespace collapsed
+    op.execute(r"""
+        UPDATE comments
+        SET comment_hash = encode(sha256(convert_to(
+            btrim(regexp_replace(lower(normalize(comment, NFKC)), '\s+', ' ', 'g')), 'UTF8'
+        )), 'hex')
+    """)
+    op.alter_column('comments', 'comment_hash', nullable=False)
+    op.create_index('ix_comments_user_id_comment_hash', 'comments', ['user_id', 'comment_hash', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_user_id_comment_hash', table_name='comments')
+    op.drop_column('comments', 'comment_hash')
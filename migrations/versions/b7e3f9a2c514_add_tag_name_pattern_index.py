@@ -0,0 +1,28 @@
+"""Add prefix search index on tag names
+
+Revision ID: b7e3f9a2c514
+Revises: f2b8c4d6e071
+Create Date: 2026-10-19 03:12:41.207315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3f9a2c514'
+down_revision: Union[str, None] = 'f2b8c4d6e071'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tags_name_pattern', 'tags', ['name'], unique=False, postgresql_ops={'name': 'text_pattern_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tags_name_pattern', table_name='tags')
@@ -0,0 +1,34 @@
+"""Add content-addressed images
+
+Revision ID: c1d8e4b27a90
+Revises: 3f9c2a7d41e5
+Create Date: 2026-10-18 13:27:05.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d8e4b27a90'
+down_revision: Union[str, None] = '3f9c2a7d41e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('images',
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('public_id', sa.String(length=255), nullable=False),
+    sa.Column('secure_url', sa.String(length=500), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('digest'),
+    sa.UniqueConstraint('public_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('images')
@@ -0,0 +1,53 @@
+"""Add tag post counts and hourly usage buckets
+
+Revision ID: c4a8e2f6d193
+Revises: b7e3f9a2c514
+Create Date: 2026-10-19 04:26:15.918342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e2f6d193'
+down_revision: Union[str, None] = 'b7e3f9a2c514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tags', sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE tags
+        SET post_count = counts.posts
+        FROM (SELECT tag_id, COUNT(*) AS posts FROM post_tag GROUP BY tag_id) counts
+        WHERE tags.id = counts.tag_id
+    """)
+    op.create_index('ix_tags_post_count', 'tags', [sa.text('post_count DESC'), 'name'], unique=False)
+
+    op.create_table('tag_usage_buckets',
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('uses', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tag_id', 'bucket_start')
+    )
+    op.create_index('ix_tag_usage_buckets_bucket_start', 'tag_usage_buckets', ['bucket_start'], unique=False)
+    # The posts of the trending window (TAG_TRENDING_WINDOW_HOURS = 24)
+    op.execute("""
+        INSERT INTO tag_usage_buckets (tag_id, bucket_start, uses)
+        SELECT post_tag.tag_id, date_trunc('hour', posts.created_at), COUNT(*)
+        FROM post_tag JOIN posts ON posts.id = post_tag.post_id
+        WHERE posts.created_at >= now() - interval '24 hours'
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tag_usage_buckets_bucket_start', table_name='tag_usage_buckets')
+    op.drop_table('tag_usage_buckets')
+    op.drop_index('ix_tags_post_count', table_name='tags')
+    op.drop_column('tags', 'post_count')
@@ -0,0 +1,49 @@
+"""Add moderation jobs, hidden comments and score creation time
+
+Revision ID: d5c2e8a4f316
+Revises: a3d7f1b95e62
+Create Date: 2026-10-19 01:34:26.175092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5c2e8a4f316'
+down_revision: Union[str, None] = 'a3d7f1b95e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('moderation_jobs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('requested_by', sa.Integer(), nullable=False),
+    sa.Column('comment_action', sa.String(length=20), nullable=True),
+    sa.Column('delete_scores', sa.Boolean(), nullable=False),
+    sa.Column('created_after', sa.DateTime(), nullable=True),
+    sa.Column('created_before', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('comments_processed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('scores_processed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('comments', sa.Column('is_hidden', sa.Boolean(), server_default='false', nullable=False))
+    # Existing scores get the migration time, time ranges of moderation jobs only apply to newer scores
+    op.add_column('scores', sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('scores', 'created_at')
+    op.drop_column('comments', 'is_hidden')
+    op.drop_table('moderation_jobs')
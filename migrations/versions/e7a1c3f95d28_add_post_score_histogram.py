@@ -0,0 +1,46 @@
+"""Add post score histogram
+
+Revision ID: e7a1c3f95d28
+Revises: 8b4f0d6e2a17
+Create Date: 2026-10-18 15:21:37.115406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a1c3f95d28'
+down_revision: Union[str, None] = '8b4f0d6e2a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('post_score_histogram',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('count_1', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('count_2', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('count_3', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('count_4', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('count_5', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.execute("""
+        INSERT INTO post_score_histogram (post_id, count_1, count_2, count_3, count_4, count_5)
+        SELECT post_id,
+               COUNT(*) FILTER (WHERE score = 1),
+               COUNT(*) FILTER (WHERE score = 2),
+               COUNT(*) FILTER (WHERE score = 3),
+               COUNT(*) FILTER (WHERE score = 4),
+               COUNT(*) FILTER (WHERE score = 5)
+        FROM scores
+        GROUP BY post_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('post_score_histogram')
@@ -0,0 +1,32 @@
+"""Add full-text search index on comments
+
+Revision ID: f2b8c4d6e071
+Revises: d5c2e8a4f316
+Create Date: 2026-10-19 02:07:53.662840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c4d6e071'
+down_revision: Union[str, None] = 'd5c2e8a4f316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently, which cannot run in a transaction, so large comment tables stay writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_comments_comment_tsv', 'comments', [sa.text("to_tsvector('simple', comment)")],
+            unique=False, postgresql_using='gin', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_comments_comment_tsv', table_name='comments', postgresql_concurrently=True)
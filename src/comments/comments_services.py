@@ -1,11 +1,20 @@
+from datetime import datetime
+from typing import AsyncIterator
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from conf import messages
+from conf import messages, const
+from conf.config import app_config
+from src.moderation.word_filter import enforce_word_filter
+from src.posts.rankings import ranking_tracker
 from src.posts.repository import PostRepository
+from src.services.etag import make_etag
+from src.services.events import event_broker
+from src.services.pagination import decode_cursor, decode_id_cursor, decode_timestamp_cursor, encode_cursor
 from src.users.models import User
 from src.comments.models import Comment
-from src.comments.schema import CommentBase
+from src.comments.schema import CommentBase, CommentThread, CommentUpdateResponse
 from src.comments.repository import CommentRepository
 
 
@@ -32,14 +41,66 @@ class CommentService:
         :param body: CommentBase: The data used to create the comment, including the comment text.
         :param user: User: The user adding the comment.
         :return: Comment: The created comment.
-        :raises HTTPException: If the post with the specified ID is not found.
+        :raises HTTPException: If the comment contains a blocked term, the post with the specified
+            ID is not found, or the user posted the same comment within COMMENT_DUPLICATE_WINDOW seconds.
         """
+        enforce_word_filter(body.comment, "comment")
         post = await self.post_repository.get_post_by_id(post_id)
         if not post:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=messages.POST_NOT_FOUND
             )
-        return await self.comment_repository.add_comment(post_id, body, user)
+        await self._check_duplicate(body, user)
+        comment = await self.comment_repository.add_comment(post_id, body, user)
+        ranking_tracker.record(post_id, const.TRENDING_COMMENT_WEIGHT)
+        await self._publish("comment.created", comment)
+        return comment
+
+    async def add_reply(self, comment_id: int, body: CommentBase, user: User) -> Comment:
+        """
+        Reply to a comment.
+
+        :param comment_id: int: ID of the comment being replied to.
+        :param body: CommentBase: The data used to create the reply, including the comment text.
+        :param user: User: The user adding the reply.
+        :return: Comment: The created reply.
+        :raises HTTPException: If the reply contains a blocked term, the comment is not found, the reply
+            would be nested too deep, or the user posted the same comment within COMMENT_DUPLICATE_WINDOW seconds.
+        """
+        enforce_word_filter(body.comment, "comment")
+        parent = await self._get_comment(comment_id)
+        if parent.depth >= const.COMMENT_MAX_DEPTH:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.COMMENT_TOO_DEEP)
+        await self._check_duplicate(body, user)
+        reply = await self.comment_repository.add_reply(parent, body, user)
+        ranking_tracker.record(parent.post_id, const.TRENDING_COMMENT_WEIGHT)
+        await self._publish("comment.created", reply)
+        return reply
+
+    @staticmethod
+    async def _publish(event: str, comment: Comment) -> None:
+        """
+        Send a comment to the live streams of its post.
+        """
+        await event_broker.publish(
+            comment.post_id, event, CommentUpdateResponse.model_validate(comment).model_dump()
+        )
+
+    async def _check_duplicate(self, body: CommentBase, user: User) -> None:
+        """
+        Reject a comment the user already posted within COMMENT_DUPLICATE_WINDOW seconds.
+
+        :raises HTTPException: If the comment is a duplicate (409).
+        """
+        window = app_config.COMMENT_DUPLICATE_WINDOW
+        if window > 0 and await self.comment_repository.exists_comment(body.comment, user.id, window):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=messages.DUPLICATE_COMMENT)
+
+    async def _get_comment(self, comment_id: int) -> Comment:
+        comment = await self.comment_repository.get_comment_by_id(comment_id)
+        if comment is None or comment.is_hidden:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.NOT_COMMENT)
+        return comment
 
     async def edit_comment(self, comment_id: int, body: CommentBase, user: User) -> Comment:
         """
@@ -49,11 +110,13 @@ class CommentService:
         :param body: CommentBase: The new data for editing the comment.
         :param user: User: The user editing the comment.
         :return: Comment: The edited comment.
-        :raises HTTPException: If the comment is not found.
+        :raises HTTPException: If the new text contains a blocked term or the comment is not found.
         """
+        enforce_word_filter(body.comment, "comment")
         comment = await self.comment_repository.edit_comment(comment_id, body, user)
         if comment is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.NOT_COMMENT)
+        await self._publish("comment.updated", comment)
         return comment
 
     async def delete_comment(self, comment_id: int) -> Comment:
@@ -67,23 +130,118 @@ class CommentService:
         comment = await self.comment_repository.delete_comment(comment_id)
         if comment is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.NOT_COMMENT)
+        await event_broker.publish(
+            comment.post_id, "comment.deleted", {"id": comment.id, "parent_id": comment.parent_id}
+        )
         return comment
 
-    async def get_comment_by_post_all(self, post_id: int, limit: int, offset: int) -> list[Comment]:
+    async def get_comment_by_post_all(
+        self, post_id: int, limit: int, offset: int, cursor: str = None
+    ) -> list[Comment]:
         """
-        Retrieve all comments for a specific post.
+        Retrieve all comments for a specific post, newest first.
 
         :param post_id: int: ID of the post for which comments need to be retrieved.
         :param limit: int: The maximum number of comments to retrieve.
-        :param offset: int: The number of comments to skip.
+        :param offset: int: The number of comments to skip, ignored when a cursor is given.
+        :param cursor: str: The cursor of the previous page.
         :return: list[Comment]: A list of comments for the specified post.
-        :raises HTTPException: If no comments are found for the specified post.
+        :raises HTTPException: If no comments are found for the specified post or the cursor is malformed.
         """
-        comment = await self.comment_repository.get_comment_by_post_all(post_id, limit, offset)
+        after = decode_timestamp_cursor(cursor) if cursor else None
+        comment = await self.comment_repository.get_comment_by_post_all(post_id, limit, offset, after)
         if len(comment) == 0:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.NOT_COMMENT)
         return comment
 
+    async def get_comment_by_post_all_etag(
+        self, post_id: int, limit: int, offset: int, cursor: str = None
+    ) -> str:
+        """
+        Compute the ETag of a page of comments from the ids and modification times of the page.
+
+        :param post_id: int: ID of the post for which comments need to be retrieved.
+        :param limit: int: The maximum number of comments to retrieve.
+        :param offset: int: The number of comments to skip, ignored when a cursor is given.
+        :param cursor: str: The cursor of the previous page.
+        :return: str: The weak ETag.
+        :raises HTTPException: If the cursor is malformed.
+        """
+        after = decode_timestamp_cursor(cursor) if cursor else None
+        versions = await self.comment_repository.get_comment_versions_by_post(post_id, limit, offset, after)
+        return make_etag("comments", post_id, versions)
+
+    async def get_threads(
+        self, post_id: int, limit: int, replies: int, cursor: str = None
+    ) -> list[CommentThread]:
+        """
+        Retrieve a page of the top-level comments of a post, newest first, each with its oldest
+        direct replies. Two queries are made regardless of the page size and of the thread sizes.
+
+        :param post_id: int: ID of the post for which threads need to be retrieved.
+        :param limit: int: The maximum number of top-level comments to retrieve.
+        :param replies: int: The maximum number of replies to include per thread.
+        :param cursor: str: The cursor of the previous page.
+        :return: list[CommentThread]: The threads; ``replies_cursor`` continues a thread with more replies.
+        :raises HTTPException: If no comments are found for the specified post or the cursor is malformed.
+        """
+        after = decode_timestamp_cursor(cursor) if cursor else None
+        comments = await self.comment_repository.get_top_level_comments(post_id, limit, after)
+        if len(comments) == 0:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.NOT_COMMENT)
+
+        threads = {comment.id: CommentThread.model_validate(comment) for comment in comments}
+        first_replies = await self.comment_repository.get_first_replies(list(threads), replies)
+        for reply in first_replies:
+            threads[reply.parent_id].replies.append(CommentUpdateResponse.model_validate(reply))
+        for thread in threads.values():
+            if thread.replies and thread.reply_count > len(thread.replies):
+                thread.replies_cursor = encode_cursor(thread.replies[-1].id)
+        return list(threads.values())
+
+    async def get_replies(self, comment_id: int, limit: int, cursor: str = None) -> list[Comment]:
+        """
+        Retrieve a page of the direct replies to a comment, oldest first.
+
+        :param comment_id: int: ID of the comment whose replies need to be retrieved.
+        :param limit: int: The maximum number of replies to retrieve.
+        :param cursor: str: The cursor of the previous page, e.g. the ``replies_cursor`` of a thread.
+        :return: list[Comment]: The replies.
+        :raises HTTPException: If the comment is not found or the cursor is malformed.
+        """
+        after_id = decode_id_cursor(cursor) if cursor else None
+        await self._get_comment(comment_id)
+        return await self.comment_repository.get_replies(comment_id, limit, after_id)
+
+    async def get_subtree(self, comment_id: int, limit: int, cursor: str = None) -> list[Comment]:
+        """
+        Retrieve a page of all replies below a comment at any depth, in thread order.
+
+        :param comment_id: int: ID of the comment whose replies need to be retrieved.
+        :param limit: int: The maximum number of replies to retrieve.
+        :param cursor: str: The cursor of the previous page.
+        :return: list[Comment]: The replies, each followed by its own replies.
+        :raises HTTPException: If the comment is not found or the cursor is malformed.
+        """
+        root = await self._get_comment(comment_id)
+        after_path = decode_cursor(cursor, 1)[0] if cursor else None
+        if after_path is not None and not (isinstance(after_path, str) and after_path.startswith(root.path)):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_CURSOR)
+        return await self.comment_repository.get_subtree(root, limit, after_path)
+
+    async def stream_events(self, post_id: int) -> AsyncIterator[bytes]:
+        """
+        Open the live stream of a post: its new, edited and deleted comments and its score changes.
+
+        :param post_id: int: ID of the post.
+        :return: AsyncIterator[bytes]: The Server-Sent Events stream.
+        :raises HTTPException: If the post with the specified ID is not found.
+        """
+        post = await self.post_repository.get_post_by_id(post_id)
+        if not post:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.POST_NOT_FOUND)
+        return event_broker.stream(post_id)
+
     async def get_comment_by_post_user(
         self, post_id: int, limit: int, offset: int, user: User
     ) -> list[Comment]:
@@ -106,6 +264,34 @@ class CommentService:
             )
         return comment
 
+    async def search_comments(
+        self,
+        query: str,
+        limit: int,
+        user_id: int = None,
+        post_id: int = None,
+        created_after: datetime = None,
+        created_before: datetime = None,
+        cursor: str = None,
+    ) -> list[Comment]:
+        """
+        Search the text of all comments, hidden ones included, newest first.
+
+        :param query: str: The search query in web search syntax.
+        :param limit: int: The maximum number of comments to retrieve.
+        :param user_id: int: Only comments of this user.
+        :param post_id: int: Only comments on this post.
+        :param created_after: datetime: Only comments created at or after this time.
+        :param created_before: datetime: Only comments created before this time.
+        :param cursor: str: The cursor of the previous page.
+        :return: list[Comment]: The matching comments, empty if there are none.
+        :raises HTTPException: If the cursor is malformed.
+        """
+        after = decode_timestamp_cursor(cursor) if cursor else None
+        return await self.comment_repository.search_comments(
+            query, limit, user_id, post_id, created_after, created_before, after
+        )
+
     async def get_comment_by_post_author(
         self, post_id: int, user_id: int, limit: int, offset: int
     ) -> list[Comment]:
@@ -1,17 +1,71 @@
-from sqlalchemy import Boolean, Integer, String, DateTime, ForeignKey, func
+import hashlib
+import unicodedata
+
+from sqlalchemy import Boolean, Index, Integer, String, DateTime, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from conf.config import Base
 
 
+def _comment_hash_default(context) -> str:
+    return Comment.hash_comment(context.get_current_parameters()["comment"])
+
+
 class Comment(Base):
     __tablename__ = "comments"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     post_id: Mapped[int] = mapped_column(Integer, ForeignKey("posts.id"), nullable=False)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     comment: Mapped[str] = mapped_column(String(300), nullable=False)
+    comment_hash: Mapped[str] = mapped_column(String(64), nullable=False, default=_comment_hash_default)
+    parent_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True
+    )
+    # Materialized path: the zero-padded ids of the ancestors and of the comment itself, each
+    # followed by "/". Byte order (C collation) sorts a thread depth-first and keeps every
+    # subtree in one contiguous index range.
+    path: Mapped[str] = mapped_column(String(collation="C"), nullable=False, default="")
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    reply_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     is_update: Mapped[bool] = mapped_column(Boolean, default=False, nullable=True)
+    is_hidden: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
     created_at: Mapped[DateTime] = mapped_column("created_at", DateTime, default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(
         "updated_at", DateTime, default=func.now(), onupdate=func.now()
     )
+
+    @staticmethod
+    def hash_comment(text: str) -> str:
+        """
+        The digest used to find repeated comments: SHA-256 of the text after NFKC normalization,
+        lower-casing and collapsing whitespace, so trivially varied copies match.
+
+        :param text: The comment text.
+        :return: The hex digest.
+        """
+        normalized = " ".join(unicodedata.normalize("NFKC", text).lower().split())
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    @staticmethod
+    def path_segment(comment_id: int) -> str:
+        """
+        The part of the materialized path contributed by one comment.
+
+        :param comment_id: The ID of the comment.
+        :return: The zero-padded ID followed by "/".
+        """
+        return f"{comment_id:010d}/"
+
+
+Index("ix_comments_post_id_created_at_id", Comment.post_id, Comment.created_at.desc(), Comment.id.desc())
+Index("ix_comments_post_id_user_id", Comment.post_id, Comment.user_id)
+Index("ix_comments_user_id_comment_hash", Comment.user_id, Comment.comment_hash, Comment.created_at)
+Index(
+    "ix_comments_top_level",
+    Comment.post_id, Comment.created_at.desc(), Comment.id.desc(),
+    postgresql_where=Comment.parent_id.is_(None),
+)
+Index("ix_comments_parent_id_id", Comment.parent_id, Comment.id)
+Index("ix_comments_path", Comment.path)
+# The GIN index ix_comments_comment_tsv on to_tsvector('simple', comment) is created by its migration
+# only, as expression indexes are Postgres-specific; see CommentRepository.search_comments.
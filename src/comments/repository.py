@@ -1,11 +1,45 @@
-from sqlalchemy import delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import Integer, Select, column, delete, func, literal_column, select, true, tuple_, update, values
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.orm import aliased
 
 from src.users.models import User
 from src.comments.models import Comment
 from src.comments.schema import CommentBase
 
 
+# Must match the expression of the ix_comments_comment_tsv GIN index, which is created by its
+# migration only: the text search configuration is inlined rather than bound, so the planner can use it.
+_SEARCH_CONFIG = literal_column("'simple'")
+_comment_document = func.to_tsvector(_SEARCH_CONFIG, Comment.comment)
+
+
+def _page_of_post(
+    stmt: Select, post_id: int, limit: int, offset: int, after: tuple[datetime, int] | None
+) -> Select:
+    """
+    Restrict a comment query to one page of the visible comments of a post, newest first. The order
+    matches the (post_id, created_at DESC, id DESC) index, so both offset and keyset pages are index scans.
+
+    :param stmt: Select: The query over comments
+    :param post_id: int: Identifies the post
+    :param limit: int: The page size
+    :param offset: int: The number of comments to skip, ignored when ``after`` is given
+    :param after: tuple[datetime, int] | None: The created_at and id of the last comment of the previous page
+    :return: The restricted query
+    """
+    stmt = (
+        stmt.filter(Comment.post_id == post_id, Comment.is_hidden.is_(False))
+        .order_by(Comment.created_at.desc(), Comment.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        return stmt.filter(tuple_(Comment.created_at, Comment.id) < tuple_(*after))
+    return stmt.offset(offset)
+
+
 class CommentRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -21,10 +55,52 @@ class CommentRepository:
         """
         comment = Comment(comment=body.comment, post_id=post_id, user_id=user.id)
         self.db.add(comment)
+        await self.db.flush()
+        comment.path = Comment.path_segment(comment.id)
         await self.db.commit()
         await self.db.refresh(comment)
         return comment
 
+    async def add_reply(self, parent: Comment, body: CommentBase, user: User) -> Comment:
+        """
+        The add_reply function creates a reply to a comment and counts it on the parent.
+
+        :param parent: Comment: The comment being replied to
+        :param body: CommentBase: Specify the type of data that is expected to be passed in
+        :param user: User: Get the user_id from the logged in user
+        :return: A comment object
+        """
+        reply = Comment(
+            comment=body.comment,
+            post_id=parent.post_id,
+            user_id=user.id,
+            parent_id=parent.id,
+            depth=parent.depth + 1,
+        )
+        self.db.add(reply)
+        await self.db.flush()
+        reply.path = parent.path + Comment.path_segment(reply.id)
+        await self.db.execute(
+            update(Comment)
+            .where(Comment.id == parent.id)
+            .values(reply_count=Comment.reply_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        await self.db.refresh(reply)
+        return reply
+
+    async def get_comment_by_id(self, comment_id: int) -> Comment | None:
+        """
+        The get_comment_by_id function returns a comment by its id.
+
+        :param comment_id: int: Find the comment in the database
+        :return: A comment object or None
+        """
+        stmt = select(Comment).filter(Comment.id == comment_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def edit_comment(self, comment_id: int, body: CommentBase, user: User) -> Comment:
         """
         The edit_comment function allows a user to edit their own comment.
@@ -39,6 +115,7 @@ class CommentRepository:
         comment = result.scalar_one_or_none()
         if comment:
             comment.comment = body.comment
+            comment.comment_hash = Comment.hash_comment(body.comment)
             comment.is_update = True
             await self.db.commit()
             await self.db.refresh(comment)
@@ -55,10 +132,110 @@ class CommentRepository:
         result = await self.db.execute(stmt)
         comment = result.scalar_one_or_none()
         if comment:
+            # Replies are removed by the ON DELETE CASCADE of parent_id
             await self.db.delete(comment)
+            if comment.parent_id is not None and not comment.is_hidden:
+                await self.db.execute(
+                    update(Comment)
+                    .where(Comment.id == comment.parent_id)
+                    .values(reply_count=Comment.reply_count - 1)
+                    .execution_options(synchronize_session=False)
+                )
             await self.db.commit()
         return comment
 
+    async def purge_comments_by_user(
+        self,
+        user_id: int,
+        batch_size: int,
+        hide: bool = False,
+        created_after: datetime = None,
+        created_before: datetime = None,
+    ) -> int:
+        """
+        The purge_comments_by_user function deletes or hides one batch of the comments of a user with
+        one set-based statement, and takes them out of the reply counts of their parents, without committing.
+        Deleting a comment also deletes the replies below it.
+
+        :param user_id: int: The author of the comments
+        :param batch_size: int: The largest number of comments handled
+        :param hide: bool: Hide the comments instead of deleting them
+        :param created_after: datetime: Only comments created at or after this time
+        :param created_before: datetime: Only comments created before this time
+        :return: The number of comments deleted or hidden, 0 when none are left
+        """
+        batch = select(Comment.id).filter(Comment.user_id == user_id)
+        if hide:
+            batch = batch.filter(Comment.is_hidden.is_(False))
+        if created_after is not None:
+            batch = batch.filter(Comment.created_at >= created_after)
+        if created_before is not None:
+            batch = batch.filter(Comment.created_at < created_before)
+        batch = batch.order_by(Comment.id).limit(batch_size).scalar_subquery()
+
+        if hide:
+            stmt = update(Comment).where(Comment.id.in_(batch)).values(is_hidden=True)
+        else:
+            stmt = delete(Comment).where(Comment.id.in_(batch))
+        stmt = stmt.returning(Comment.parent_id, Comment.is_hidden).execution_options(synchronize_session=False)
+        rows = (await self.db.execute(stmt)).all()
+
+        # A hidden comment was already taken out of the reply count when it was hidden
+        replies = Counter(parent_id for parent_id, is_hidden in rows if parent_id is not None and (hide or not is_hidden))
+        if replies:
+            decrements = values(
+                column("parent_id", Integer), column("replies", Integer), name="decrements"
+            ).data(sorted(replies.items()))
+            await self.db.execute(
+                update(Comment)
+                .where(Comment.id == decrements.c.parent_id)
+                .values(reply_count=Comment.reply_count - decrements.c.replies)
+                .execution_options(synchronize_session=False)
+            )
+        return len(rows)
+
+    async def search_comments(
+        self,
+        query: str,
+        limit: int,
+        user_id: int = None,
+        post_id: int = None,
+        created_after: datetime = None,
+        created_before: datetime = None,
+        after: tuple[datetime, int] = None,
+    ) -> list[Comment]:
+        """
+        The search_comments function finds comments, hidden ones included, matching a web search style
+        query (words, "quoted phrases", -excluded words, or) through the GIN index on their text, newest first.
+
+        :param query: str: The search query
+        :param limit: int: The page size
+        :param user_id: int: Only comments of this user
+        :param post_id: int: Only comments on this post
+        :param created_after: datetime: Only comments created at or after this time
+        :param created_before: datetime: Only comments created before this time
+        :param after: tuple[datetime, int]: The created_at and id of the last comment of the previous page
+        :return: A list of comment objects
+        """
+        stmt = (
+            select(Comment)
+            .filter(_comment_document.op("@@")(func.websearch_to_tsquery(_SEARCH_CONFIG, query)))
+            .order_by(Comment.created_at.desc(), Comment.id.desc())
+            .limit(limit)
+        )
+        if user_id is not None:
+            stmt = stmt.filter(Comment.user_id == user_id)
+        if post_id is not None:
+            stmt = stmt.filter(Comment.post_id == post_id)
+        if created_after is not None:
+            stmt = stmt.filter(Comment.created_at >= created_after)
+        if created_before is not None:
+            stmt = stmt.filter(Comment.created_at < created_before)
+        if after is not None:
+            stmt = stmt.filter(tuple_(Comment.created_at, Comment.id) < tuple_(*after))
+        comments = await self.db.execute(stmt)
+        return list(comments.scalars().all())
+
     async def delete_comment_by_post_id(self, post_id: int) -> None:
         """
         The delete_comment function deletes a comment from the database.
@@ -68,30 +245,136 @@ class CommentRepository:
         stmt = delete(Comment).filter(Comment.post_id == post_id)
         await self.db.execute(stmt)
 
-    async def get_comment_by_post_all(self, post_id: int, limit: int, offset: int) -> list[Comment]:
+    async def get_comment_by_post_all(
+        self, post_id: int, limit: int, offset: int, after: tuple[datetime, int] = None
+    ) -> list[Comment]:
         """
         The get_comment_by_post_all function returns all comments to a post from the database.
 
         :param post_id: int: Identifies the post for which we are looking for all comments
         :param limit: int: Defaults to Query(10, ge=10, le=500).
-        :param offset: int: Defaults to Query(0, ge=0)
+        :param offset: int: Defaults to Query(0, ge=0), ignored when after is given
+        :param after: tuple[datetime, int]: The created_at and id of the last comment of the previous page
         :return: All comment object
         """
+        stmt = _page_of_post(select(Comment), post_id, limit, offset, after)
+        comments = await self.db.execute(stmt)
+        return list(comments.scalars().all())
+
+    async def get_top_level_comments(
+        self, post_id: int, limit: int, after: tuple[datetime, int] = None
+    ) -> list[Comment]:
+        """
+        The get_top_level_comments function returns a page of the comments to a post that are not replies,
+        newest first, through the partial ix_comments_top_level index.
+
+        :param post_id: int: Identifies the post
+        :param limit: int: The page size
+        :param after: tuple[datetime, int]: The created_at and id of the last comment of the previous page
+        :return: A list of comment objects
+        """
+        stmt = _page_of_post(select(Comment).filter(Comment.parent_id.is_(None)), post_id, limit, 0, after)
+        comments = await self.db.execute(stmt)
+        return list(comments.scalars().all())
+
+    async def get_first_replies(self, parent_ids: list[int], limit: int) -> list[Comment]:
+        """
+        The get_first_replies function returns the oldest direct replies of each of the given comments
+        in one query. A LATERAL subquery reads at most ``limit`` rows of the (parent_id, id) index per
+        parent, so wide threads cost no more than small ones.
+
+        :param parent_ids: list[int]: The ids of the parent comments
+        :param limit: int: The number of replies per parent
+        :return: A list of comment objects ordered by parent_id and id
+        """
+        if not parent_ids or limit <= 0:
+            return []
+        parent = aliased(Comment)
+        first = (
+            select(Comment)
+            .filter(Comment.parent_id == parent.id, Comment.is_hidden.is_(False))
+            .order_by(Comment.id)
+            .limit(limit)
+            .lateral("first_replies")
+        )
+        reply = aliased(Comment, first)
+        stmt = (
+            select(reply)
+            .select_from(parent)
+            .join(first, true())
+            .filter(parent.id.in_(parent_ids))
+            .order_by(reply.parent_id, reply.id)
+        )
+        replies = await self.db.execute(stmt)
+        return list(replies.scalars().all())
+
+    async def get_replies(self, parent_id: int, limit: int, after_id: int = None) -> list[Comment]:
+        """
+        The get_replies function returns a page of the direct replies to a comment, oldest first.
+
+        :param parent_id: int: The id of the parent comment
+        :param limit: int: The page size
+        :param after_id: int: Return only replies after this id (keyset pagination)
+        :return: A list of comment objects
+        """
         stmt = (
             select(Comment)
-            .filter_by(post_id=post_id)
-            .order_by(Comment.created_at.desc())
-            .offset(offset)
+            .filter(Comment.parent_id == parent_id, Comment.is_hidden.is_(False))
+            .order_by(Comment.id)
             .limit(limit)
         )
-        comments = await self.db.execute(stmt)
-        return list(comments.scalars().all())
+        if after_id is not None:
+            stmt = stmt.filter(Comment.id > after_id)
+        replies = await self.db.execute(stmt)
+        return list(replies.scalars().all())
+
+    async def get_subtree(self, root: Comment, limit: int, after_path: str = None) -> list[Comment]:
+        """
+        The get_subtree function returns a page of all replies below a comment at any depth,
+        depth-first. The descendants are the paths between the root path and the root path with
+        its trailing "/" replaced by "0", one range scan of the ix_comments_path index.
+
+        :param root: Comment: The comment whose replies are returned
+        :param limit: int: The page size
+        :param after_path: str: Return only replies after this path (keyset pagination)
+        :return: A list of comment objects in thread order
+        """
+        stmt = (
+            select(Comment)
+            .filter(
+                Comment.path > (after_path or root.path),
+                Comment.path < root.path[:-1] + "0",
+                Comment.is_hidden.is_(False),
+            )
+            .order_by(Comment.path)
+            .limit(limit)
+        )
+        replies = await self.db.execute(stmt)
+        return list(replies.scalars().all())
+
+    async def get_comment_versions_by_post(
+        self, post_id: int, limit: int, offset: int, after: tuple[datetime, int] = None
+    ) -> list[tuple]:
+        """
+        The get_comment_versions_by_post function returns the ids and modification times
+        of a page of comments to a post, without loading the comments.
+
+        :param post_id: int: Identifies the post for which we are looking for all comments
+        :param limit: int: Defaults to Query(10, ge=10, le=500).
+        :param offset: int: Defaults to Query(0, ge=0), ignored when after is given
+        :param after: tuple[datetime, int]: The created_at and id of the last comment of the previous page
+        :return: A list of (id, updated_at) tuples in page order
+        """
+        stmt = _page_of_post(select(Comment.id, Comment.updated_at), post_id, limit, offset, after)
+        result = await self.db.execute(stmt)
+        return [tuple(row) for row in result.all()]
 
     async def get_comment_by_post_user(
         self, post_id: int, limit: int, offset: int, user: User
     ) -> list[Comment]:
         """
-        The get_comment_by_post_user function returns all user comments on a post from the database.
+        The get_comment_by_post_user function returns all user comments on a post from the database,
+        newest first. The (post_id, user_id) index finds the comments of the user.
 
         :param post_id: int: specifies the post for which we are looking for all comments
         :param limit: int: Defaults to Query(10, ge=10, le=500).
@@ -102,6 +385,7 @@ class CommentRepository:
         stmt = (
             select(Comment)
             .filter(Comment.post_id == post_id, Comment.user_id == user.id)
+            .order_by(Comment.created_at.desc(), Comment.id.desc())
             .offset(offset)
             .limit(limit)
         )
@@ -112,7 +396,8 @@ class CommentRepository:
         self, post_id: int, user_id: int, limit: int, offset: int
     ) -> list[Comment]:
         """
-        Retrieve all comments for a specific post made by a specific user.
+        Retrieve all comments for a specific post made by a specific user, newest first,
+        through the (post_id, user_id) index.
 
         :param post_id: int: ID of the post to filter comments.
         :param user_id: int: ID of the user to filter comments.
@@ -123,21 +408,55 @@ class CommentRepository:
         stmt = (
             select(Comment)
             .filter(Comment.post_id == post_id, Comment.user_id == user_id)
+            .order_by(Comment.created_at.desc(), Comment.id.desc())
             .offset(offset)
             .limit(limit)
         )
         comments = await self.db.execute(stmt)
         return list(comments.scalars())
 
-    async def exists_comment(self, comment: str, user_id: int) -> Comment:
+    async def exists_comment(self, comment: str, user_id: int, within: int = None) -> Comment:
         """
-        The exists_comment function checks if a user comment exists.
+        The exists_comment function checks if a user comment exists. Comments are compared by the
+        hash of their normalized text, one probe of the (user_id, comment_hash, created_at) index.
 
         :param comment: int: Comment text
         :param user_id: int: Specifies the user who created the comment
-        :return: If the comment exists, returns the comment.
+        :param within: int: Only consider comments created in the last ``within`` seconds
+        :return: If the comment exists, returns the most recent one.
         """
-        stmt = select(Comment).filter(Comment.user_id == user_id, Comment.comment == comment)
+        stmt = (
+            select(Comment)
+            .filter(Comment.user_id == user_id, Comment.comment_hash == Comment.hash_comment(comment))
+            .order_by(Comment.created_at.desc())
+            .limit(1)
+        )
+        if within is not None:
+            stmt = stmt.filter(Comment.created_at >= func.now() - timedelta(seconds=within))
         result = await self.db.execute(stmt)
         comment = result.scalar_one_or_none()
         return comment
+
+    async def stream_comments_by_user(self, user_id: int, yield_per: int) -> AsyncResult:
+        """
+        The stream_comments_by_user function streams all comments of a user through a server-side cursor.
+
+        :param user_id: int: Identify the user whose comments are streamed
+        :param yield_per: int: The number of rows fetched from the cursor at a time
+        :return: A streamed result of comment rows ordered by id
+        """
+        stmt = (
+            select(
+                Comment.id,
+                Comment.post_id,
+                Comment.parent_id,
+                Comment.comment,
+                Comment.is_update,
+                Comment.created_at,
+                Comment.updated_at,
+            )
+            .filter(Comment.user_id == user_id)
+            .order_by(Comment.id)
+            .execution_options(yield_per=yield_per)
+        )
+        return await self.db.stream(stmt)
@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, status, Path, Query
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, status, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from conf import const
 from database.db import get_db
 from src.users.models import User
 from src.services.auth import auth_service
-from src.comments.schema import CommentResponse, CommentUpdateResponse, CommentBase
+from src.comments.schema import (
+    CommentResponse, CommentUpdateResponse, CommentBase, CommentThread, CommentModerationResponse
+)
 from src.comments.comments_services import CommentService
 
 from src.users.schemas import RoleEnum
 from src.services.auth.auth_service import RoleChecker
+from src.services.etag import is_not_modified, not_modified
+from src.services.pagination import NEXT_CURSOR_HEADER, next_cursor
 
 
 router = APIRouter(prefix="/comments", tags=["comments"])
@@ -38,6 +46,27 @@ async def add_comment(
     return await comment_service.add_comment(post_id, body, current_user)
 
 
+@router.post("/{comment_id}/replies", response_model=CommentResponse)
+async def add_reply(
+    body: CommentBase,
+    comment_id: int = Path(..., ge=1, le=2147483647),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    The add_reply function creates a reply to the comment with the given id.
+    Replies can be replied to as well, up to COMMENT_MAX_DEPTH levels.
+
+    :param body: CommentBase: Pass the data from the request body to the function
+    :param comment_id: int: Specify the comment that is being replied to
+    :param db: Session: Pass the database session to the repository layer
+    :param current_user: User: Check if the user is logged in
+    :return: A comment object, which is then serialized as json
+    """
+    comment_service = CommentService(db)
+    return await comment_service.add_reply(comment_id, body, current_user)
+
+
 @router.put("/{comment_id}", response_model=CommentUpdateResponse)
 async def edit_comment(
     body: CommentBase,
@@ -91,24 +120,156 @@ async def delete_comment(
 
 @router.get("/{post_id}", response_model=list[CommentUpdateResponse])
 async def get_comment_by_post_all(
+    request: Request,
+    response: Response,
     post_id: int = Path(..., ge=1, le=2147483647),
     limit: int = Query(10, ge=10, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str = Query(None, description="Cursor of the next page from the X-Next-Cursor header"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
     """
-    The get_comment_by_post_all function returns all comments of a post
+    The get_comment_by_post_all function returns all comments of a post, newest first.
+    It responds with 304 Not Modified when the If-None-Match header matches the page ETag.
+    Pass the X-Next-Cursor header of a page as cursor to get the next one,
+    which stays fast on deep pages unlike offset.
 
+    :param request: Request: Read the If-None-Match header
+    :param response: Response: Set the ETag and X-Next-Cursor headers
     :param post_id: int: Specify the post that the comment is being created for
     :param limit: int: Defaults to Query(10, ge=10, le=500).
-    :param offset: int: Defaults to Query(0, ge=0)
+    :param offset: int: Defaults to Query(0, ge=0), ignored when a cursor is given
+    :param cursor: str: The cursor of the page
     :param db: Session: Get the database session
     :param current_user: User: Check if the user is logged in
     :return: All comment objects for the given post
     """
     comment_service = CommentService(db)
-    return await comment_service.get_comment_by_post_all(post_id, limit, offset)
+    etag = await comment_service.get_comment_by_post_all_etag(post_id, limit, offset, cursor)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    comments = await comment_service.get_comment_by_post_all(post_id, limit, offset, cursor)
+    cursor = next_cursor(comments, limit, "created_at", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return comments
+
+
+@router.get("/{post_id}/stream", response_class=StreamingResponse)
+async def stream_post_events(
+    post_id: int = Path(..., ge=1, le=2147483647),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    The stream_post_events function subscribes to a post with Server-Sent Events instead of polling
+    its comments. Events are comment.created, comment.updated, comment.deleted, score.created,
+    score.updated and score.deleted with a JSON payload. A client that falls behind receives
+    a reset event and the stream ends; it should reload the comments and subscribe again.
+
+    :param post_id: int: Specify the post
+    :param db: Session: Get the database session
+    :param current_user: User: Check if the user is logged in
+    :return: A text/event-stream response
+    """
+    comment_service = CommentService(db)
+    events = await comment_service.stream_events(post_id)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{post_id}/threads", response_model=list[CommentThread])
+async def get_threads(
+    response: Response,
+    post_id: int = Path(..., ge=1, le=2147483647),
+    limit: int = Query(10, ge=1, le=100),
+    replies: int = Query(3, ge=0, le=const.COMMENT_THREAD_MAX_REPLIES),
+    cursor: str = Query(None, description="Cursor of the next page from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    The get_threads function returns a page of the top-level comments of a post, newest first,
+    each with its first replies. The replies_cursor of a thread loads more of its replies
+    from /comments/{comment_id}/replies.
+
+    :param response: Response: Set the X-Next-Cursor header
+    :param post_id: int: Specify the post
+    :param limit: int: The number of top-level comments per page
+    :param replies: int: The number of replies included per thread
+    :param cursor: str: The cursor of the page
+    :param db: Session: Get the database session
+    :param current_user: User: Check if the user is logged in
+    :return: The threads of the page
+    """
+    comment_service = CommentService(db)
+    threads = await comment_service.get_threads(post_id, limit, replies, cursor)
+    cursor = next_cursor(threads, limit, "created_at", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return threads
+
+
+@router.get("/{comment_id}/replies", response_model=list[CommentUpdateResponse])
+async def get_replies(
+    response: Response,
+    comment_id: int = Path(..., ge=1, le=2147483647),
+    limit: int = Query(10, ge=1, le=500),
+    cursor: str = Query(None, description="replies_cursor of a thread or X-Next-Cursor of a page"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    The get_replies function returns a page of the direct replies to a comment, oldest first.
+
+    :param response: Response: Set the X-Next-Cursor header
+    :param comment_id: int: Specify the comment
+    :param limit: int: The number of replies per page
+    :param cursor: str: The cursor of the page
+    :param db: Session: Get the database session
+    :param current_user: User: Check if the user is logged in
+    :return: The replies of the page
+    """
+    comment_service = CommentService(db)
+    replies = await comment_service.get_replies(comment_id, limit, cursor)
+    cursor = next_cursor(replies, limit, "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return replies
+
+
+@router.get("/{comment_id}/subtree", response_model=list[CommentUpdateResponse])
+async def get_subtree(
+    response: Response,
+    comment_id: int = Path(..., ge=1, le=2147483647),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str = Query(None, description="Cursor of the next page from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    The get_subtree function returns a page of all replies below a comment at any depth,
+    each reply followed by its own replies. parent_id and depth rebuild the tree.
+
+    :param response: Response: Set the X-Next-Cursor header
+    :param comment_id: int: Specify the comment
+    :param limit: int: The number of replies per page
+    :param cursor: str: The cursor of the page
+    :param db: Session: Get the database session
+    :param current_user: User: Check if the user is logged in
+    :return: The replies of the page
+    """
+    comment_service = CommentService(db)
+    replies = await comment_service.get_subtree(comment_id, limit, cursor)
+    cursor = next_cursor(replies, limit, "path")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return replies
 
 
 @router.get("/user/{post_id}", response_model=list[CommentUpdateResponse])
@@ -162,3 +323,48 @@ async def get_comment_by_post_author(
     """
     comment_service = CommentService(db)
     return await comment_service.get_comment_by_post_author(post_id, user_id, limit, offset)
+
+
+@router_admin.get(
+    "/search",
+    response_model=list[CommentModerationResponse],
+    dependencies=[
+        Depends(RoleChecker([RoleEnum.MODER, RoleEnum.ADMIN])),
+    ],
+)
+async def search_comments(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description='Words, "phrases", -excluded words, or'),
+    user_id: int = Query(None, ge=1, le=2147483647),
+    post_id: int = Query(None, ge=1, le=2147483647),
+    created_after: datetime = Query(None),
+    created_before: datetime = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = Query(None, description="Cursor of the next page from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    The search_comments function searches the text of all comments, hidden ones included, newest first.
+    Only administrators and moderators have access to this route.
+
+    :param response: Response: Set the X-Next-Cursor header
+    :param q: str: The search query
+    :param user_id: int: Only comments of this user
+    :param post_id: int: Only comments on this post
+    :param created_after: datetime: Only comments created at or after this time
+    :param created_before: datetime: Only comments created before this time
+    :param limit: int: The number of comments per page
+    :param cursor: str: The cursor of the page
+    :param db: Session: Get the database session
+    :param current_user: User: Check if the user is logged in
+    :return: The matching comment objects
+    """
+    comment_service = CommentService(db)
+    comments = await comment_service.search_comments(
+        q, limit, user_id, post_id, created_after, created_before, cursor
+    )
+    cursor = next_cursor(comments, limit, "created_at", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return comments
@@ -14,6 +14,9 @@ class CommentResponse(BaseModel):
     user_id: int
     comment: str
     created_at: datetime
+    parent_id: Optional[int] = None
+    depth: int = 0
+    reply_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -23,5 +26,14 @@ class CommentUpdateResponse(CommentResponse):
     updated_at: Optional[datetime]
 
 
+class CommentThread(CommentUpdateResponse):
+    replies: list[CommentUpdateResponse] = []
+    replies_cursor: Optional[str] = None
+
+
+class CommentModerationResponse(CommentUpdateResponse):
+    is_hidden: bool = False
+
+
 class MessageResponse(BaseModel):
     message: str
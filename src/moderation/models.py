@@ -0,0 +1,22 @@
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from conf.config import Base
+
+
+class ModerationJob(Base):
+    __tablename__ = "moderation_jobs"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    requested_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    comment_action: Mapped[str] = mapped_column(String(20), nullable=True)
+    delete_scores: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    created_after: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
+    created_before: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    comments_processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    scores_processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    error: Mapped[str] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[DateTime] = mapped_column("created_at", DateTime, default=func.now())
+    started_at: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
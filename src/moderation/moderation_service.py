@@ -0,0 +1,128 @@
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from conf import const, messages
+from database.db import sessionmanager
+from src.comments.repository import CommentRepository
+from src.moderation.models import ModerationJob
+from src.moderation.repository import ModerationRepository
+from src.moderation.schemas import CommentAction, JobStatus, ModerationJobCreate
+from src.posts.rankings import ranking_tracker
+from src.scores.repository import ScoreRepository
+from src.users.models import User
+from src.users.repository import UserRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ModerationService:
+    """
+    Service for bulk moderation: jobs that delete or hide all comments and delete all scores of a user.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        :param db: AsyncSession: The asynchronous database session instance.
+        """
+        self.moderation_repository = ModerationRepository(db)
+        self.user_repository = UserRepository(db)
+
+    async def create_job(self, body: ModerationJobCreate, moderator: User) -> ModerationJob:
+        """
+        Create a moderation job, to be run with ``run_moderation_job``.
+
+        :param body: ModerationJobCreate: The user to moderate and what to do with their content.
+        :param moderator: User: The user requesting the job.
+        :return: ModerationJob: The pending job.
+        :raises HTTPException: If the job has nothing to do or an empty time range (400),
+            or the user is not found (404).
+        """
+        if body.comment_action is None and not body.delete_scores:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.MODERATION_JOB_EMPTY)
+        if body.created_after and body.created_before and body.created_after >= body.created_before:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.MODERATION_JOB_RANGE)
+        if await self.user_repository.get_user_by_id(body.user_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.USER_NOT_FOUND)
+        return await self.moderation_repository.create_job(body, moderator)
+
+    async def get_job(self, job_id: int) -> ModerationJob:
+        """
+        Retrieve a moderation job and its progress.
+
+        :param job_id: int: ID of the job.
+        :return: ModerationJob: The job.
+        :raises HTTPException: If the job is not found.
+        """
+        job = await self.moderation_repository.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=messages.MODERATION_JOB_NOT_FOUND)
+        return job
+
+    async def get_jobs(self, user_id: int | None, limit: int, offset: int) -> list[ModerationJob]:
+        """
+        Retrieve moderation jobs, newest first.
+
+        :param user_id: int | None: Only jobs moderating this user.
+        :param limit: int: The maximum number of jobs to retrieve.
+        :param offset: int: The number of jobs to skip.
+        :return: list[ModerationJob]: The jobs.
+        """
+        return await self.moderation_repository.get_jobs(user_id, limit, offset)
+
+
+async def run_moderation_job(job_id: int) -> None:
+    """
+    Run a moderation job in a session of its own, e.g. as a background task.
+
+    Comments and scores are processed in batches of MODERATION_BATCH_SIZE rows. Each batch is one
+    set-based statement that also corrects the reply counts, rating histograms and score stats,
+    and is committed together with the progress of the job, so an interrupted job has a consistent
+    state and reports how far it got.
+
+    :param job_id: The unique identifier of the job.
+    """
+    async with sessionmanager.session() as session:
+        moderation_repository = ModerationRepository(session)
+        job = await moderation_repository.get_job(job_id)
+        if job is None or job.status != JobStatus.PENDING.value:
+            return
+        await moderation_repository.set_status(job.id, JobStatus.RUNNING)
+        await session.commit()
+
+        comment_repository = CommentRepository(session)
+        score_repository = ScoreRepository(session)
+        batch_size = const.MODERATION_BATCH_SIZE
+        try:
+            while job.comment_action is not None:
+                processed = await comment_repository.purge_comments_by_user(
+                    job.user_id,
+                    batch_size,
+                    hide=job.comment_action == CommentAction.HIDE.value,
+                    created_after=job.created_after,
+                    created_before=job.created_before,
+                )
+                await moderation_repository.add_progress(job.id, comments=processed)
+                await session.commit()
+                if processed < batch_size:
+                    break
+
+            while job.delete_scores:
+                deleted = await score_repository.purge_scores_by_user(
+                    job.user_id, batch_size, job.created_after, job.created_before
+                )
+                await moderation_repository.add_progress(job.id, scores=len(deleted))
+                await session.commit()
+                for post_id in {post_id for post_id, _ in deleted}:
+                    ranking_tracker.record(post_id)
+                if len(deleted) < batch_size:
+                    break
+
+            await moderation_repository.set_status(job.id, JobStatus.DONE)
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Moderation job {job.id} failed: {e}")
+            await session.rollback()
+            await moderation_repository.set_status(job.id, JobStatus.FAILED, str(e)[:500])
+            await session.commit()
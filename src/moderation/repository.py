@@ -0,0 +1,94 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.moderation.models import ModerationJob
+from src.moderation.schemas import JobStatus, ModerationJobCreate
+from src.users.models import User
+
+
+class ModerationRepository:
+    def __init__(self, db: AsyncSession):
+        self.session = db
+
+    async def create_job(self, body: ModerationJobCreate, moderator: User) -> ModerationJob:
+        """
+        Create a pending moderation job.
+
+        :param body: The content of the user to moderate and what to do with it.
+        :param moderator: The user requesting the job.
+        :return: The created job.
+        """
+        job = ModerationJob(
+            user_id=body.user_id,
+            requested_by=moderator.id,
+            comment_action=body.comment_action.value if body.comment_action else None,
+            delete_scores=body.delete_scores,
+            created_after=body.created_after,
+            created_before=body.created_before,
+            status=JobStatus.PENDING.value,
+        )
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def get_job(self, job_id: int) -> ModerationJob | None:
+        """
+        Retrieve a moderation job by its ID.
+
+        :param job_id: The unique identifier of the job.
+        :return: The job, or None if it does not exist.
+        """
+        stmt = select(ModerationJob).where(ModerationJob.id == job_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_jobs(self, user_id: int | None, limit: int, offset: int) -> list[ModerationJob]:
+        """
+        Retrieve moderation jobs, newest first.
+
+        :param user_id: Only jobs moderating this user, None for all jobs.
+        :param limit: The maximum number of jobs to return.
+        :param offset: The number of jobs to skip.
+        :return: A list of jobs.
+        """
+        stmt = select(ModerationJob).order_by(ModerationJob.id.desc()).offset(offset).limit(limit)
+        if user_id is not None:
+            stmt = stmt.where(ModerationJob.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def set_status(self, job_id: int, status: JobStatus, error: str = None) -> None:
+        """
+        Move a job to another status, without committing. Starting a job sets started_at,
+        finishing or failing it sets finished_at.
+
+        :param job_id: The unique identifier of the job.
+        :param status: The new status.
+        :param error: The reason a job failed.
+        """
+        changes = {"status": status.value, "error": error}
+        if status is JobStatus.RUNNING:
+            changes["started_at"] = func.now()
+        elif status in (JobStatus.DONE, JobStatus.FAILED):
+            changes["finished_at"] = func.now()
+        stmt = update(ModerationJob).where(ModerationJob.id == job_id).values(**changes)
+        await self.session.execute(stmt)
+
+    async def add_progress(self, job_id: int, comments: int = 0, scores: int = 0) -> None:
+        """
+        Count processed rows of a job, without committing, so progress is committed together with the batch.
+
+        :param job_id: The unique identifier of the job.
+        :param comments: The number of comments deleted or hidden.
+        :param scores: The number of scores deleted.
+        """
+        stmt = (
+            update(ModerationJob)
+            .where(ModerationJob.id == job_id)
+            .values(
+                comments_processed=ModerationJob.comments_processed + comments,
+                scores_processed=ModerationJob.scores_processed + scores,
+            )
+        )
+        await self.session.execute(stmt)
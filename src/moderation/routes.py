@@ -0,0 +1,76 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Path, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import get_db
+from src.moderation.moderation_service import ModerationService, run_moderation_job
+from src.moderation.schemas import ModerationJobCreate, ModerationJobResponse
+from src.services.auth import auth_service
+from src.services.auth.auth_service import RoleChecker
+from src.users.models import User
+from src.users.schemas import RoleEnum
+
+router_admin = APIRouter(
+    prefix="/admin/moderation",
+    tags=["moderation"],
+    dependencies=[Depends(RoleChecker([RoleEnum.MODER, RoleEnum.ADMIN]))],
+)
+
+
+@router_admin.post("/jobs", response_model=ModerationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_moderation_job(
+    body: ModerationJobCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    Start a job that deletes or hides all comments and deletes all scores of a user,
+    optionally only those created within a time range. The job runs in the background;
+    poll GET /admin/moderation/jobs/{job_id} for its progress.
+
+    :param body: The user to moderate and what to do with their content.
+    :param background_tasks: Runs the job after the response is sent.
+    :param db: The database session.
+    :param current_user: The moderator requesting the job.
+    :return: The pending job.
+    """
+    moderation_service = ModerationService(db)
+    job = await moderation_service.create_job(body, current_user)
+    background_tasks.add_task(run_moderation_job, job.id)
+    return job
+
+
+@router_admin.get("/jobs/{job_id}", response_model=ModerationJobResponse)
+async def get_moderation_job(
+    job_id: int = Path(..., ge=1, le=2147483647),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Retrieve a moderation job with its status and the number of comments and scores processed so far.
+
+    :param job_id: The ID of the job.
+    :param db: The database session.
+    :return: The job.
+    """
+    moderation_service = ModerationService(db)
+    return await moderation_service.get_job(job_id)
+
+
+@router_admin.get("/jobs", response_model=list[ModerationJobResponse])
+async def get_moderation_jobs(
+    user_id: int = Query(None, ge=1, le=2147483647),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Retrieve moderation jobs, newest first.
+
+    :param user_id: Only jobs moderating this user.
+    :param limit: The maximum number of jobs to retrieve.
+    :param offset: The number of jobs to skip.
+    :param db: The database session.
+    :return: A list of jobs.
+    """
+    moderation_service = ModerationService(db)
+    return await moderation_service.get_jobs(user_id, limit, offset)
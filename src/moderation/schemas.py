@@ -0,0 +1,46 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CommentAction(Enum):
+    DELETE = "delete"
+    HIDE = "hide"
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ModerationJobCreate(BaseModel):
+    user_id: int = Field(..., ge=1, description="ID of the user whose content is moderated")
+    comment_action: Optional[CommentAction] = Field(
+        CommentAction.DELETE, description="Delete or hide the comments of the user, null to keep them"
+    )
+    delete_scores: bool = Field(True, description="Delete the scores given by the user")
+    created_after: Optional[datetime] = Field(None, description="Only content created at or after this time")
+    created_before: Optional[datetime] = Field(None, description="Only content created before this time")
+
+
+class ModerationJobResponse(BaseModel):
+    id: int
+    user_id: int
+    requested_by: int
+    comment_action: Optional[CommentAction]
+    delete_scores: bool
+    created_after: Optional[datetime]
+    created_before: Optional[datetime]
+    status: JobStatus
+    comments_processed: int
+    scores_processed: int
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
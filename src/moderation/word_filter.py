@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import HTTPException, status
+
+from conf import messages
+from conf.config import app_config
+
+logger = logging.getLogger("uvicorn.error")
+
+FLAG_PREFIX = "~"
+_END = ""
+
+
+@dataclass
+class FilterMatch:
+    blocked: list[str] = field(default_factory=list)
+    flagged: list[str] = field(default_factory=list)
+
+
+def _trie_pattern(node: dict) -> str:
+    """
+    Turn a character trie into a regular expression that tries every shared prefix once.
+    """
+    alternatives = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char != _END]
+    if not alternatives:
+        return ""
+    if len(alternatives) == 1 and _END not in node:
+        return alternatives[0]
+    pattern = "(?:" + "|".join(alternatives) + ")"
+    return pattern + "?" if _END in node else pattern
+
+
+def compile_terms(terms: list[str]) -> re.Pattern | None:
+    """
+    Compile terms into one regular expression built from their trie, which matches whole words
+    and prefers the longest term. Matching costs one pass over the text instead of one per term.
+
+    :param terms: The lower-case terms.
+    :return: The compiled expression, or None if there are no terms.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+    if not trie:
+        return None
+    return re.compile(r"(?<!\w)" + _trie_pattern(trie) + r"(?!\w)")
+
+
+class WordFilter:
+    """
+    Finds banned terms in user text. Terms are read from a text file, one per line: a term blocks
+    the text, a term prefixed with "~" only flags it for moderators. Empty lines and lines starting
+    with "#" are ignored, matching is case-insensitive.
+
+    The terms are compiled once; ``reload`` recompiles them when the file changes and swaps the
+    compiled expression in, so requests never see a half-built filter.
+    """
+
+    def __init__(self, path: Path | None = None):
+        """
+        :param path: The term file, None to allow every text.
+        """
+        self.path = path
+        self._pattern: re.Pattern | None = None
+        self._severity: dict[str, bool] = {}
+        self._mtime: float | None = None
+
+    def load_terms(self, lines: list[str]) -> None:
+        """
+        Compile a term list.
+
+        :param lines: The lines of a term file.
+        """
+        severity = {}
+        for line in lines:
+            line = line.strip().lower()
+            if not line or line.startswith("#"):
+                continue
+            flagged = line.startswith(FLAG_PREFIX)
+            term = line.removeprefix(FLAG_PREFIX).strip()
+            if term:
+                # A term listed both ways blocks
+                severity[term] = severity.get(term, True) and flagged
+        self._pattern, self._severity = compile_terms(list(severity)), severity
+
+    async def reload(self) -> bool:
+        """
+        Recompile the terms if the term file changed since the last load.
+
+        :return: True if the terms were reloaded.
+        """
+        if self.path is None:
+            return False
+        mtime = self.path.stat().st_mtime
+        if mtime == self._mtime:
+            return False
+        lines = await asyncio.to_thread(self._read_lines)
+        await asyncio.to_thread(self.load_terms, lines)
+        self._mtime = mtime
+        logger.info(f"Loaded {len(self._severity)} filtered terms from {self.path}")
+        return True
+
+    def _read_lines(self) -> list[str]:
+        return self.path.read_text(encoding="utf-8").splitlines()
+
+    def check(self, text: str) -> FilterMatch:
+        """
+        Find the filtered terms in a text.
+
+        :param text: The text to check.
+        :return: The distinct blocked and flagged terms found.
+        """
+        match = FilterMatch()
+        pattern, severity = self._pattern, self._severity
+        if pattern is None:
+            return match
+        for term in dict.fromkeys(pattern.findall(text.lower())):
+            (match.flagged if severity[term] else match.blocked).append(term)
+        return match
+
+
+def enforce_word_filter(text: str, source: str) -> None:
+    """
+    Reject text with blocked terms and log text with flagged terms.
+
+    :param text: The text written by a user.
+    :param source: What the text is, used in the log message.
+    :raises HTTPException: If the text contains a blocked term.
+    """
+    match = word_filter.check(text)
+    if match.blocked:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.BANNED_TERMS)
+    if match.flagged:
+        logger.warning(f"Flagged terms in {source}: {', '.join(match.flagged)}")
+
+
+word_filter = WordFilter(app_config.WORD_FILTER_PATH)
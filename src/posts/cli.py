@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from database.db import sessionmanager
+from src.posts.import_service import PostImportService
+from src.posts.schemas import ManifestFormat
+
+
+async def import_posts(path: Path, user_id: int, manifest_format: ManifestFormat | None) -> None:
+    """
+    Import posts from a manifest file and print the import report.
+
+    :param path: Path to the NDJSON or CSV manifest.
+    :param user_id: The default owner of imported posts.
+    :param manifest_format: Optional manifest format, detected from the file extension if omitted.
+    """
+    async with sessionmanager.session() as session:
+        import_service = PostImportService(session)
+        manifest_format = import_service.detect_format(path.name, manifest_format)
+        report = await import_service.import_posts(path.read_text(encoding="utf-8"), manifest_format, user_id)
+
+    print(f"Imported {report.posts} posts, {report.post_tags} post tags, {report.tags} tags "
+          f"in {report.elapsed_seconds}s ({report.rows_per_second} rows/sec)")
+    for error in report.rejected:
+        print(f"Rejected line {error.line}: {error.detail}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Posts maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Bulk import posts from an NDJSON or CSV manifest")
+    import_parser.add_argument("manifest", type=Path, help="Path to the manifest file")
+    import_parser.add_argument("--user-id", type=int, required=True, help="Default owner of imported posts")
+    import_parser.add_argument("--format", choices=[f.value for f in ManifestFormat], default=None)
+
+    args = parser.parse_args()
+    if args.command == "import":
+        manifest_format = ManifestFormat(args.format) if args.format else None
+        asyncio.run(import_posts(args.manifest, args.user_id, manifest_format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import time
+from collections import Counter
+from datetime import datetime
+
+from asyncpg import PostgresError
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from conf import messages, const
+from src.posts.post_service import PostService
+from src.posts.repository import PostRepository
+from src.posts.schemas import ManifestFormat, PostImportError, PostImportReport
+from src.tags.models import TagUsageBucket
+from src.tags.repository import TagRepository
+from src.tags.tag_service import TagService
+from src.users.repository import UserRepository
+
+
+class PostImportService:
+    """
+    Bulk import of already-hosted images as posts from an NDJSON or CSV manifest.
+
+    Every manifest entry describes one post with the fields ``image_url`` (required),
+    ``original_image_url`` (defaults to ``image_url``), ``description``, ``tags``
+    (a list or a comma-separated string) and ``user_id`` (defaults to the importing user).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.post_repository = PostRepository(db)
+        self.tag_repository = TagRepository(db)
+        self.user_repository = UserRepository(db)
+
+    @staticmethod
+    def detect_format(filename: str | None, manifest_format: ManifestFormat | None) -> ManifestFormat:
+        """
+        Resolve the manifest format from an explicit value or the file extension.
+
+        :param filename: The name of the uploaded manifest file.
+        :param manifest_format: The explicitly requested format, if any.
+        :return: The resolved ManifestFormat.
+        :raises HTTPException: If the format can not be resolved.
+        """
+        if manifest_format:
+            return manifest_format
+        extension = (filename or "").rsplit(".", 1)[-1].lower()
+        if extension in ("ndjson", "jsonl"):
+            return ManifestFormat.NDJSON
+        if extension == "csv":
+            return ManifestFormat.CSV
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=messages.IMPORT_FORMAT_ERROR,
+        )
+
+    @staticmethod
+    def read_manifest(content: str, manifest_format: ManifestFormat) -> list[tuple[int, dict | None]]:
+        """
+        Split a manifest into raw entries.
+
+        :param content: The manifest content.
+        :param manifest_format: The format of the manifest.
+        :return: A list of (line number, entry) pairs, the entry is None for unparsable lines.
+        """
+        entries = []
+        if manifest_format == ManifestFormat.CSV:
+            reader = csv.DictReader(io.StringIO(content))
+            for row in reader:
+                entries.append((reader.line_num, row))
+            return entries
+
+        for line_number, line in enumerate(content.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            entries.append((line_number, entry if isinstance(entry, dict) else None))
+        return entries
+
+    @staticmethod
+    async def _validate_entry(entry: dict | None, default_user_id: int) -> dict:
+        """
+        Validate a raw manifest entry and normalize it into post fields.
+
+        :param entry: The raw manifest entry.
+        :param default_user_id: The user the post belongs to when the entry has no user_id.
+        :return: A dictionary with the normalized post fields.
+        :raises HTTPException: If the entry is invalid.
+        """
+        if entry is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.IMPORT_ROW_INVALID)
+
+        image_url = (entry.get("image_url") or "").strip()
+        original_image_url = (entry.get("original_image_url") or "").strip() or image_url
+        if not image_url:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.IMPORT_IMAGE_URL_REQUIRED)
+        if max(len(image_url), len(original_image_url)) > const.POST_IMAGE_URL_MAX_LENGTH:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.IMPORT_IMAGE_URL_LIMIT)
+
+        description = entry.get("description") or ""
+        await PostService.check_description(description)
+
+        tags = entry.get("tags") or ""
+        if isinstance(tags, list):
+            tags = ",".join(str(tag) for tag in tags)
+        tags = await TagService.check_and_format_tag(tags)
+
+        try:
+            user_id = int(entry.get("user_id") or default_user_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.IMPORT_ROW_INVALID)
+
+        return {
+            "original_image_url": original_image_url,
+            "image_url": image_url,
+            "description": description,
+            "user_id": user_id,
+            "tags": tags,
+        }
+
+    async def import_posts(self, content: str, manifest_format: ManifestFormat, default_user_id: int) -> PostImportReport:
+        """
+        Import posts from a manifest: upsert all tags in one statement and load posts
+        and post_tag rows with COPY in a single transaction.
+
+        :param content: The manifest content.
+        :param manifest_format: The format of the manifest.
+        :param default_user_id: The user the posts belong to when an entry has no user_id.
+        :return: A PostImportReport with counts, rejected entries and throughput.
+        """
+        started = time.perf_counter()
+        entries = self.read_manifest(content, manifest_format)
+        if len(entries) > const.POST_IMPORT_MAX_ROWS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.IMPORT_ROWS_LIMIT)
+
+        valid, rejected = [], []
+        for line_number, entry in entries:
+            try:
+                valid.append(await self._validate_entry(entry, default_user_id))
+            except HTTPException as e:
+                rejected.append(PostImportError(line=line_number, detail=e.detail))
+
+        existing_user_ids = await self.user_repository.get_existing_user_ids({post["user_id"] for post in valid})
+        posts = [post for post in valid if post["user_id"] in existing_user_ids]
+        if len(posts) != len(valid):
+            rejected.append(PostImportError(line=0, detail=f"{len(valid) - len(posts)} {messages.USER_NOT_FOUND}"))
+
+        tags_count, post_tags = 0, []
+        if posts:
+            try:
+                tags = await self.tag_repository.upsert_tags(set().union(*(post["tags"] for post in posts)))
+                tag_ids = {tag.name: tag.id for tag in tags}
+                tags_count = len(tag_ids)
+
+                post_ids = await self.post_repository.reserve_post_ids(len(posts))
+                now = datetime.now()
+                post_records = []
+                for post_id, post in zip(post_ids, posts):
+                    post_records.append((
+                        post_id,
+                        post["original_image_url"],
+                        post["image_url"],
+                        post["description"],
+                        post["user_id"],
+                        now,
+                        now,
+                    ))
+                    post_tags.extend((post_id, tag_ids[tag]) for tag in post["tags"])
+
+                await self.post_repository.copy_posts(post_records, post_tags)
+                await self.tag_repository.add_tag_usage(
+                    Counter(tag_id for _, tag_id in post_tags), TagUsageBucket.bucket_of(now)
+                )
+                await self.post_repository.session.commit()
+            except (IntegrityError, PostgresError) as e:
+                await self.post_repository.session.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{messages.DATA_INTEGRITY_ERROR}. -//- {e}",
+                )
+
+        elapsed = time.perf_counter() - started
+        rows = len(posts) + len(post_tags)
+        return PostImportReport(
+            posts=len(posts),
+            tags=tags_count,
+            post_tags=len(post_tags),
+            rejected=rejected,
+            elapsed_seconds=round(elapsed, 4),
+            rows_per_second=round(rows / elapsed, 1) if elapsed else 0.0,
+        )
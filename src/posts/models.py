@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from conf.config import Base
@@ -18,6 +18,7 @@ class Post(Base):
     image_url: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    view_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[DateTime] = mapped_column("created_at", DateTime, default=func.now())
     updated_at: Mapped[DateTime] = mapped_column("updated_at", DateTime, default=func.now(), onupdate=func.now())
     tags: Mapped[set["Tag"]] = relationship(
@@ -26,3 +27,18 @@ class Post(Base):
         backref="posts",
         lazy="joined"
     )
+
+
+class PostRanking(Base):
+    __tablename__ = "post_rankings"
+    post_id: Mapped[int] = mapped_column(Integer, ForeignKey("posts.id"), primary_key=True)
+    trending_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    rating_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    score_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    weighted_rating: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    refreshed_at: Mapped[DateTime] = mapped_column("refreshed_at", DateTime, default=func.now(), onupdate=func.now())
+
+
+Index("ix_post_rankings_trending", PostRanking.trending_score.desc(), PostRanking.post_id.desc())
+Index("ix_post_rankings_weighted", PostRanking.weighted_rating.desc(), PostRanking.post_id.desc())
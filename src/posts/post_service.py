@@ -4,11 +4,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from conf import messages, const
 from src.comments.repository import CommentRepository
+from src.moderation.word_filter import enforce_word_filter
 from src.posts.models import Post
+from src.posts.rankings import ranking_tracker
+from src.posts.views import view_counter
+from src.posts.schemas import PostResponseSchema, PostSortEnum
 from src.scores.repository import ScoreRepository
 from src.urls.image_service import URLService
+from src.services.etag import make_etag
 from src.services.qr_service import QRService
-from src.posts.repository import PostRepository
+from src.posts.repository import PostRankingRepository, PostRepository
+from src.tags.cache import tag_cache
 from src.tags.tag_service import TagService
 from src.urls.repository import URLRepository
 from src.users.models import User
@@ -24,6 +30,7 @@ class PostService:
         self.tag_service = TagService(db)
         self.qr_service = QRService
         self.post_repository = PostRepository(db)
+        self.post_ranking_repository = PostRankingRepository(db)
         self.score_repository = ScoreRepository(db)
         self.comment_repository = CommentRepository(db)
 
@@ -63,12 +70,14 @@ class PostService:
         await self.check_description(description)
         await self.check_image_filter(image_filter)
 
-        image_urls = await self.cloudinary_service.get_image_urls(image, image_filter)
         tags = await self.tag_service.check_and_format_tag(tags)
+        image_urls = await self.image_service.store_image(image, image_filter)
 
         try:
             tags = await self.tag_service.get_or_create_tags(tags)
+            await self.tag_service.record_tag_usage(tags, 1)
             post = await self.post_repository.create_post(user, description, tags, image_urls)
+            tag_cache.add(tags)
 
             if image_urls[const.EDITED_IMAGE_URL] != image_urls[const.ORIGINAL_IMAGE_URL]:
                 await self.image_service.create_image(post.id, post.image_url, image_filter)
@@ -79,21 +88,63 @@ class PostService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"{messages.DATA_INTEGRITY_ERROR}. -//- {e}",
             )
+        ranking_tracker.record(post.id, const.TRENDING_POST_WEIGHT)
         return post
 
 
-    async def get_post_by_id(self, post_id: int) -> Post:
+    async def get_post_by_id(self, post_id: int) -> PostResponseSchema:
         """
         Retrieve a post by its unique ID.
 
         :param post_id: The unique identifier of the post.
-        :return: The Post instance if found.
+        :return: The post response if found.
         """
-        post = await self._get_post_or_exception(post_id)
-        return post
+        row = await self.post_repository.get_post_row_by_id(post_id)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=messages.POST_NOT_FOUND,
+            )
+        return PostResponseSchema.from_row(row)
 
 
-    async def get_posts(self, limit: int, offset: int, keyword: str, tag: str):
+    @staticmethod
+    def count_view(post_id: int) -> None:
+        """
+        Count a view of a post. Views are buffered and written in batches.
+
+        :param post_id: The unique identifier of the post.
+        """
+        view_counter.record(post_id)
+
+
+    async def get_post_etag(self, post_id: int) -> str | None:
+        """
+        Compute the ETag of a post from its modification time.
+
+        :param post_id: The unique identifier of the post.
+        :return: The weak ETag, or None if the post does not exist.
+        """
+        updated_at = await self.post_repository.get_post_version(post_id)
+        return make_etag("post", post_id, updated_at) if updated_at else None
+
+
+    async def get_posts_etag(self, limit: int, offset: int, keyword: str, tag: str, sort: PostSortEnum = None) -> str:
+        """
+        Compute the ETag of a page of posts from the IDs and modification times of the page.
+
+        :param limit: The maximum number of posts to return.
+        :param offset: The number of posts to skip.
+        :param keyword: A keyword to filter posts by description.
+        :param tag: A tag to filter posts by associated tags.
+        :param sort: Optional sort order.
+        :return: The weak ETag.
+        """
+        versions = await self.post_repository.get_posts_versions(limit, offset, keyword, tag, sort)
+        return make_etag("posts", versions)
+
+
+    async def get_posts(self, limit: int, offset: int, keyword: str, tag: str, sort: PostSortEnum = None):
         """
         Retrieve a paginated list of posts with optional filtering by keyword and tag.
 
@@ -101,9 +152,23 @@ class PostService:
         :param offset: The number of posts to skip.
         :param keyword: A keyword to filter posts by description.
         :param tag: A tag to filter posts by associated tags.
+        :param sort: Optional sort order.
         :return: A list of posts matching the criteria.
         """
-        return await self.post_repository.get_posts(limit, offset, keyword, tag)
+        rows = await self.post_repository.get_post_rows(limit, offset, keyword, tag, sort)
+        return [PostResponseSchema.from_row(row) for row in rows]
+
+
+    async def get_trending_posts(self, limit: int, offset: int):
+        """
+        Retrieve a paginated list of posts ordered by trending score.
+
+        :param limit: The maximum number of posts to return.
+        :param offset: The number of posts to skip.
+        :return: A list of trending posts.
+        """
+        rows = await self.post_repository.get_trending_post_rows(limit, offset)
+        return [PostResponseSchema.from_row(row) for row in rows]
 
 
     async def update_post_description(self, user, post_id: int, description: str) -> Post:
@@ -132,6 +197,7 @@ class PostService:
         try:
             # delete all rating
             scores_list = await self.score_repository.delete_scores_by_post_id(post_id)
+            await self.score_repository.delete_histogram_by_post_id(post_id)
 
             # delete all comments
             comments_list = await self.comment_repository.delete_comment_by_post_id(post_id)
@@ -139,10 +205,17 @@ class PostService:
             # delete all URLs/urls
             urls_list = await self.image_repository.delete_urls_by_post_id(post_id)
 
+            # delete ranking
+            await self.post_ranking_repository.delete_ranking_by_post_id(post_id)
+
             # delete post
             post = await self._get_post_or_exception(post_id, user)
+            await self.tag_service.record_tag_usage(post.tags, -1, post.created_at)
             await self.post_repository.delete_post(post)
 
+            # release the uploaded image
+            released_image = await self.image_service.release_image(post.original_image_url)
+
             # commit
             await self.post_repository.session.commit()
         except IntegrityError as e:
@@ -151,6 +224,10 @@ class PostService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"{messages.DATA_INTEGRITY_ERROR}. -//- {e}",
             )
+
+        tag_cache.add(post.tags, -1)
+        if released_image:
+            await self.cloudinary_service.delete_image(released_image)
         return post
 
 
@@ -171,16 +248,17 @@ class PostService:
     @staticmethod
     async def check_description(description) -> None:
         """
-        Validate the post description length against defined constraints.
+        Validate the post description length against defined constraints and the word filter.
 
         :param description: The description to validate.
-        :raises HTTPException: If the description is invalid.
+        :raises HTTPException: If the description is invalid or contains a blocked term.
         """
         if const.POST_DESCRIPTION_MIN_LENGTH > len(description) or len(description) > const.POST_DESCRIPTION_MAX_LENGTH or not description:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=messages.POST_DESCRIPTION
             )
+        enforce_word_filter(description, "post description")
 
 
     @staticmethod
@@ -0,0 +1,67 @@
+import math
+from collections import defaultdict
+from datetime import datetime
+
+from conf import const
+from database.db import sessionmanager
+from src.posts.repository import PostRankingRepository
+
+
+class RankingTracker:
+    """
+    Collects post activity in memory and periodically folds it into the ``post_rankings`` table.
+
+    Every worker keeps its own buffer, so a refresh only touches posts that saw new
+    scores, comments or views since the previous one.
+    """
+
+    def __init__(self):
+        self._activity: dict[int, float] = defaultdict(float)
+
+    def record(self, post_id: int, weight: float = 0.0) -> None:
+        """
+        Mark a post for a ranking refresh.
+
+        :param post_id: The unique identifier of the post.
+        :param weight: The trending weight of the event, 0 to refresh only the rating.
+        """
+        self._activity[post_id] += weight
+
+    @staticmethod
+    def decay_exponent(moment: datetime) -> float:
+        """
+        Convert a moment into the log2 weight of one event relative to ``TRENDING_EPOCH``.
+
+        :param moment: The time of the event.
+        :return: The number of half-lives elapsed since the epoch.
+        """
+        elapsed = (moment - const.TRENDING_EPOCH).total_seconds()
+        return elapsed / (const.TRENDING_HALF_LIFE_HOURS * 3600)
+
+    async def flush(self) -> int:
+        """
+        Write the buffered activity to the rankings table.
+
+        :return: The number of refreshed posts.
+        """
+        if not self._activity:
+            return 0
+        pending, self._activity = self._activity, defaultdict(float)
+
+        exponent = self.decay_exponent(datetime.now())
+        activity = [
+            (post_id, exponent + math.log2(weight) if weight > 0 else 0.0)
+            for post_id, weight in pending.items()
+        ]
+        try:
+            async with sessionmanager.session() as session:
+                await PostRankingRepository(session).apply_activity(activity)
+                await session.commit()
+        except Exception:
+            for post_id, weight in pending.items():
+                self._activity[post_id] += weight
+            raise
+        return len(activity)
+
+
+ranking_tracker = RankingTracker()
@@ -1,13 +1,81 @@
-from sqlalchemy import and_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import JSON, Float, Integer, RowMapping, Select, and_, case, column, delete, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import selectinload
 
 from conf import const
-from src.posts.models import Post
+from src.posts.models import Post, PostRanking, PostTag
+from src.posts.schemas import PostSortEnum
+from src.scores.models import Score, ScoreStats
+from src.tags.cache import tag_cache
 from src.tags.models import Tag
 from src.users.models import User
 
 
+def _filter_posts(stmt: Select, keyword: str, tag: str, sort: PostSortEnum = None) -> Select:
+    """
+    Apply the listing filters and sort order shared by the ORM and the projected read paths.
+    """
+    if sort == PostSortEnum.RATING:
+        stmt = stmt.join(PostRanking, PostRanking.post_id == Post.id).order_by(
+            PostRanking.weighted_rating.desc(), PostRanking.post_id.desc()
+        )
+    elif sort == PostSortEnum.NEWEST:
+        stmt = stmt.order_by(Post.created_at.desc(), Post.id.desc())
+    conditions = []
+    if tag:
+        conditions.append(_tag_condition(tag))
+    if keyword:
+        conditions.append(Post.description.ilike(f"%{keyword}%"))
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+    return stmt
+
+
+def _tag_condition(tag: str):
+    """
+    Match posts with a tag containing the given text. The matching tag ids are taken from the tag
+    cache when it knows any, so the query only reads post_tag; otherwise, or if the text holds
+    LIKE wildcards, the tag names are searched in the database.
+    """
+    if tag_cache.loaded and not any(char in tag for char in "%_\\"):
+        tag_ids = tag_cache.match_ids(tag)
+        if tag_ids:
+            return Post.id.in_(select(PostTag.post_id).where(PostTag.tag_id.in_(tag_ids)))
+    return Post.tags.any(Tag.name.ilike(f"%{tag}%"))
+
+
+def _select_post_rows() -> Select:
+    """
+    Select only the columns of PostResponseSchema, with the tags of each post aggregated
+    into a JSON array by a correlated subquery, so it only runs for the rows that are returned.
+    """
+    tags = (
+        select(
+            func.coalesce(
+                func.json_agg(func.json_build_object("id", Tag.id, "name", Tag.name)),
+                func.json_build_array(),
+                type_=JSON,
+            )
+        )
+        .select_from(PostTag)
+        .join(Tag, Tag.id == PostTag.tag_id)
+        .where(PostTag.post_id == Post.id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+    return select(
+        Post.id,
+        Post.image_url,
+        Post.description,
+        Post.user_id,
+        Post.view_count,
+        Post.created_at,
+        Post.updated_at,
+        tags.label("tags"),
+    )
+
+
 class PostRepository:
 
     def __init__(self, db: AsyncSession):
@@ -48,29 +116,117 @@ class PostRepository:
         return post.scalars().unique().one_or_none()
 
 
-    async def get_posts(self, limit: int, offset: int, keyword: str, tag: str) -> list[Post]:
+    async def get_posts(self, limit: int, offset: int, keyword: str, tag: str, sort: PostSortEnum = None) -> list[Post]:
         """
-        Retrieve a list of posts with optional filters and pagination.
+        Retrieve a list of posts with optional filters, sorting and pagination.
 
         :param limit: The maximum number of posts to return.
         :param offset: The number of posts to skip.
         :param keyword: A keyword to filter posts by description.
         :param tag: A tag to filter posts by associated tags.
+        :param sort: Optional sort order, rating sorting only returns ranked posts.
         :return: A list of Post instances matching the criteria.
         """
-        stmt = select(Post)
-        conditions = []
-        if tag:
-            conditions.append(Post.tags.any(Tag.name.ilike(f"%{tag}%")))
-        if keyword:
-            conditions.append(Post.description.ilike(f"%{keyword}%"))
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
+        stmt = _filter_posts(select(Post), keyword, tag, sort)
         stmt = stmt.options(selectinload(Post.tags)).offset(offset).limit(limit)
         posts = await self.session.execute(stmt)
         return list(posts.scalars().all())
 
 
+    async def get_post_rows(self, limit: int, offset: int, keyword: str, tag: str, sort: PostSortEnum = None) -> list[RowMapping]:
+        """
+        Retrieve the response columns of posts with optional filters, sorting and pagination,
+        without building ORM instances.
+
+        :param limit: The maximum number of posts to return.
+        :param offset: The number of posts to skip.
+        :param keyword: A keyword to filter posts by description.
+        :param tag: A tag to filter posts by associated tags.
+        :param sort: Optional sort order, rating sorting only returns ranked posts.
+        :return: A list of row mappings with the post columns and a list of tags.
+        """
+        stmt = _filter_posts(_select_post_rows(), keyword, tag, sort).offset(offset).limit(limit)
+        rows = await self.session.execute(stmt)
+        return list(rows.mappings().all())
+
+
+    async def get_post_row_by_id(self, post_id: int) -> RowMapping | None:
+        """
+        Retrieve the response columns of a post by its ID, without building an ORM instance.
+
+        :param post_id: The unique identifier of the post.
+        :return: A row mapping with the post columns and a list of tags, otherwise None.
+        """
+        stmt = _select_post_rows().where(Post.id == post_id)
+        row = await self.session.execute(stmt)
+        return row.mappings().one_or_none()
+
+
+    async def get_post_version(self, post_id: int):
+        """
+        Retrieve the last modification time of a post without loading the post.
+
+        :param post_id: The unique identifier of the post.
+        :return: The updated_at value, or None if the post does not exist.
+        """
+        stmt = select(Post.updated_at).where(Post.id == post_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+
+    async def get_posts_versions(self, limit: int, offset: int, keyword: str, tag: str, sort: PostSortEnum = None) -> list[tuple]:
+        """
+        Retrieve the IDs and modification times of a page of posts without loading the posts.
+
+        :param limit: The maximum number of posts to return.
+        :param offset: The number of posts to skip.
+        :param keyword: A keyword to filter posts by description.
+        :param tag: A tag to filter posts by associated tags.
+        :param sort: Optional sort order.
+        :return: A list of (id, updated_at) tuples in page order.
+        """
+        stmt = _filter_posts(select(Post.id, Post.updated_at), keyword, tag, sort).offset(offset).limit(limit)
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+
+    async def stream_post_rows_by_user(self, user_id: int, yield_per: int) -> AsyncResult:
+        """
+        Stream all posts of a user as projected rows through a server-side cursor.
+
+        :param user_id: The unique identifier of the user.
+        :param yield_per: The number of rows fetched from the cursor at a time.
+        :return: A streamed result of post rows, including the original image, ordered by ID.
+        """
+        stmt = (
+            _select_post_rows()
+            .add_columns(Post.original_image_url)
+            .where(Post.user_id == user_id)
+            .order_by(Post.id)
+            .execution_options(yield_per=yield_per)
+        )
+        return await self.session.stream(stmt)
+
+
+    async def get_trending_post_rows(self, limit: int, offset: int) -> list[RowMapping]:
+        """
+        Retrieve the response columns of posts ordered by their time-decayed trending score.
+
+        :param limit: The maximum number of posts to return.
+        :param offset: The number of posts to skip.
+        :return: A list of row mappings with the post columns and a list of tags.
+        """
+        stmt = (
+            _select_post_rows()
+            .join(PostRanking, PostRanking.post_id == Post.id)
+            .order_by(PostRanking.trending_score.desc(), PostRanking.post_id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        rows = await self.session.execute(stmt)
+        return list(rows.mappings().all())
+
+
     async def update_post_description(self, post: Post, description: str) -> Post:
         """
         Update the description of a post.
@@ -94,3 +250,163 @@ class PostRepository:
         """
         await self.session.delete(post)
         return post
+
+
+    async def reserve_post_ids(self, count: int) -> list[int]:
+        """
+        Reserve a block of post IDs from the posts sequence.
+
+        :param count: The number of IDs to reserve.
+        :return: A list of reserved post IDs.
+        """
+        sequence = func.pg_get_serial_sequence(Post.__tablename__, "id")
+        stmt = select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+
+    async def copy_posts(self, posts: list[tuple], post_tags: list[tuple]) -> None:
+        """
+        Load posts and their tag links with the COPY protocol inside the current transaction.
+
+        :param posts: Records ordered as (id, original_image_url, image_url, description, user_id, created_at, updated_at).
+        :param post_tags: Records ordered as (post_id, tag_id).
+        """
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        await driver_connection.copy_records_to_table(
+            Post.__tablename__,
+            records=posts,
+            columns=["id", "original_image_url", "image_url", "description", "user_id", "created_at", "updated_at"],
+        )
+        if post_tags:
+            await driver_connection.copy_records_to_table(
+                PostTag.__tablename__,
+                records=post_tags,
+                columns=["post_id", "tag_id"],
+            )
+
+
+    async def add_post_views(self, views: list[tuple[int, int]]) -> None:
+        """
+        Add buffered view counts to posts in one ``UPDATE ... FROM (VALUES ...)`` statement.
+        ``updated_at`` is kept as is, views are not a modification of the post.
+
+        :param views: Pairs of (post_id, number of new views).
+        """
+        increments = values(column("post_id", Integer), column("views", Integer), name="increments").data(views)
+        stmt = (
+            update(Post)
+            .where(Post.id == increments.c.post_id)
+            .values(view_count=Post.view_count + increments.c.views, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+
+class PostRankingRepository:
+
+    def __init__(self, db: AsyncSession):
+        self.session = db
+
+    async def apply_activity(self, activity: list[tuple[int, float]]) -> None:
+        """
+        Refresh rankings of the given posts in one statement.
+
+        The rating columns are recomputed from the post scores. The weighted rating is a Bayesian
+        average that pulls posts with few scores towards the global mean, see ``weighted_rating``.
+        The trending score is a
+        forward-decayed activity sum kept in log2 space relative to ``TRENDING_EPOCH``, so
+        new activity is merged with a log-sum-exp and older rows never have to be rewritten.
+
+        :param activity: Pairs of (post_id, activity), where activity is the log2 decayed weight
+                         of the new events or 0 when only the rating has to be refreshed.
+        """
+        rows = values(column("post_id", Integer), column("activity", Float), name="activity").data(activity)
+        score_count, score_sum = func.count(Score.id), func.coalesce(func.sum(Score.score), 0)
+        stmt = (
+            select(
+                rows.c.post_id,
+                rows.c.activity,
+                func.coalesce(func.avg(Score.score), 0.0),
+                score_count,
+                score_sum,
+                self.weighted_rating(score_count, score_sum),
+            )
+            .select_from(rows)
+            .join(Post, Post.id == rows.c.post_id)
+            .outerjoin(Score, Score.post_id == rows.c.post_id)
+            .group_by(rows.c.post_id, rows.c.activity)
+        )
+        stmt = insert(PostRanking).from_select(
+            ["post_id", "trending_score", "rating_score", "score_count", "score_sum", "weighted_rating"], stmt
+        )
+        current, new = PostRanking.trending_score, stmt.excluded.trending_score
+        highest = func.greatest(current, new)
+        merged = highest + func.ln(1 + func.power(2, func.greatest(func.least(current, new) - highest, -60))) / func.ln(2)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostRanking.post_id],
+            set_={
+                "trending_score": case((new > 0, merged), else_=current),
+                "rating_score": stmt.excluded.rating_score,
+                "score_count": stmt.excluded.score_count,
+                "score_sum": stmt.excluded.score_sum,
+                "weighted_rating": stmt.excluded.weighted_rating,
+                "refreshed_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def delete_ranking_by_post_id(self, post_id: int) -> None:
+        """
+        Delete the ranking of a post.
+
+        :param post_id: The unique identifier of the post.
+        """
+        stmt = delete(PostRanking).filter(PostRanking.post_id == post_id)
+        await self.session.execute(stmt)
+
+    @staticmethod
+    def weighted_rating(score_count, score_sum):
+        """
+        Build the Bayesian average ``(sum + m * C) / (count + m)`` of a post, where ``C`` is the
+        global mean score from the ``score_stats`` counters and ``m`` is ``WEIGHTED_RATING_PRIOR_COUNT``.
+
+        :param score_count: The number of scores of the post.
+        :param score_sum: The sum of the scores of the post.
+        :return: A SQL expression of the weighted rating.
+        """
+        prior_mean = select(
+            func.coalesce(
+                func.sum(ScoreStats.score_sum).cast(Float) / func.nullif(func.sum(ScoreStats.score_count), 0),
+                0.0,
+            )
+        ).scalar_subquery()
+        prior_count = const.WEIGHTED_RATING_PRIOR_COUNT
+        return (score_sum + prior_count * prior_mean) / (score_count + prior_count)
+
+    async def get_weighted_ratings(self) -> list[tuple[int, float]]:
+        """
+        Retrieve the stored weighted rating of every ranked post.
+
+        :return: A list of (post_id, weighted_rating) tuples.
+        """
+        result = await self.session.execute(select(PostRanking.post_id, PostRanking.weighted_rating))
+        return [tuple(row) for row in result.all()]
+
+    async def set_weighted_ratings(self, ratings: list[tuple[int, float]]) -> None:
+        """
+        Overwrite the weighted ratings of posts in one ``UPDATE ... FROM (VALUES ...)`` statement.
+
+        :param ratings: Pairs of (post_id, weighted_rating).
+        """
+        rows = values(column("post_id", Integer), column("weighted_rating", Float), name="ratings").data(ratings)
+        stmt = (
+            update(PostRanking)
+            .where(PostRanking.post_id == rows.c.post_id)
+            .values(weighted_rating=rows.c.weighted_rating)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
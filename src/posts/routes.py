@@ -1,6 +1,8 @@
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import (
+    Request,
+    Response,
     Query,
     status,
     UploadFile,
@@ -14,10 +16,13 @@ from fastapi import (
 from conf import messages, const
 from database.db import get_db
 from src.posts.models import Post
+from src.posts.import_service import PostImportService
 from src.posts.post_service import PostService
-from src.posts.schemas import PostResponseSchema, PostUpdateRequest
-from src.services.auth.auth_service import get_current_user
+from src.posts.schemas import ManifestFormat, PostImportReport, PostResponseSchema, PostSortEnum, PostUpdateRequest
+from src.services.auth.auth_service import RoleChecker, get_current_user
+from src.services.etag import is_not_modified, not_modified
 from src.users.models import User
+from src.users.schemas import RoleEnum
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 router_admin = APIRouter(prefix="/admin/posts", tags=["posts"])
@@ -25,44 +30,87 @@ router_admin = APIRouter(prefix="/admin/posts", tags=["posts"])
 
 @router.get("/", response_model=list[PostResponseSchema])
 async def get_posts(
+        request: Request,
+        response: Response,
         limit: int = Query(10, ge=10, le=100),
         offset: int = Query(0, ge=0),
         tag: str = Query(None, description="Search by tags, partial match, case insensitive"),
         keyword: str = Query(None, description="Search by description, partial match, case insensitive"),
+        sort: PostSortEnum = Query(None, description="Sort by creation date or by rating, rating returns only ranked posts"),
         db: AsyncSession = Depends(get_db),
         user: User = Depends(get_current_user),
 ) -> list[PostResponseSchema]:
     """
-    Retrieve a list of posts with optional filters and pagination.
+    Retrieve a list of posts with optional filters, sorting and pagination.
+    Responds with 304 Not Modified when the If-None-Match header matches the page ETag.
 
     :param limit: Maximum number of posts to retrieve, default is 10.
     :param offset: Number of posts to skip, default is 0.
     :param tag: Filter posts by tags (partial match, case-insensitive).
     :param keyword: Filter posts by description (partial match, case-insensitive).
+    :param sort: Optional sort order.
+    :param request: The incoming request, used for conditional requests.
+    :param response: The outgoing response, used to set the ETag header.
     :param db: Database session dependency.
     :param user: Current authenticated user dependency.
     :return: List of posts matching the criteria.
     """
     post_service = PostService(db)
-    return await post_service.get_posts(limit, offset, keyword, tag)
+    etag = await post_service.get_posts_etag(limit, offset, keyword, tag, sort)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return await post_service.get_posts(limit, offset, keyword, tag, sort)
+
+
+@router.get("/trending", response_model=list[PostResponseSchema])
+async def get_trending_posts(
+        limit: int = Query(10, ge=10, le=100),
+        offset: int = Query(0, ge=0),
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(get_current_user),
+) -> list[PostResponseSchema]:
+    """
+    Retrieve posts ordered by recent activity, older activity decays over time.
+
+    :param limit: Maximum number of posts to retrieve, default is 10.
+    :param offset: Number of posts to skip, default is 0.
+    :param db: Database session dependency.
+    :param user: Current authenticated user dependency.
+    :return: List of trending posts.
+    """
+    post_service = PostService(db)
+    return await post_service.get_trending_posts(limit, offset)
 
 
 @router.get("/{post_id}", response_model=PostResponseSchema)
 async def get_post_by_id(
+        request: Request,
+        response: Response,
         post_id: int = Path(..., ge=1, le=2147483647),
         db: AsyncSession = Depends(get_db),
         user: User = Depends(get_current_user),
-) -> Post:
+) -> PostResponseSchema:
     """
     Retrieve a specific post by its ID.
+    Responds with 304 Not Modified when the If-None-Match header matches the post ETag.
 
     :param post_id: The unique identifier of the post.
+    :param request: The incoming request, used for conditional requests.
+    :param response: The outgoing response, used to set the ETag header.
     :param db: Database session dependency.
     :param user: Current authenticated user dependency.
     :return: The post matching the provided ID.
     """
     post_service = PostService(db)
-    return await post_service.get_post_by_id(post_id)
+    etag = await post_service.get_post_etag(post_id)
+    if etag:
+        post_service.count_view(post_id)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+    post = await post_service.get_post_by_id(post_id)
+    response.headers["ETag"] = etag
+    return post
 
 
 @router.post("/", response_model=PostResponseSchema, status_code=status.HTTP_201_CREATED)
@@ -186,3 +234,26 @@ async def delete_post(
     """
     post_service = PostService(db)
     return await post_service.delete_post(user, post_id)
+
+
+# ------------- ADMIN ROUTES -----------------------------------
+@router_admin.post("/import", response_model=PostImportReport, description="For 'admin' role only")
+async def import_posts(
+        manifest: UploadFile = File(..., description="NDJSON or CSV manifest of already hosted images"),
+        manifest_format: ManifestFormat | None = Form(None, description="Detected from the file extension if omitted"),
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(RoleChecker([RoleEnum.ADMIN])),
+) -> PostImportReport:
+    """
+    Bulk import posts from a manifest of already hosted images.
+
+    :param manifest: The uploaded manifest file.
+    :param manifest_format: Optional manifest format, detected from the file extension if omitted.
+    :param db: Database session dependency.
+    :param user: Current authenticated admin, the default owner of imported posts.
+    :return: The import report with counts, rejected entries and throughput.
+    """
+    import_service = PostImportService(db)
+    manifest_format = import_service.detect_format(manifest.filename, manifest_format)
+    content = (await manifest.read()).decode("utf-8")
+    return await import_service.import_posts(content, manifest_format, user.id)
@@ -1,4 +1,6 @@
 from datetime import datetime
+from enum import Enum
+from typing import Mapping
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -18,7 +20,40 @@ class PostResponseSchema(BaseModel):
     tags: list[TagResponseSchema] | None
     description: str | None
     user_id: int
+    view_count: int = 0
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> "PostResponseSchema":
+        """
+        Build a response from a projected post row without re-validating trusted database values.
+        """
+        tags = [TagResponseSchema.model_construct(**tag) for tag in row["tags"] or ()]
+        return cls.model_construct(**{**row, "tags": tags})
+
+
+class PostSortEnum(Enum):
+    NEWEST = "newest"
+    RATING = "rating"
+
+
+class ManifestFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class PostImportError(BaseModel):
+    line: int
+    detail: str | list[str]
+
+
+class PostImportReport(BaseModel):
+    posts: int
+    tags: int
+    post_tags: int
+    rejected: list[PostImportError]
+    elapsed_seconds: float
+    rows_per_second: float
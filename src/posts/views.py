@@ -0,0 +1,51 @@
+from collections import Counter
+
+from conf import const
+from database.db import sessionmanager
+from src.posts.rankings import ranking_tracker
+from src.posts.repository import PostRepository
+
+
+class ViewCounter:
+    """
+    Counts post views in memory and periodically adds them to ``posts.view_count``.
+
+    Every worker keeps its own buffer, so reads never write to the post row and a flush
+    updates each viewed post once, no matter how many views it collected.
+    """
+
+    def __init__(self):
+        self._views: Counter[int] = Counter()
+
+    def record(self, post_id: int) -> None:
+        """
+        Count one view of a post.
+
+        :param post_id: The unique identifier of the post.
+        """
+        self._views[post_id] += 1
+
+    async def flush(self) -> int:
+        """
+        Write the buffered views to the posts table and pass them on to the rankings.
+
+        :return: The number of updated posts.
+        """
+        if not self._views:
+            return 0
+        pending, self._views = self._views, Counter()
+
+        try:
+            async with sessionmanager.session() as session:
+                await PostRepository(session).add_post_views(sorted(pending.items()))
+                await session.commit()
+        except Exception:
+            self._views.update(pending)
+            raise
+
+        for post_id, views in pending.items():
+            ranking_tracker.record(post_id, views * const.TRENDING_VIEW_WEIGHT)
+        return len(pending)
+
+
+view_counter = ViewCounter()
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+
+import numpy as np
+
+from conf import const
+from database.db import sessionmanager
+from src.posts.repository import PostRankingRepository
+from src.scores.repository import ScoreRepository
+
+
+async def verify_ratings(apply: bool, tolerance: float, batch_size: int) -> None:
+    """
+    Recompute the global score stats and the weighted rating of every ranked post from the
+    whole ``scores`` table with NumPy, report the drift of the incrementally maintained values
+    and optionally write the exact values back.
+
+    All values are read from one repeatable read snapshot. Corrections are written as deltas
+    in a new transaction, so scores submitted while the job runs are not lost.
+
+    :param apply: Write the recomputed values back to the database.
+    :param tolerance: The largest difference of a weighted rating that is not reported.
+    :param batch_size: The number of rows fetched or written at a time.
+    """
+    async with sessionmanager.session() as session:
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        score_repository = ScoreRepository(session)
+        stored_count, stored_sum = await score_repository.get_score_stats()
+
+        chunks = []
+        result = await score_repository.stream_all_scores(batch_size)
+        async for partition in result.partitions():
+            chunks.append(np.array(partition, dtype=np.int64).reshape(-1, 2))
+        scores = np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int64)
+
+        ranked = await PostRankingRepository(session).get_weighted_ratings()
+
+    post_ids, values = scores[:, 0], scores[:, 1]
+    exact_count, exact_sum = len(values), int(values.sum())
+    prior_mean = exact_sum / exact_count if exact_count else 0.0
+    prior_count = const.WEIGHTED_RATING_PRIOR_COUNT
+
+    ranked_ids = np.array([post_id for post_id, _ in ranked], dtype=np.int64)
+    stored_ratings = np.array([rating for _, rating in ranked], dtype=np.float64)
+    size = int(max(post_ids.max(initial=0), ranked_ids.max(initial=0))) + 1
+    counts = np.bincount(post_ids, minlength=size)
+    sums = np.bincount(post_ids, weights=values, minlength=size)
+    expected = (sums[ranked_ids] + prior_count * prior_mean) / (counts[ranked_ids] + prior_count)
+
+    drift = np.abs(expected - stored_ratings)
+    drifted = drift > tolerance
+    print(f"Score stats: stored {stored_count} scores / sum {stored_sum}, exact {exact_count} / {exact_sum}")
+    print(f"Global mean {prior_mean:.4f}, {len(ranked_ids)} ranked posts, "
+          f"{int(drifted.sum())} drifted by more than {tolerance} (max {drift.max(initial=0.0):.6f})")
+
+    if not apply:
+        return
+    async with sessionmanager.session() as session:
+        score_repository = ScoreRepository(session)
+        if (exact_count, exact_sum) != (stored_count, stored_sum):
+            await score_repository.add_score_stats(exact_count - stored_count, exact_sum - stored_sum)
+
+        ranking_repository = PostRankingRepository(session)
+        corrections = list(zip(ranked_ids[drifted].tolist(), expected[drifted].tolist()))
+        for start in range(0, len(corrections), batch_size):
+            await ranking_repository.set_weighted_ratings(corrections[start:start + batch_size])
+        await session.commit()
+    print(f"Corrected the score stats and {len(corrections)} weighted ratings")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scores maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    verify_parser = commands.add_parser(
+        "verify-ratings", help="Recompute all weighted ratings with NumPy and compare them with the stored ones"
+    )
+    verify_parser.add_argument("--apply", action="store_true", help="Write the recomputed values back")
+    verify_parser.add_argument("--tolerance", type=float, default=1e-6)
+    verify_parser.add_argument("--batch-size", type=int, default=10000)
+
+    args = parser.parse_args()
+    if args.command == "verify-ratings":
+        asyncio.run(verify_ratings(args.apply, args.tolerance, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
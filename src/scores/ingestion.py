@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from typing import Mapping
+
+from conf.config import app_config
+from database.db import sessionmanager
+from src.scores.repository import ScoreRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+_STOP = None
+
+
+class ScoreIngestionQueue:
+    """
+    Coalesces score submissions of concurrent requests into batched inserts.
+
+    Requests put validated scores into an in-process queue and wait for their own result.
+    A background flusher takes up to ``batch_size`` submissions, or whatever arrived within
+    ``max_delay`` seconds of the first one, and writes them with one statement and one commit.
+    """
+
+    def __init__(self, batch_size: int, max_delay: float):
+        """
+        :param batch_size: The largest number of submissions written at once.
+        :param max_delay: Seconds a submission may wait for others to join its batch.
+        """
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Start the flusher on the running event loop.
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run(), name="score-ingestion")
+
+    async def stop(self) -> None:
+        """
+        Stop the flusher after writing everything submitted so far.
+        """
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, post_id: int, user_id: int, score: int) -> Mapping:
+        """
+        Queue a score and wait until its batch is written.
+
+        :param post_id: The unique identifier of the post.
+        :param user_id: The ID of the user scoring the post.
+        :param score: The score value.
+        :return: The result row of the score, as returned by ``ScoreRepository.rate_posts``.
+        """
+        future = asyncio.get_running_loop().create_future()
+        submission = (post_id, user_id, score, future)
+        if self._task is None:
+            await self._flush([submission])
+        else:
+            await self._queue.put(submission)
+        return await future
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect()
+            if batch:
+                await self._flush(batch)
+
+    async def _collect(self) -> tuple[list, bool]:
+        """
+        Wait for the first submission, then gather more until the batch is full or the delay is over.
+
+        :return: The batch and whether the queue is stopping.
+        """
+        loop = asyncio.get_running_loop()
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            try:
+                item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    async def _flush(batch: list) -> None:
+        """
+        Write a batch and resolve the future of every submission. Repeated submissions of the
+        same user and post within a batch are answered as already scored.
+        """
+        entries = {}
+        for post_id, user_id, score, _ in batch:
+            entries.setdefault((post_id, user_id), score)
+
+        try:
+            async with sessionmanager.session() as session:
+                rows = await ScoreRepository(session).rate_posts(
+                    [(post_id, user_id, score) for (post_id, user_id), score in entries.items()]
+                )
+        except Exception as e:
+            logger.error(f"Score ingestion batch of {len(batch)} failed: {e}")
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        answered = set()
+        for post_id, user_id, _, future in batch:
+            key = (post_id, user_id)
+            row = rows[key]
+            if key in answered:
+                row = {**row, "id": None, "post_id": None, "user_id": None, "score": None}
+            answered.add(key)
+            if not future.done():
+                future.set_result(row)
+
+
+score_ingestion_queue = ScoreIngestionQueue(
+    app_config.SCORE_INGESTION_BATCH_SIZE,
+    app_config.SCORE_INGESTION_MAX_DELAY_MS / 1000,
+)
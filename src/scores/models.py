@@ -1,10 +1,15 @@
-from sqlalchemy import Integer, ForeignKey
+from sqlalchemy import BigInteger, DateTime, Index, Integer, ForeignKey, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 from conf.config import Base
 
 
 class Score(Base):
     __tablename__ = "scores"
+    __table_args__ = (
+        UniqueConstraint("post_id", "user_id", name="uq_scores_post_id_user_id"),
+        Index("ix_scores_post_id_id", "post_id", "id"),
+        Index("ix_scores_user_id_id", "user_id", "id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     post_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("posts.id"), nullable=False
@@ -13,3 +18,31 @@ class Score(Base):
         Integer, ForeignKey("users.id"), nullable=False
     )
     score: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(
+        "created_at", DateTime, nullable=False, default=func.now(), server_default=func.now()
+    )
+
+
+class PostScoreHistogram(Base):
+    __tablename__ = "post_score_histogram"
+    post_id: Mapped[int] = mapped_column(Integer, ForeignKey("posts.id"), primary_key=True)
+    count_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    count_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    count_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    count_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    count_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    @staticmethod
+    def counter(score: int) -> str:
+        """
+        Name of the column that counts the given score value.
+        """
+        return f"count_{score}"
+
+
+class ScoreStats(Base):
+    __tablename__ = "score_stats"
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+    score_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    score_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
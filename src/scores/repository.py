@@ -1,8 +1,14 @@
+import random
+from collections import defaultdict
+from datetime import datetime
 from typing import Optional
-from sqlalchemy import select, func, delete
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, RowMapping, and_, column, literal, select, func, delete, true, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 
-from src.scores.models import Score
+from conf import const
+from src.posts.models import Post
+from src.scores.models import PostScoreHistogram, Score, ScoreStats
 from src.scores.schemas import ScoreCreate, ScoreUpdate
 
 class ScoreRepository:
@@ -32,34 +38,40 @@ class ScoreRepository:
 
 
     async def get_scores_by_user_id(
-        self, user_id: int, limit: int = 10, offset: int = 0
+        self, user_id: int, limit: int = 10, offset: int = 0, after_id: int = None
     ):
         """
-        Retrieve scores associated with a specific user ID, with optional pagination.
+        Retrieve scores associated with a specific user ID, ordered by ID, with optional pagination.
+        Served by the (user_id, id) index.
 
         :param user_id: The unique identifier of the user.
         :param limit: The maximum number of scores to return.
-        :param offset: The number of scores to skip.
+        :param offset: The number of scores to skip, ignored when ``after_id`` is given.
+        :param after_id: Return only scores after this ID (keyset pagination).
         :return: A list of Score instances.
         """
-        stmt = select(Score).where(Score.user_id == user_id).offset(offset).limit(limit)
+        stmt = select(Score).where(Score.user_id == user_id).order_by(Score.id).limit(limit)
+        stmt = stmt.where(Score.id > after_id) if after_id is not None else stmt.offset(offset)
         result = await self.session.execute(stmt)
         scores = result.scalars().all()
         return scores
 
 
     async def get_scores_by_post_id(
-        self, post_id: int, limit: int = 10, offset: int = 0
+        self, post_id: int, limit: int = 10, offset: int = 0, after_id: int = None
     ):
         """
-        Retrieve scores associated with a specific post ID, with optional pagination.
+        Retrieve scores associated with a specific post ID, ordered by ID, with optional pagination.
+        Served by the (post_id, id) index.
 
         :param post_id: The unique identifier of the post.
         :param limit: The maximum number of scores to return.
-        :param offset: The number of scores to skip.
+        :param offset: The number of scores to skip, ignored when ``after_id`` is given.
+        :param after_id: Return only scores after this ID (keyset pagination).
         :return: A list of Score instances.
         """
-        stmt = select(Score).where(Score.post_id == post_id)
+        stmt = select(Score).where(Score.post_id == post_id).order_by(Score.id).limit(limit)
+        stmt = stmt.where(Score.id > after_id) if after_id is not None else stmt.offset(offset)
         result = await self.session.execute(stmt)
         scores = result.scalars().all()
         return scores
@@ -80,6 +92,142 @@ class ScoreRepository:
         return score
 
 
+    async def rate_post(self, post_id: int, user_id: int, score: int) -> RowMapping | None:
+        """
+        Score a post in one statement. The score is inserted only if the post exists, belongs
+        to another user and was not scored by this user yet; the unique (post_id, user_id)
+        constraint makes concurrent attempts safe. The rating histogram of the post and
+        the global score stats are updated by the same statement.
+
+        :param post_id: The unique identifier of the post.
+        :param user_id: The ID of the user scoring the post.
+        :param score: The score value.
+        :return: None if the post does not exist, otherwise a row with the post ``owner_id``
+                 and the ``id``, ``post_id``, ``user_id`` and ``score`` of the inserted score,
+                 which are None if nothing was inserted.
+        """
+        target = select(Post.id, Post.user_id).where(Post.id == post_id).cte("target")
+        inserted = (
+            insert(Score)
+            .from_select(
+                ["post_id", "user_id", "score"],
+                select(target.c.id, literal(user_id, Integer), literal(score, Integer))
+                .where(target.c.user_id != user_id),
+            )
+            .on_conflict_do_nothing(index_elements=[Score.post_id, Score.user_id])
+            .returning(Score.id, Score.post_id, Score.user_id, Score.score)
+            .cte("inserted")
+        )
+        counter = PostScoreHistogram.counter(score)
+        histogram = (
+            insert(PostScoreHistogram)
+            .from_select(["post_id", counter], select(inserted.c.post_id, literal(1, Integer)))
+            .on_conflict_do_update(
+                index_elements=[PostScoreHistogram.post_id],
+                set_={counter: getattr(PostScoreHistogram, counter) + 1},
+            )
+            .cte("histogram")
+        )
+        stats = (
+            self._score_stats_update(1, score)
+            .where(select(inserted.c.id).exists())
+            .cte("stats")
+        )
+        stmt = (
+            select(
+                target.c.user_id.label("owner_id"),
+                inserted.c.id,
+                inserted.c.post_id,
+                inserted.c.user_id,
+                inserted.c.score,
+            )
+            .select_from(target)
+            .outerjoin(inserted, true())
+            .add_cte(histogram, stats)
+        )
+        result = await self.session.execute(stmt)
+        row = result.mappings().one_or_none()
+        await self.session.commit()
+        return row
+
+
+    async def rate_posts(self, entries: list[tuple[int, int, int]]) -> dict[tuple[int, int], RowMapping]:
+        """
+        Score many posts in one statement, the batch counterpart of ``rate_post``. Histograms and
+        the global score stats are updated by the same statement.
+
+        :param entries: Triples of (post_id, user_id, score), unique by (post_id, user_id).
+        :return: A row for every (post_id, user_id) pair with the post ``owner_id``, which is None
+                 if the post does not exist, and the ``id``, ``post_id``, ``user_id`` and ``score``
+                 of the inserted score, which are None if nothing was inserted.
+        """
+        batch = values(
+            column("post_id", Integer), column("user_id", Integer), column("score", Integer), name="batch"
+        ).data(entries)
+        targets = (
+            select(batch.c.post_id, batch.c.user_id, batch.c.score, Post.user_id.label("owner_id"))
+            .select_from(batch)
+            .outerjoin(Post, Post.id == batch.c.post_id)
+            .cte("targets")
+        )
+        inserted = (
+            insert(Score)
+            .from_select(
+                ["post_id", "user_id", "score"],
+                select(targets.c.post_id, targets.c.user_id, targets.c.score)
+                .where(targets.c.owner_id != targets.c.user_id),
+            )
+            .on_conflict_do_nothing(index_elements=[Score.post_id, Score.user_id])
+            .returning(Score.id, Score.post_id, Score.user_id, Score.score)
+            .cte("inserted")
+        )
+
+        counters = self.histogram_counters()
+        histogram = insert(PostScoreHistogram).from_select(
+            ["post_id", *counters],
+            select(
+                inserted.c.post_id,
+                *(
+                    func.count().filter(inserted.c.score == score).label(counter)
+                    for score, counter in enumerate(counters, start=const.SCORE_MIN_VALUE)
+                ),
+            ).group_by(inserted.c.post_id),
+        )
+        histogram = histogram.on_conflict_do_update(
+            index_elements=[PostScoreHistogram.post_id],
+            set_={
+                counter: getattr(PostScoreHistogram, counter) + getattr(histogram.excluded, counter)
+                for counter in counters
+            },
+        ).cte("histogram")
+        stats = self._score_stats_update(
+            select(func.count()).select_from(inserted).scalar_subquery(),
+            select(func.coalesce(func.sum(inserted.c.score), 0)).scalar_subquery(),
+        ).cte("stats")
+
+        stmt = (
+            select(
+                targets.c.post_id.label("target_post_id"),
+                targets.c.user_id.label("target_user_id"),
+                targets.c.owner_id,
+                inserted.c.id,
+                inserted.c.post_id,
+                inserted.c.user_id,
+                inserted.c.score,
+            )
+            .select_from(targets)
+            .outerjoin(
+                inserted,
+                and_(inserted.c.post_id == targets.c.post_id, inserted.c.user_id == targets.c.user_id),
+            )
+            .add_cte(histogram, stats)
+        )
+        result = await self.session.execute(stmt)
+        rows = {(row["target_post_id"], row["target_user_id"]): row for row in result.mappings().all()}
+        await self.session.commit()
+        return rows
+
+
     async def update_score(self, score_id: int, score_data: ScoreUpdate):
         """
         Update an existing score record.
@@ -88,11 +236,16 @@ class ScoreRepository:
         :param score_data: The updated score data.
         :return: The updated Score instance if found, otherwise None.
         """
-        stmt = select(Score).where(Score.id == score_id)
+        stmt = select(Score).where(Score.id == score_id).with_for_update()
         result = await self.session.execute(stmt)
         score = result.scalar_one_or_none()
 
         if score:
+            if score.score != score_data.score:
+                await self.apply_score_changes([
+                    (score.post_id, score.score, -1),
+                    (score.post_id, score_data.score, 1),
+                ])
             score.score = score_data.score
             await self.session.commit()
             await self.session.refresh(score)
@@ -100,6 +253,7 @@ class ScoreRepository:
 
 
     async def delete_score(self, score: Score)-> Optional[Score]:
+        await self.apply_score_changes([(score.post_id, score.score, -1)])
         await self.session.delete(score)
         await self.session.commit()
         return score
@@ -143,3 +297,190 @@ class ScoreRepository:
         stmt = delete(Score).filter(Score.post_id == post_id)
         await self.session.execute(stmt)
 
+    async def purge_scores_by_user(
+        self, user_id: int, batch_size: int, created_after: datetime = None, created_before: datetime = None
+    ) -> list[tuple[int, int]]:
+        """
+        Delete one batch of the scores given by a user with one set-based statement and take them
+        out of the rating histograms and the global score stats, without committing.
+
+        :param user_id: The unique identifier of the user.
+        :param batch_size: The largest number of scores deleted.
+        :param created_after: Only scores given at or after this time.
+        :param created_before: Only scores given before this time.
+        :return: The (post_id, score) pairs of the deleted scores, empty when none are left.
+        """
+        batch = select(Score.id).where(Score.user_id == user_id)
+        if created_after is not None:
+            batch = batch.where(Score.created_at >= created_after)
+        if created_before is not None:
+            batch = batch.where(Score.created_at < created_before)
+        batch = batch.order_by(Score.id).limit(batch_size).scalar_subquery()
+
+        stmt = (
+            delete(Score)
+            .where(Score.id.in_(batch))
+            .returning(Score.post_id, Score.score)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = [tuple(row) for row in (await self.session.execute(stmt)).all()]
+        await self.apply_score_changes([(post_id, score, -1) for post_id, score in deleted])
+        return deleted
+
+    async def stream_scores_by_user(self, user_id: int, yield_per: int) -> AsyncResult:
+        """
+        Stream all scores given by a user through a server-side cursor.
+
+        :param user_id: The unique identifier of the user.
+        :param yield_per: The number of rows fetched from the cursor at a time.
+        :return: A streamed result of score rows ordered by ID.
+        """
+        stmt = (
+            select(Score.id, Score.post_id, Score.score)
+            .where(Score.user_id == user_id)
+            .order_by(Score.id)
+            .execution_options(yield_per=yield_per)
+        )
+        return await self.session.stream(stmt)
+
+    async def apply_score_changes(self, changes: list[tuple[int, int, int]]) -> None:
+        """
+        Apply score changes to the rating histograms and the global score stats, without committing.
+
+        :param changes: Triples of (post_id, score value, delta), e.g. (1, 5, -1) for a removed five-star score.
+        """
+        await self.adjust_histograms(changes)
+        count_delta = sum(delta for _, _, delta in changes)
+        sum_delta = sum(score * delta for _, score, delta in changes)
+        if count_delta or sum_delta:
+            await self.add_score_stats(count_delta, sum_delta)
+
+    @staticmethod
+    def _score_stats_update(count_delta, sum_delta):
+        """
+        Build an update of a random shard of the global score stats, so concurrent writers
+        rarely wait for the same row. The deltas are numbers or SQL expressions.
+        """
+        return (
+            update(ScoreStats)
+            .where(ScoreStats.shard == random.randrange(const.SCORE_STATS_SHARDS))
+            .values(
+                score_count=ScoreStats.score_count + count_delta,
+                score_sum=ScoreStats.score_sum + sum_delta,
+            )
+        )
+
+    async def get_score_stats(self) -> tuple[int, int]:
+        """
+        Retrieve the global number of scores and the sum of all scores.
+
+        :return: A tuple of (score count, score sum).
+        """
+        stmt = select(
+            func.coalesce(func.sum(ScoreStats.score_count), 0),
+            func.coalesce(func.sum(ScoreStats.score_sum), 0),
+        )
+        result = await self.session.execute(stmt)
+        score_count, score_sum = result.one()
+        return int(score_count), int(score_sum)
+
+    async def add_score_stats(self, count_delta: int, sum_delta: int) -> None:
+        """
+        Correct the global score stats by the given amounts, without committing.
+
+        :param count_delta: The change of the score count.
+        :param sum_delta: The change of the score sum.
+        """
+        await self.session.execute(self._score_stats_update(count_delta, sum_delta))
+
+    async def stream_all_scores(self, yield_per: int) -> AsyncResult:
+        """
+        Stream the post ID and value of every score through a server-side cursor.
+
+        :param yield_per: The number of rows fetched from the cursor at a time.
+        :return: A streamed result of (post_id, score) rows.
+        """
+        stmt = select(Score.post_id, Score.score).execution_options(yield_per=yield_per)
+        return await self.session.stream(stmt)
+
+    async def adjust_histograms(self, changes: list[tuple[int, int, int]]) -> None:
+        """
+        Apply score changes to the rating histograms in one upsert, without committing.
+
+        :param changes: Triples of (post_id, score value, delta), e.g. (1, 5, -1) for a removed five-star score.
+        """
+        deltas = defaultdict(lambda: dict.fromkeys(self.histogram_counters(), 0))
+        for post_id, score, delta in changes:
+            deltas[post_id][PostScoreHistogram.counter(score)] += delta
+        if not deltas:
+            return
+
+        stmt = insert(PostScoreHistogram).values(
+            [{"post_id": post_id, **counts} for post_id, counts in sorted(deltas.items())]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostScoreHistogram.post_id],
+            set_={
+                counter: getattr(PostScoreHistogram, counter) + getattr(stmt.excluded, counter)
+                for counter in self.histogram_counters()
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def get_histogram_by_post_id(self, post_id: int) -> RowMapping | None:
+        """
+        Retrieve the rating histogram of a post by primary key.
+
+        :param post_id: The unique identifier of the post.
+        :return: None if the post does not exist, otherwise a row with the counters,
+                 which are None if the post has never been scored.
+        """
+        stmt = (
+            select(Post.id.label("post_id"), *(getattr(PostScoreHistogram, c) for c in self.histogram_counters()))
+            .outerjoin(PostScoreHistogram, PostScoreHistogram.post_id == Post.id)
+            .where(Post.id == post_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.mappings().one_or_none()
+
+    async def get_histograms_by_post_ids(self, post_ids: list[int]) -> list[RowMapping]:
+        """
+        Retrieve the rating histograms of several posts in one query.
+
+        :param post_ids: The unique identifiers of the posts.
+        :return: Rows with the post_id and the counters, posts that were never scored are missing.
+        """
+        stmt = select(
+            PostScoreHistogram.post_id,
+            *(getattr(PostScoreHistogram, c) for c in self.histogram_counters()),
+        ).where(PostScoreHistogram.post_id.in_(post_ids))
+        result = await self.session.execute(stmt)
+        return list(result.mappings().all())
+
+    async def delete_histogram_by_post_id(self, post_id: int) -> None:
+        """
+        Delete the rating histogram of a post and remove its scores from the global score stats.
+
+        :param post_id: The unique identifier of the post.
+        """
+        counters = self.histogram_counters()
+        stmt = (
+            delete(PostScoreHistogram)
+            .filter(PostScoreHistogram.post_id == post_id)
+            .returning(*(getattr(PostScoreHistogram, c) for c in counters))
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        if row:
+            histogram = dict(zip(range(const.SCORE_MIN_VALUE, const.SCORE_MAX_VALUE + 1), row))
+            count_delta = -sum(histogram.values())
+            sum_delta = -sum(score * count for score, count in histogram.items())
+            if count_delta:
+                await self.add_score_stats(count_delta, sum_delta)
+
+    @staticmethod
+    def histogram_counters() -> list[str]:
+        """
+        Names of the histogram columns, one per score value.
+        """
+        return [PostScoreHistogram.counter(score) for score in range(const.SCORE_MIN_VALUE, const.SCORE_MAX_VALUE + 1)]
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.services.auth.auth_service import get_current_user
+from conf import const
+from src.services.pagination import NEXT_CURSOR_HEADER, next_cursor
 from src.users.schemas import UserResponse, RoleEnum
-from src.scores.schemas import ScoreCreate, ScoreUpdate, Score, AverageScore
+from src.scores.schemas import (
+    ScoreCreate, ScoreUpdate, Score, AverageScore, ScoreHistogram, AverageScoresRequest, PostAverageScore
+)
 from src.services.auth import auth_service
 from src.services.auth.auth_service import RoleChecker
 from src.users.models import User
@@ -16,46 +20,68 @@ router = APIRouter(prefix="/scores", tags=["scores"])
 
 @router.get("/user/{user_id}", response_model=list[Score])
 async def read_scores_by_user(
+    response: Response,
     user_id: int,
-    limit: int = 10,
-    offset: int = 0,
+    limit: int = Query(10, ge=1, le=const.SCORE_PAGE_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    cursor: str = Query(None, description="Cursor of the next page from the X-Next-Cursor header"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user)
 ):
     """
     Retrieve a list of scores created by a specific user, with optional pagination.
 
+    Pages are ordered by score ID. Pass the X-Next-Cursor header of a page as ``cursor``
+    to get the next one, which stays fast on deep pages unlike ``offset``.
+
+    :param response: The outgoing response, used to set the X-Next-Cursor header.
     :param user_id: The unique identifier of the user.
     :param limit: The maximum number of scores to retrieve.
-    :param offset: The number of scores to skip.
+    :param offset: The number of scores to skip, ignored when a cursor is given.
+    :param cursor: The cursor of the page.
     :param db: Database session dependency.
     :param current_user: The currently authenticated user.
     :return: A list of scores.
     """
     score_service = ScoreService(db)
-    return await score_service.fetch_scores_by_user(user_id, limit, offset)
+    scores = await score_service.fetch_scores_by_user(user_id, limit, offset, cursor)
+    cursor = next_cursor(scores, limit, "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return scores
 
 
 @router.get("/post/{post_id}", response_model=list[Score])
 async def read_scores_by_post(
+    response: Response,
     post_id: int,
-    limit: int = 10,
-    offset: int = 0,
+    limit: int = Query(10, ge=1, le=const.SCORE_PAGE_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    cursor: str = Query(None, description="Cursor of the next page from the X-Next-Cursor header"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
     """
     Retrieve a list of scores associated with a specific post, with optional pagination.
 
+    Pages are ordered by score ID. Pass the X-Next-Cursor header of a page as ``cursor``
+    to get the next one, which stays fast on deep pages unlike ``offset``.
+
+    :param response: The outgoing response, used to set the X-Next-Cursor header.
     :param post_id: The unique identifier of the post.
     :param limit: The maximum number of scores to retrieve.
-    :param offset: The number of scores to skip.
+    :param offset: The number of scores to skip, ignored when a cursor is given.
+    :param cursor: The cursor of the page.
     :param db: Database session dependency.
     :param current_user: The currently authenticated user.
     :return: A list of scores.
     """
     score_service = ScoreService(db)
-    return await score_service.fetch_scores_by_post(post_id, limit, offset)
+    scores = await score_service.fetch_scores_by_post(post_id, limit, offset, cursor)
+    cursor = next_cursor(scores, limit, "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return scores
 
 
 @router.post("/", response_model=Score, status_code=status.HTTP_201_CREATED)
@@ -135,3 +161,41 @@ async def get_post_average_score(
     score_service = ScoreService(db)
     average_score = await score_service.calculate_average_score(post_id)
     return AverageScore(post_id=post_id, average_score=average_score)
+
+
+@router.get("/post/{post_id}/histogram", response_model=ScoreHistogram)
+async def get_post_score_histogram(
+    post_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    Retrieve the number of scores per score value (1-5) for a specific post.
+
+    :param post_id: The unique identifier of the post.
+    :param db: Database session dependency.
+    :param current_user: The currently authenticated user.
+    :return: The score histogram of the post.
+    """
+    score_service = ScoreService(db)
+    return await score_service.get_score_histogram(post_id)
+
+
+@router.post("/averages", response_model=list[PostAverageScore])
+async def get_posts_average_scores(
+    body: AverageScoresRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    """
+    Retrieve the average scores and score counts of several posts in one request.
+    Posts without scores are returned with no average instead of an error.
+
+    :param body: The IDs of the posts.
+    :param db: Database session dependency.
+    :param current_user: The currently authenticated user.
+    :return: The average score of every requested post, in request order.
+    """
+    score_service = ScoreService(db)
+    return await score_service.calculate_average_scores(body.post_ids)
+
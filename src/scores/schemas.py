@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict
 
+from conf import const
+
 
 class ScoreBase(BaseModel):
     post_id: int = Field(..., description="ID of the post associate with the score")
@@ -37,3 +39,23 @@ class AverageScore(BaseModel):
         ..., description="ID of the post for which the average score is calculated."
     )
     average_score: float = Field(..., description="The average score for the post")
+
+
+class ScoreHistogram(BaseModel):
+    post_id: int = Field(..., description="ID of the post the histogram belongs to.")
+    histogram: dict[int, int] = Field(..., description="Number of scores per score value")
+    total: int = Field(..., description="Total number of scores")
+    average_score: float | None = Field(None, description="The average score, None if the post has no scores")
+
+
+class AverageScoresRequest(BaseModel):
+    post_ids: list[int] = Field(
+        ..., min_length=1, max_length=const.SCORE_AVERAGES_BATCH_LIMIT, description="IDs of the posts"
+    )
+
+
+class PostAverageScore(BaseModel):
+    post_id: int = Field(..., description="ID of the post for which the average score is calculated.")
+    average_score: float | None = Field(None, description="The average score, None if the post has no scores")
+    score_count: int = Field(..., description="Number of scores of the post")
+
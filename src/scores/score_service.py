@@ -1,9 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from conf import messages
+from conf import messages, const
+from conf.config import app_config
+from src.posts.rankings import ranking_tracker
+from src.scores.ingestion import score_ingestion_queue
+from src.scores.models import Score
 from src.scores.repository import ScoreRepository
-from src.scores.schemas import ScoreCreate, ScoreUpdate
+from src.services.events import event_broker
+from src.services.pagination import decode_id_cursor
+from src.scores.schemas import PostAverageScore, ScoreCreate, ScoreHistogram, ScoreUpdate
 from src.posts.repository import PostRepository
 from src.users.models import User
 
@@ -36,30 +42,36 @@ class ScoreService:
         return score
 
     async def fetch_scores_by_user(
-        self, user_id: int, limit: int = 10, offset: int = 0
+        self, user_id: int, limit: int = 10, offset: int = 0, cursor: str = None
     ):
         """
         Retrieve a list of scores for a specific user.
 
         :param user_id: int - The unique identifier of the user.
         :param limit: int - The maximum number of scores to retrieve (default: 10).
-        :param offset: int - The number of scores to skip (default: 0).
+        :param offset: int - The number of scores to skip (default: 0), ignored when a cursor is given.
+        :param cursor: str - The cursor of the previous page.
         :return: A list of Score instances.
+        :raises HTTPException: If the cursor is malformed (400).
         """
-        return await self.score_repository.get_scores_by_user_id(user_id, limit, offset)
+        after_id = decode_id_cursor(cursor) if cursor else None
+        return await self.score_repository.get_scores_by_user_id(user_id, limit, offset, after_id)
 
     async def fetch_scores_by_post(
-        self, post_id: int, limit: int = 10, offset: int = 0
+        self, post_id: int, limit: int = 10, offset: int = 0, cursor: str = None
     ):
         """
         Retrieve a list of scores associated with a specific post.
 
         :param post_id: int - The unique identifier of the post.
         :param limit: int - The maximum number of scores to retrieve (default: 10).
-        :param offset: int - The number of scores to skip (default: 0).
+        :param offset: int - The number of scores to skip (default: 0), ignored when a cursor is given.
+        :param cursor: str - The cursor of the previous page.
         :return: A list of Score instances.
+        :raises HTTPException: If the cursor is malformed (400).
         """
-        return await self.score_repository.get_scores_by_post_id(post_id, limit, offset)
+        after_id = decode_id_cursor(cursor) if cursor else None
+        return await self.score_repository.get_scores_by_post_id(post_id, limit, offset, after_id)
 
     async def create_new_score(self, score_data: ScoreCreate, user: User):
         """
@@ -68,23 +80,33 @@ class ScoreService:
         :param score_data: ScoreCreate - The data required to create a new score.
         :param user: User - The user creating the score.
         :return: The created Score instance.
-        :raises HTTPException: If the user has already scored the post (400),
+        :raises HTTPException: If the post is not found (404),
+                               if the user has already scored the post (400),
                                or if the user is trying to score their own post (403).
         """
-
-        if await self.score_repository.score_exists(user.id, score_data.post_id):
+        if app_config.SCORE_INGESTION_ENABLED:
+            row = await score_ingestion_queue.submit(score_data.post_id, user.id, score_data.score)
+        else:
+            row = await self.score_repository.rate_post(score_data.post_id, user.id, score_data.score)
+        if row is None or row["owner_id"] is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=messages.SCORE_WARNING_ALREADY_SCORED
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=messages.POST_NOT_FOUND
             )
-        
-        post = await self.post_repository.get_post_by_id(score_data.post_id)
-        if post.user_id == user.id:
+        if row["owner_id"] == user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=messages.SCORE_WARNING_SELF_SCORE
             )
-        return await self.score_repository.create_score(score_data, user.id)
+        if row["id"] is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=messages.SCORE_WARNING_ALREADY_SCORED
+            )
+        score = Score(id=row["id"], post_id=row["post_id"], user_id=row["user_id"], score=row["score"])
+        ranking_tracker.record(score.post_id, const.TRENDING_SCORE_WEIGHT)
+        await self._publish("score.created", score)
+        return score
     
     async def update_existing_score(self, score_id: int, score_data: ScoreUpdate):
         """
@@ -95,7 +117,11 @@ class ScoreService:
         :return: The updated Score instance.
         :raises HTTPException: If the score is not found (404).
         """
-        return await self.score_repository.update_score(score_id, score_data)
+        score = await self.score_repository.update_score(score_id, score_data)
+        if score:
+            ranking_tracker.record(score.post_id)
+            await self._publish("score.updated", score)
+        return score
 
     async def delete_existing_score(self, score_id: int):
         """
@@ -106,7 +132,21 @@ class ScoreService:
         :raises HTTPException: If the score is not found (404).
         """
         score = await self.fetch_score_by_id(score_id)
-        return await self.score_repository.delete_score(score)
+        score = await self.score_repository.delete_score(score)
+        ranking_tracker.record(score.post_id)
+        await self._publish("score.deleted", score)
+        return score
+
+    @staticmethod
+    async def _publish(event: str, score: Score) -> None:
+        """
+        Send a score change to the live streams of the scored post.
+        """
+        await event_broker.publish(
+            score.post_id,
+            event,
+            {"id": score.id, "post_id": score.post_id, "user_id": score.user_id, "score": score.score},
+        )
 
     async def calculate_average_score(self, post_id: int):
         """
@@ -123,3 +163,63 @@ class ScoreService:
                 detail=messages.SCORE_WARNING_NO_SCORES,
             )
         return average_score
+
+    async def get_score_histogram(self, post_id: int) -> ScoreHistogram:
+        """
+        Retrieve the 1-5 rating breakdown of a post from its precomputed histogram.
+
+        :param post_id: int - The unique identifier of the post.
+        :return: The score histogram of the post.
+        :raises HTTPException: If the post is not found (404).
+        """
+        row = await self.score_repository.get_histogram_by_post_id(post_id)
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=messages.POST_NOT_FOUND,
+            )
+        histogram = self._histogram_from_row(row)
+        total, average_score = self._summarize_histogram(histogram)
+        return ScoreHistogram(post_id=post_id, histogram=histogram, total=total, average_score=average_score)
+
+    async def calculate_average_scores(self, post_ids: list[int]) -> list[PostAverageScore]:
+        """
+        Calculate the average scores of several posts from their precomputed histograms.
+
+        :param post_ids: list[int] - The unique identifiers of the posts.
+        :return: The average score and the number of scores of every requested post, in request order.
+                 Posts without scores, including unknown posts, have no average and a count of 0.
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        rows = await self.score_repository.get_histograms_by_post_ids(post_ids)
+        summaries = {row["post_id"]: self._summarize_histogram(self._histogram_from_row(row)) for row in rows}
+
+        averages = []
+        for post_id in post_ids:
+            score_count, average_score = summaries.get(post_id, (0, None))
+            averages.append(PostAverageScore(post_id=post_id, average_score=average_score, score_count=score_count))
+        return averages
+
+    def _histogram_from_row(self, row) -> dict[int, int]:
+        """
+        Map the counters of a histogram row to score values.
+
+        :param row: A row with the histogram counters, which may be None.
+        :return: The number of scores per score value.
+        """
+        return {
+            score: row[counter] or 0
+            for score, counter in enumerate(self.score_repository.histogram_counters(), start=const.SCORE_MIN_VALUE)
+        }
+
+    @staticmethod
+    def _summarize_histogram(histogram: dict[int, int]) -> tuple[int, float | None]:
+        """
+        Compute the number of scores and the average score from a histogram.
+
+        :param histogram: The number of scores per score value.
+        :return: The number of scores and the average score, None if there are no scores.
+        """
+        total = sum(histogram.values())
+        average_score = sum(score * count for score, count in histogram.items()) / total if total else None
+        return total, average_score
@@ -1,3 +1,5 @@
+import hashlib
+import logging
 import uuid
 import cloudinary
 from cloudinary.utils import cloudinary_url
@@ -15,6 +17,8 @@ cloudinary.config(
     secure=True,
 )
 
+logger = logging.getLogger("uvicorn.error")
+
 
 class CloudinaryService:
     """
@@ -40,39 +44,84 @@ class CloudinaryService:
         return edited_image_url
 
     @staticmethod
-    async def get_image_urls(image_file: UploadFile, image_filter: str = None) -> dict:
+    async def hash_image(image_file: UploadFile) -> str:
         """
-        Upload an image to Cloudinary, optionally apply a filter, and return URLs for the original and edited images.
+        Compute the SHA-256 digest of an uploaded image, reading the spooled file in chunks.
 
-        :param image_file: The image file to upload.
-        :param image_filter: (Optional) The filter to apply to the image.
-        :return: A dictionary containing URLs for the original and (optionally) the edited image.
+        :param image_file: The image file to hash.
+        :return: The hex digest of the image content.
+        """
+        digest = hashlib.sha256()
+        await image_file.seek(0)
+        while chunk := await image_file.read(const.IMAGE_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        await image_file.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    async def upload_image(image_file: UploadFile, public_id: str) -> dict:
         """
-        links_dict = {}
-        unique_filename = uuid.uuid4().hex
+        Upload an image to Cloudinary under the given public ID.
 
+        :param image_file: The image file to upload.
+        :param public_id: The public ID of the image inside the configured folder.
+        :return: The upload result with the full ``public_id`` and the ``secure_url``.
+        """
         try:
-            original_image_url = cloudinary.uploader.upload(
+            return cloudinary.uploader.upload(
                 image_file.file,
-                public_id=unique_filename,
+                public_id=public_id,
                 overwrite=True,
                 folder=app_config.CLOUDINARY_FOLDER,
             )
-            links_dict[const.ORIGINAL_IMAGE_URL] = original_image_url["public_id"]
-            if image_filter:
-                edited_image_url = await CloudinaryService.apply_filter(original_image_url["public_id"], image_filter)
-                links_dict[const.EDITED_IMAGE_URL] = edited_image_url
-            else:
-                links_dict[const.ORIGINAL_IMAGE_URL] = original_image_url["public_id"]
-                links_dict[const.EDITED_IMAGE_URL] = original_image_url["secure_url"]
-
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"{messages.UPLOAD_IMAGE_ERROR} -//- {e}",
             )
+
+    @staticmethod
+    async def build_image_urls(public_id: str, secure_url: str, image_filter: str = None) -> dict:
+        """
+        Build the URLs of the original and (optionally) the edited version of an uploaded image.
+
+        :param public_id: The public ID of the uploaded image.
+        :param secure_url: The URL of the uploaded image.
+        :param image_filter: (Optional) The filter to apply to the image.
+        :return: A dictionary containing URLs for the original and the edited image.
+        """
+        links_dict = {const.ORIGINAL_IMAGE_URL: public_id}
+        if image_filter:
+            links_dict[const.EDITED_IMAGE_URL] = await CloudinaryService.apply_filter(public_id, image_filter)
+        else:
+            links_dict[const.EDITED_IMAGE_URL] = secure_url
         return links_dict
 
+    @staticmethod
+    async def get_image_urls(image_file: UploadFile, image_filter: str = None) -> dict:
+        """
+        Upload an image to Cloudinary, optionally apply a filter, and return URLs for the original and edited images.
+
+        :param image_file: The image file to upload.
+        :param image_filter: (Optional) The filter to apply to the image.
+        :return: A dictionary containing URLs for the original and (optionally) the edited image.
+        """
+        uploaded = await CloudinaryService.upload_image(image_file, uuid.uuid4().hex)
+        return await CloudinaryService.build_image_urls(uploaded["public_id"], uploaded["secure_url"], image_filter)
+
+    @staticmethod
+    async def delete_image(public_id: str) -> None:
+        """
+        Delete an uploaded image from Cloudinary. Failures are logged and otherwise ignored,
+        an orphaned remote asset is preferable to failing the request that released it.
+
+        :param public_id: The public ID of the image.
+        """
+        try:
+            cloudinary.uploader.destroy(public_id, invalidate=True)
+        except Exception as e:
+            logger.warning(f"Failed to delete image {public_id}: {e}")
+
     @staticmethod
     async def get_avatar_url(avatar_file: UploadFile, username: str) -> str:
         """
@@ -0,0 +1,41 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a weak ETag from the values that identify a version of a resource.
+
+    :param parts: Version values, e.g. IDs and ``updated_at`` timestamps.
+    :return: A weak ETag header value.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check the ``If-None-Match`` header of a request against an ETag using weak comparison.
+
+    :param request: The incoming request.
+    :param etag: The current ETag of the resource.
+    :return: True if the client already has the current version.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build an empty ``304 Not Modified`` response.
+
+    :param etag: The current ETag of the resource.
+    :return: The response.
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import orjson
+from redis import asyncio as aioredis
+
+from conf.config import app_config
+
+logger = logging.getLogger("uvicorn.error")
+
+# Sent to a subscriber that fell behind, after which its stream ends; the client should
+# reload the listing it displays and subscribe again.
+RESET_FRAME = b"event: reset\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+def sse_frame(event: str, data: dict) -> bytes:
+    """
+    Encode an event in the Server-Sent Events wire format.
+
+    :param event: The event name.
+    :param data: The JSON payload.
+    :return: The frame, terminated by an empty line.
+    """
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+class Subscription:
+    """
+    The bounded buffer of one connection. Publishers never wait for a subscriber: when the buffer
+    is full, it is replaced by a single reset frame and the subscription is closed.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=buffer_size)
+        self.closed = False
+
+    def put(self, frame: bytes) -> None:
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESET_FRAME)
+            self.closed = True
+
+    async def frames(self, heartbeat: float) -> AsyncIterator[bytes]:
+        """
+        Yield the buffered frames, and a heartbeat comment whenever nothing happened for ``heartbeat``
+        seconds so proxies keep the connection open. Ends after a reset frame.
+        """
+        while True:
+            try:
+                frame = await asyncio.wait_for(self.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT_FRAME
+                continue
+            yield frame
+            if frame is RESET_FRAME:
+                return
+
+
+class EventBroker:
+    """
+    Publishes post events (new comments, score changes, ...) to the connections subscribed to the post.
+
+    Within one worker events go straight to the subscriptions. With a Redis URL every event is
+    published to one Redis channel instead, and each worker delivers what it receives from the
+    channel to its own subscriptions, so all workers see the events of all workers.
+    """
+
+    def __init__(self, buffer_size: int, heartbeat: float, redis_url: str | None = None,
+                 channel: str = "post-events"):
+        """
+        :param buffer_size: The number of frames a connection may lag behind before it is reset.
+        :param heartbeat: Seconds of inactivity after which a heartbeat is sent.
+        :param redis_url: The Redis server bridging the workers, None to stay in-process.
+        :param channel: The Redis channel.
+        """
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat
+        self.redis_url = redis_url
+        self.channel = channel
+        self._subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+        self._redis: aioredis.Redis | None = None
+        self._listener: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """
+        Connect to Redis and start forwarding the channel to the local subscriptions.
+        """
+        if self.redis_url is None or self._listener is not None:
+            return
+        self._redis = aioredis.from_url(self.redis_url)
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(pubsub), name="post-events")
+
+    async def stop(self) -> None:
+        """
+        Stop forwarding and close the Redis connection.
+        """
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+        await self._redis.aclose()
+        self._redis = None
+
+    @asynccontextmanager
+    async def subscribe(self, post_id: int) -> AsyncIterator[Subscription]:
+        """
+        Subscribe to the events of a post for the duration of the context.
+
+        :param post_id: The unique identifier of the post.
+        :return: The subscription.
+        """
+        subscription = Subscription(self.buffer_size)
+        self._subscriptions[post_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscriptions.get(post_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[post_id]
+
+    async def stream(self, post_id: int) -> AsyncIterator[bytes]:
+        """
+        Generate the Server-Sent Events stream of a post until the client disconnects or falls behind.
+
+        :param post_id: The unique identifier of the post.
+        :return: An async iterator of SSE frames.
+        """
+        async with self.subscribe(post_id) as subscription:
+            yield HEARTBEAT_FRAME
+            async for frame in subscription.frames(self.heartbeat):
+                yield frame
+
+    async def publish(self, post_id: int, event: str, data: dict) -> None:
+        """
+        Publish an event of a post. Failures are logged, never raised, so a write that already
+        committed is not reported as failed.
+
+        :param post_id: The unique identifier of the post.
+        :param event: The event name, e.g. "comment.created".
+        :param data: The JSON payload.
+        """
+        if self._redis is None:
+            self._deliver(post_id, sse_frame(event, data))
+            return
+        try:
+            await self._redis.publish(self.channel, orjson.dumps([post_id, event, data]))
+        except Exception as e:
+            logger.error(f"Publishing event '{event}' of post {post_id} failed: {e}")
+
+    def _deliver(self, post_id: int, frame: bytes) -> None:
+        for subscription in list(self._subscriptions.get(post_id, ())):
+            subscription.put(frame)
+
+    async def _listen(self, pubsub) -> None:
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    post_id, event, data = orjson.loads(message["data"])
+                    self._deliver(post_id, sse_frame(event, data))
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception as e:
+                logger.error(f"Receiving post events failed: {e}")
+                await asyncio.sleep(1)
+
+
+event_broker = EventBroker(
+    app_config.EVENTS_BUFFER_SIZE,
+    app_config.EVENTS_HEARTBEAT_INTERVAL,
+    app_config.REDIS_URL if app_config.EVENTS_REDIS_ENABLED else None,
+)
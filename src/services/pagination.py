@@ -0,0 +1,85 @@
+import base64
+from datetime import datetime
+from typing import Mapping, Sequence
+
+import orjson
+from fastapi import HTTPException, status
+
+from conf import messages
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last item of a page into an opaque cursor.
+
+    :param values: The sort key values, e.g. a timestamp and an ID.
+    :return: A URL-safe cursor string.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor created by ``encode_cursor``.
+
+    :param cursor: The cursor string.
+    :param size: The number of values the cursor must contain.
+    :return: The sort key values.
+    :raises HTTPException: If the cursor is malformed.
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_CURSOR)
+    return values
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """
+    Decode a cursor that holds a single integer ID.
+
+    :param cursor: The cursor string.
+    :return: The ID.
+    :raises HTTPException: If the cursor is malformed.
+    """
+    value = decode_cursor(cursor, 1)[0]
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_CURSOR)
+    return value
+
+
+def decode_timestamp_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor that holds a timestamp and an integer ID.
+
+    :param cursor: The cursor string.
+    :return: The timestamp and the ID.
+    :raises HTTPException: If the cursor is malformed.
+    """
+    timestamp, value = decode_cursor(cursor, 2)
+    try:
+        timestamp = datetime.fromisoformat(timestamp)
+    except (ValueError, TypeError):
+        timestamp = None
+    if timestamp is None or not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_CURSOR)
+    return timestamp, value
+
+
+def next_cursor(items: Sequence, limit: int, *keys: str) -> str | None:
+    """
+    Build the cursor of the page after ``items``.
+
+    :param items: The items of the current page.
+    :param limit: The requested page size.
+    :param keys: The attribute names of the sort key.
+    :return: The cursor, or None if the page is the last one.
+    """
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(*(last[key] if isinstance(last, Mapping) else getattr(last, key) for key in keys))
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class PeriodicTask:
+    """
+    Runs a coroutine function in the background every ``interval`` seconds for the lifetime of the app.
+    """
+
+    def __init__(self, name: str, interval: float, callback: Callable[[], Awaitable[object]]):
+        """
+        :param name: A name used in log messages.
+        :param interval: Seconds between two runs.
+        :param callback: The coroutine function to run.
+        """
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Schedule the task on the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """
+        Cancel the task and run the callback one last time so buffered work is not lost.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._run_once()
+
+    async def _run_once(self) -> None:
+        try:
+            await self.callback()
+        except Exception as e:
+            logger.error(f"Periodic task '{self.name}' failed: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._run_once()
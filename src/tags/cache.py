@@ -0,0 +1,158 @@
+import logging
+from bisect import bisect_left, insort
+from heapq import nlargest
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from conf import const
+from database.db import sessionmanager
+from src.tags.models import Tag
+from src.tags.repository import TagRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _detached(tag: Tag) -> Tag:
+    """
+    Copy a tag into a detached instance that any session can merge without loading it.
+    """
+    copy = Tag(id=tag.id, name=tag.name)
+    make_transient_to_detached(copy)
+    return copy
+
+
+class TagCache:
+    """
+    Keeps the tag vocabulary of the worker in memory, so posts can be created with and filtered by
+    known tags, and tags can be suggested by prefix, without querying the tags table.
+
+    Every worker loads all tags with their number of posts at startup and counts the posts it
+    creates and deletes itself. Changes made by other workers are picked up by ``refresh``, which
+    compares the count, highest id and total post count of the tags table with the cached ones and
+    reloads the tags when they differ. Until then, names the cache does not know fall through to
+    the database.
+
+    The names are also kept in a sorted list, so the tags starting with a prefix are one slice
+    of it; the most used tags of each requested prefix are memoized until one of them changes.
+    """
+
+    def __init__(self):
+        self._tags: dict[str, Tag] = {}
+        self._counts: dict[str, int] = {}
+        self._names: list[str] = []
+        self._suggestions: dict[str, list[str]] = {}
+        self._version: tuple[int, int, int] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._version is not None
+
+    async def load(self) -> int:
+        """
+        Load all tags and their number of posts from the database.
+
+        :return: The number of cached tags.
+        """
+        async with sessionmanager.session() as session:
+            repository = TagRepository(session)
+            version = await repository.get_tags_version()
+            tags = await repository.get_all_tags()
+        self._tags = {tag.name: _detached(tag) for tag in tags}
+        self._counts = {tag.name: tag.post_count for tag in tags}
+        self._names = sorted(self._tags)
+        self._suggestions = {}
+        self._version = version
+        return len(tags)
+
+    async def refresh(self) -> bool:
+        """
+        Reload the tags if the tags table changed since the last load.
+
+        :return: True if the tags were reloaded.
+        """
+        async with sessionmanager.session() as session:
+            version = await TagRepository(session).get_tags_version()
+        if version == self._version:
+            return False
+        count = await self.load()
+        logger.info(f"Reloaded {count} cached tags")
+        return True
+
+    def add(self, tags: set[Tag], posts: int = 1) -> None:
+        """
+        Cache the tags of posts created by this worker and count the posts.
+
+        :param tags: A set of Tag instances with their ids.
+        :param posts: The number of posts, negative for deleted posts.
+        """
+        for tag in tags:
+            if tag.name not in self._tags:
+                if posts < 0:
+                    continue
+                self._tags[tag.name] = _detached(tag)
+                insort(self._names, tag.name)
+            self._counts[tag.name] = self._counts.get(tag.name, 0) + posts
+            self._forget_suggestions(tag.name)
+
+    def discard(self, name: str) -> None:
+        """
+        Forget a deleted tag.
+
+        :param name: The tag name.
+        """
+        if self._tags.pop(name, None) is None:
+            return
+        self._counts.pop(name, None)
+        self._names.pop(bisect_left(self._names, name))
+        self._forget_suggestions(name)
+
+    def lookup(self, names: set[str]) -> tuple[set[Tag], set[str]]:
+        """
+        Split tag names into the cached tags and the names that have to be looked up.
+
+        :param names: A set of tag names.
+        :return: The cached Tag instances (detached) and the unknown names.
+        """
+        found, missing = set(), set()
+        for name in names:
+            tag = self._tags.get(name)
+            if tag is None:
+                missing.add(name)
+            else:
+                found.add(tag)
+        return found, missing
+
+    def match_ids(self, pattern: str) -> list[int]:
+        """
+        Find the ids of the cached tags whose name contains a text, like the ILIKE tag filter.
+
+        :param pattern: The text to search for.
+        :return: A list of tag ids.
+        """
+        pattern = pattern.lower()
+        return [tag.id for name, tag in self._tags.items() if pattern in name]
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[Tag, int]]:
+        """
+        Find the most used tags starting with a prefix, ties in alphabetical order.
+
+        :param prefix: The lower-case beginning of the tag names.
+        :param limit: The number of tags, up to TAG_SUGGEST_MAX_LIMIT.
+        :return: A list of (Tag, number of posts) pairs.
+        """
+        names = self._suggestions.get(prefix)
+        if names is None:
+            start = bisect_left(self._names, prefix)
+            end = bisect_left(self._names, prefix + "\U0010ffff", start)
+            names = nlargest(const.TAG_SUGGEST_MAX_LIMIT, self._names[start:end], key=self._counts.__getitem__)
+            if len(self._suggestions) >= const.TAG_SUGGEST_CACHE_SIZE:
+                self._suggestions.clear()
+            self._suggestions[prefix] = names
+        return [(self._tags[name], self._counts[name]) for name in names[:limit]]
+
+    def _forget_suggestions(self, name: str) -> None:
+        for end in range(len(name) + 1):
+            self._suggestions.pop(name[:end], None)
+
+
+tag_cache = TagCache()
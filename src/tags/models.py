@@ -1,4 +1,6 @@
-from sqlalchemy import Integer, String
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from conf.config import Base
@@ -8,3 +10,28 @@ class Tag(Base):
     __tablename__ = "tags"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
+    post_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+class TagUsageBucket(Base):
+    """
+    The number of posts created with a tag per hour, for trending tags. Rows older than the
+    trending window are pruned.
+    """
+    __tablename__ = "tag_usage_buckets"
+    tag_id: Mapped[int] = mapped_column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start: Mapped[DateTime] = mapped_column(DateTime, primary_key=True)
+    uses: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    @staticmethod
+    def bucket_of(at: datetime) -> datetime:
+        """
+        The start of the bucket a timestamp falls in.
+        """
+        return at.replace(minute=0, second=0, microsecond=0)
+
+
+# Serves LIKE 'prefix%' lookups whatever the database collation
+Index("ix_tags_name_pattern", Tag.name, postgresql_ops={"name": "text_pattern_ops"})
+Index("ix_tags_post_count", Tag.post_count.desc(), Tag.name)
+Index("ix_tag_usage_buckets_bucket_start", TagUsageBucket.bucket_start)
@@ -1,7 +1,10 @@
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.tags.models import Tag
+from src.tags.models import Tag, TagUsageBucket
 
 
 class TagRepository:
@@ -19,6 +22,146 @@ class TagRepository:
         tag = set(result.scalars().all())
         return tag
 
+    async def upsert_tags(self, tags_list: set[str]) -> set[Tag]:
+        """
+        Insert missing tags and return all requested tags in a single round trip.
+
+        The no-op ``DO UPDATE`` makes ``RETURNING`` yield existing rows too, and the
+        sorted insert order keeps concurrent upserts from deadlocking each other.
+
+        :param tags_list: A set of tag names.
+        :return: A set of Tag instances for every requested name.
+        """
+        if not tags_list:
+            return set()
+        stmt = insert(Tag).values([{"name": name} for name in sorted(tags_list)])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Tag.name],
+            set_={"name": stmt.excluded.name},
+        ).returning(Tag)
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def get_all_tags(self) -> list[Tag]:
+        """
+        Load the whole tag vocabulary with the number of posts of each tag.
+
+        :return: A list of Tag instances.
+        """
+        result = await self.session.execute(select(Tag))
+        return list(result.scalars().all())
+
+    async def suggest_tags(self, prefix: str, limit: int) -> list[Tag]:
+        """
+        Find the most used tags starting with a prefix. The prefix is matched with a LIKE pattern
+        that can use the text_pattern_ops index on the tag names.
+
+        :param prefix: The lower-case beginning of the tag names.
+        :param limit: The maximum number of tags.
+        :return: A list of Tag instances, most used first.
+        """
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        stmt = (
+            select(Tag)
+            .where(Tag.name.like(pattern, escape="\\"))
+            .order_by(Tag.post_count.desc(), Tag.name)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_popular_tags(self, limit: int) -> list[Tag]:
+        """
+        Retrieve the tags with the most posts.
+
+        :param limit: The maximum number of tags.
+        :return: A list of Tag instances, most used first.
+        """
+        stmt = select(Tag).order_by(Tag.post_count.desc(), Tag.name).limit(limit)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_trending_tags(self, since: datetime, limit: int) -> list[tuple[Tag, int]]:
+        """
+        Retrieve the tags used by the most new posts, summing their hourly usage buckets.
+
+        :param since: The start of the first bucket counted.
+        :param limit: The maximum number of tags.
+        :return: A list of (Tag, number of new posts) pairs, most used first.
+        """
+        uses = func.sum(TagUsageBucket.uses).label("uses")
+        recent = (
+            select(TagUsageBucket.tag_id, uses)
+            .where(TagUsageBucket.bucket_start >= since)
+            .group_by(TagUsageBucket.tag_id)
+            .having(uses > 0)
+            .order_by(uses.desc(), TagUsageBucket.tag_id)
+            .limit(limit)
+            .subquery()
+        )
+        stmt = select(Tag, recent.c.uses).join(recent, recent.c.tag_id == Tag.id).order_by(recent.c.uses.desc(), Tag.name)
+        result = await self.session.execute(stmt)
+        return [(tag, uses) for tag, uses in result.all()]
+
+    async def add_tag_usage(self, usage: dict[int, int], bucket_start: datetime) -> None:
+        """
+        Add posts to the post counts of tags and to a usage bucket in one statement each, within
+        the current transaction. Deleted posts are subtracted with negative numbers.
+
+        :param usage: The number of posts added per tag id.
+        :param bucket_start: The hour the posts were created in, see TagUsageBucket.bucket_of.
+        """
+        if not usage:
+            return
+        rows = sorted(usage.items())
+        await self.session.execute(
+            update(Tag)
+            .where(Tag.id.in_(list(usage)))
+            .values(post_count=Tag.post_count + case(usage, value=Tag.id, else_=0))
+            .execution_options(synchronize_session=False)
+        )
+
+        stmt = insert(TagUsageBucket).values(
+            [{"tag_id": tag_id, "bucket_start": bucket_start, "uses": posts} for tag_id, posts in rows]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TagUsageBucket.tag_id, TagUsageBucket.bucket_start],
+            set_={"uses": TagUsageBucket.uses + stmt.excluded.uses},
+        )
+        await self.session.execute(stmt)
+
+    async def prune_tag_usage(self, before: datetime) -> int:
+        """
+        Delete the usage buckets that left the trending window.
+
+        :param before: The start of the first bucket to keep.
+        :return: The number of deleted buckets.
+        """
+        result = await self.session.execute(delete(TagUsageBucket).where(TagUsageBucket.bucket_start < before))
+        return result.rowcount
+
+    async def get_tags_version(self) -> tuple[int, int, int]:
+        """
+        Summarize the tags table so a change can be detected without loading it: inserts raise the
+        highest id, deletes lower the count, and new or deleted posts change the sum of post counts.
+
+        :return: The number of tags, the highest tag id and the sum of post counts.
+        """
+        result = await self.session.execute(
+            select(func.count(), func.coalesce(func.max(Tag.id), 0), func.coalesce(func.sum(Tag.post_count), 0))
+        )
+        count, max_id, posts = result.one()
+        return count, max_id, posts
+
+    async def attach_tags(self, tags: set[Tag]) -> set[Tag]:
+        """
+        Add tags known to exist to the session without loading them.
+
+        :param tags: A set of detached Tag instances.
+        :return: A set of Tag instances belonging to the session.
+        """
+        return {await self.session.merge(tag, load=False) for tag in tags}
+
     async def delete_tag(self, tag_name: str):
         stmt = select(Tag).where(Tag.name == tag_name)
         result = await self.session.execute(stmt)
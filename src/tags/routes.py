@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from conf import const
+from database.db import get_db
+from src.services.auth.auth_service import get_current_user
+from src.tags.schemas import TagTrendingSchema, TagUsageSchema
+from src.tags.tag_service import TagService
+from src.users.models import User
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+@router.get("/suggest", response_model=list[TagUsageSchema])
+async def suggest_tags(
+        prefix: str = Query(..., min_length=1, max_length=const.TAG_MAX_LENGTH),
+        limit: int = Query(10, ge=1, le=const.TAG_SUGGEST_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(get_current_user),
+) -> list[TagUsageSchema]:
+    """
+    Suggest tags as the user types: the most used tags whose name starts with the prefix.
+
+    :param prefix: The beginning of the tag names, case-insensitive.
+    :param limit: Maximum number of tags to retrieve, default is 10.
+    :param db: Database session dependency.
+    :param user: Current authenticated user dependency.
+    :return: List of tags with their number of posts, most used first.
+    """
+    tag_service = TagService(db)
+    return await tag_service.suggest_tags(prefix, limit)
+
+
+@router.get("/popular", response_model=list[TagUsageSchema])
+async def get_popular_tags(
+        limit: int = Query(10, ge=1, le=const.TAG_SUGGEST_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(get_current_user),
+) -> list[TagUsageSchema]:
+    """
+    Retrieve the tags with the most posts.
+
+    :param limit: Maximum number of tags to retrieve, default is 10.
+    :param db: Database session dependency.
+    :param user: Current authenticated user dependency.
+    :return: List of tags with their number of posts, most used first.
+    """
+    tag_service = TagService(db)
+    return await tag_service.get_popular_tags(limit)
+
+
+@router.get("/trending", response_model=list[TagTrendingSchema])
+async def get_trending_tags(
+        limit: int = Query(10, ge=1, le=const.TAG_SUGGEST_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db),
+        user: User = Depends(get_current_user),
+) -> list[TagTrendingSchema]:
+    """
+    Retrieve the tags of the most posts created within the last TAG_TRENDING_WINDOW_HOURS hours.
+
+    :param limit: Maximum number of tags to retrieve, default is 10.
+    :param db: Database session dependency.
+    :param user: Current authenticated user dependency.
+    :return: List of tags with their number of posts and of recent posts, most used recently first.
+    """
+    tag_service = TagService(db)
+    return await tag_service.get_trending_tags(limit)
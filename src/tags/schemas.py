@@ -8,3 +8,11 @@ class TagResponseSchema(TagSchema):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TagUsageSchema(TagResponseSchema):
+    post_count: int
+
+
+class TagTrendingSchema(TagUsageSchema):
+    recent_post_count: int
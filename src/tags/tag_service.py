@@ -1,10 +1,36 @@
+from datetime import datetime, timedelta
+from typing import Iterable
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from conf import messages
+from conf import const, messages
+from database.db import sessionmanager
+from src.tags.cache import tag_cache
+from src.tags.models import Tag, TagUsageBucket
 from src.tags.repository import TagRepository
 
 
+def _trending_since() -> datetime:
+    return TagUsageBucket.bucket_of(datetime.now() - timedelta(hours=const.TAG_TRENDING_WINDOW_HOURS))
+
+
+def _usage(tags: Iterable[tuple[Tag, int]]) -> list[dict]:
+    return [{"id": tag.id, "name": tag.name, "post_count": count} for tag, count in tags]
+
+
+async def prune_tag_usage() -> int:
+    """
+    Delete the tag usage buckets older than the trending window.
+
+    :return: The number of deleted buckets.
+    """
+    async with sessionmanager.session() as session:
+        deleted = await TagRepository(session).prune_tag_usage(_trending_since())
+        await session.commit()
+    return deleted
+
+
 class TagService:
     def __init__(self, db: AsyncSession):
         self.tag_repository = TagRepository(db)
@@ -17,31 +43,81 @@ class TagService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=messages.POST_NOT_FOUND,
             )
+        tag_cache.discard(tag.name)
 
 
-    async def get_or_create_tags(self, tags: set[str]):
-        tags_list = await self.tag_repository.get_tags_by_names(tags)
-        existing_tag_names = {tag.name for tag in tags_list}
-        not_existing_tag_names = [tag for tag in tags if tag not in existing_tag_names]
-
-        try:
-            new_tags = set()
-            for tag in not_existing_tag_names:
-                tag_obj = await self.tag_repository.create_tag(tag)
-                new_tags.add(tag_obj)
-            await self.tag_repository.session.commit()
-            for tag in new_tags:
-                await self.tag_repository.session.refresh(tag)
-            tags_list.update(new_tags)
-        except Exception as e:
-            await self.tag_repository.session.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"{messages.DATA_INTEGRITY_ERROR}. -//- {e}",
-            )
+    async def get_or_create_tags(self, tags: set[str]) -> set[Tag]:
+        """
+        Get the tags with the given names, taking known tags from the tag cache and creating the
+        missing ones in one upsert.
+
+        Nothing is committed: the tags are written in the transaction of the post that uses them,
+        and concurrent posts with the same new tag both get the row instead of a unique violation.
+        The caller adds the new tags to the cache once that transaction is committed.
+
+        :param tags: A set of tag names.
+        :return: A set of Tag instances for every name.
+        """
+        cached, missing = tag_cache.lookup(tags)
+        tags_list = await self.tag_repository.attach_tags(cached)
+        if missing:
+            tags_list |= await self.tag_repository.upsert_tags(missing)
         return tags_list
 
 
+    async def suggest_tags(self, prefix: str, limit: int) -> list[dict]:
+        """
+        Suggest the most used tags starting with a prefix, from the tag cache when it is loaded.
+
+        :param prefix: The beginning of the tag names, case-insensitive.
+        :param limit: The maximum number of tags.
+        :return: A list of tags with their number of posts, most used first.
+        """
+        prefix = prefix.strip().lower()
+        if tag_cache.loaded:
+            return _usage(tag_cache.suggest(prefix, limit))
+        return _usage((tag, tag.post_count) for tag in await self.tag_repository.suggest_tags(prefix, limit))
+
+
+    async def get_popular_tags(self, limit: int) -> list[dict]:
+        """
+        Retrieve the tags with the most posts, from the tag cache when it is loaded.
+
+        :param limit: The maximum number of tags.
+        :return: A list of tags with their number of posts, most used first.
+        """
+        if tag_cache.loaded:
+            return _usage(tag_cache.suggest("", limit))
+        return _usage((tag, tag.post_count) for tag in await self.tag_repository.get_popular_tags(limit))
+
+
+    async def get_trending_tags(self, limit: int) -> list[dict]:
+        """
+        Retrieve the tags of the most posts created within the last TAG_TRENDING_WINDOW_HOURS.
+
+        :param limit: The maximum number of tags.
+        :return: A list of tags with their number of posts and of recent posts, most used first.
+        """
+        trending = await self.tag_repository.get_trending_tags(_trending_since(), limit)
+        return [
+            {"id": tag.id, "name": tag.name, "post_count": tag.post_count, "recent_post_count": uses}
+            for tag, uses in trending
+        ]
+
+
+    async def record_tag_usage(self, tags: set[Tag], posts: int, used_at: datetime = None) -> None:
+        """
+        Count created or deleted posts in the post counts and usage buckets of their tags, within
+        the transaction of the posts.
+
+        :param tags: The tags of the posts.
+        :param posts: The number of posts, negative for deleted posts.
+        :param used_at: When the posts were created, None for now.
+        """
+        bucket_start = TagUsageBucket.bucket_of(used_at or datetime.now())
+        await self.tag_repository.add_tag_usage({tag.id: posts for tag in tags}, bucket_start)
+
+
     @staticmethod
     async def check_and_format_tag(tags: str):
         error_list = []
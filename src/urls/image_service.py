@@ -1,6 +1,7 @@
+from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.urls.repository import URLRepository
+from src.urls.repository import StoredImageRepository, URLRepository
 from src.services.cloudinary_service import CloudinaryService
 from src.services.qr_service import QRService
 
@@ -18,9 +19,40 @@ class URLService:
         :param db: The asynchronous database session.
         """
         self.image_repository = URLRepository(db)
+        self.stored_image_repository = StoredImageRepository(db)
         self.qr_service = QRService
         self.cloudinary_service = CloudinaryService
 
+    async def store_image(self, image_file: UploadFile, image_filter: str = None) -> dict:
+        """
+        Store an uploaded image, reusing an earlier upload with the same content.
+        The image is uploaded under its SHA-256 digest only when the digest is not known yet,
+        and a reference is added in the current transaction.
+
+        :param image_file: The uploaded image file.
+        :param image_filter: (Optional) The filter to apply to the image.
+        :return: A dictionary containing URLs for the original and the edited image.
+        """
+        digest = await self.cloudinary_service.hash_image(image_file)
+        stored_image = await self.stored_image_repository.get_image_by_digest(digest)
+        if stored_image:
+            public_id, secure_url = stored_image.public_id, stored_image.secure_url
+        else:
+            uploaded = await self.cloudinary_service.upload_image(image_file, digest)
+            public_id, secure_url = uploaded["public_id"], uploaded["secure_url"]
+
+        await self.stored_image_repository.add_reference(digest, public_id, secure_url)
+        return await self.cloudinary_service.build_image_urls(public_id, secure_url, image_filter)
+
+    async def release_image(self, public_id: str) -> str | None:
+        """
+        Drop a reference to a stored image in the current transaction.
+
+        :param public_id: The public ID of the original image.
+        :return: The public ID if it was the last reference and the remote asset can be deleted, otherwise None.
+        """
+        return await self.stored_image_repository.release_reference(public_id)
+
     async def create_image(self, post_id: int, image_url: str, image_filter: str):
         """
         Create and store a new image with a specific filter applied.
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import DateTime, Integer, String, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from conf.config import Base
@@ -12,3 +12,12 @@ class URLs(Base):
     )
     image_url: Mapped[str] = mapped_column(String(300), nullable=False)
     image_filter: Mapped[str] = mapped_column(String(100), nullable=False)
+
+
+class StoredImage(Base):
+    __tablename__ = "images"
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True)
+    public_id: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    secure_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    created_at: Mapped[DateTime] = mapped_column("created_at", DateTime, default=func.now())
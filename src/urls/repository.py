@@ -1,6 +1,7 @@
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.urls.models import URLs
+from src.urls.models import StoredImage, URLs
 
 
 class URLRepository:
@@ -56,4 +57,69 @@ class URLRepository:
         """
         stmt = delete(URLs).filter(URLs.post_id == post_id)
 
-        await self.session.execute(stmt)
\ No newline at end of file
+        await self.session.execute(stmt)
+
+
+class StoredImageRepository:
+    """
+    A repository class for the reference-counted uploaded images, keyed by content digest.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize the StoredImageRepository with a database session.
+
+        :param db: The asynchronous database session.
+        """
+        self.session = db
+
+    async def get_image_by_digest(self, digest: str) -> StoredImage | None:
+        """
+        Retrieve an uploaded image by the SHA-256 digest of its content.
+
+        :param digest: The hex digest of the image content.
+        :return: The image record if found, otherwise None.
+        """
+        stmt = select(StoredImage).filter_by(digest=digest)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def add_reference(self, digest: str, public_id: str, secure_url: str) -> StoredImage:
+        """
+        Register a new reference to an uploaded image, creating the record on first use.
+        The change is committed together with the post that references the image.
+
+        :param digest: The hex digest of the image content.
+        :param public_id: The public ID of the image on Cloudinary.
+        :param secure_url: The URL of the image on Cloudinary.
+        :return: The image record with the updated reference count.
+        """
+        stmt = insert(StoredImage).values(digest=digest, public_id=public_id, secure_url=secure_url, ref_count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StoredImage.digest],
+            set_={"ref_count": StoredImage.ref_count + 1},
+        ).returning(StoredImage)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def release_reference(self, public_id: str) -> str | None:
+        """
+        Drop a reference to an uploaded image and delete the record when no references are left.
+
+        :param public_id: The public ID of the image on Cloudinary.
+        :return: The public ID if the last reference was dropped, otherwise None.
+        """
+        stmt = (
+            update(StoredImage)
+            .where(StoredImage.public_id == public_id)
+            .values(ref_count=StoredImage.ref_count - 1)
+        )
+        await self.session.execute(stmt)
+
+        stmt = (
+            delete(StoredImage)
+            .where(StoredImage.public_id == public_id, StoredImage.ref_count <= 0)
+            .returning(StoredImage.public_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
@@ -0,0 +1,70 @@
+from typing import AsyncIterator, Mapping
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from conf import const
+from database.db import sessionmanager
+from src.comments.repository import CommentRepository
+from src.posts.repository import PostRepository
+from src.scores.repository import ScoreRepository
+from src.users.models import User
+
+
+def _ndjson_line(record_type: str, row: Mapping) -> bytes:
+    return orjson.dumps({"type": record_type, **row}, option=orjson.OPT_APPEND_NEWLINE)
+
+
+class UserExportService:
+    """
+    Export of all posts, comments and scores of a user as NDJSON, one record per line.
+
+    Rows are read through server-side cursors and encoded one cursor batch at a time,
+    so memory stays constant regardless of the size of the account.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.post_repository = PostRepository(db)
+        self.comment_repository = CommentRepository(db)
+        self.score_repository = ScoreRepository(db)
+
+    async def export(self, user: User) -> AsyncIterator[bytes]:
+        """
+        Generate the export of a user.
+
+        :param user: The user whose data is exported.
+        :return: An async iterator of NDJSON chunks, the first line describes the user.
+        """
+        yield _ndjson_line("user", {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "created_at": user.created_at,
+        })
+
+        streams = (
+            ("post", self.post_repository.stream_post_rows_by_user),
+            ("comment", self.comment_repository.stream_comments_by_user),
+            ("score", self.score_repository.stream_scores_by_user),
+        )
+        for record_type, stream in streams:
+            result = await stream(user.id, const.EXPORT_YIELD_PER)
+            async for partition in result.mappings().partitions():
+                yield b"".join(_ndjson_line(record_type, row) for row in partition)
+
+
+async def stream_user_export(user: User) -> AsyncIterator[bytes]:
+    """
+    Generate the export of a user in a session of its own. Request-scoped sessions are closed
+    before a streaming response is sent, and a repeatable read transaction makes all three
+    cursors see the same snapshot.
+
+    :param user: The user whose data is exported.
+    :return: An async iterator of NDJSON chunks.
+    """
+    async with sessionmanager.session() as session:
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        async for chunk in UserExportService(session).export(user):
+            yield chunk
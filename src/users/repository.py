@@ -44,6 +44,27 @@ class UserRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_user_version_by_username(self, username: str) -> tuple | None:
+        """
+        Retrieve the values a profile response depends on, without loading the user
+        :param username: Username to search for
+        :type username: str
+        :return: A tuple of version values if found, otherwise None
+        :rtype: tuple | None
+        """
+        posts_count = select(func.count(Post.id)).where(Post.user_id == User.id).scalar_subquery()
+        query = select(
+            User.id,
+            User.updated_at,
+            User.role_id,
+            User.is_banned,
+            User.is_confirmed,
+            posts_count,
+        ).where(User.username == username)
+        result = await self.session.execute(query)
+        row = result.one_or_none()
+        return tuple(row) if row else None
+
     async def create_user(
         self,
         user_create: UserCreate,
@@ -176,6 +197,18 @@ class UserRepository:
         result = await self.session.execute(query)
         return result.scalar()
 
+    async def get_existing_user_ids(self, user_ids: set[int]) -> set[int]:
+        """
+        Filter a set of user IDs down to the ones that exist
+        :param user_ids: IDs to check
+        :type user_ids: set[int]
+        :return: IDs of existing users
+        :rtype: set[int]
+        """
+        query = select(User.id).where(User.id.in_(user_ids))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
     async def search_users(self, param: str, has_posts: bool, offset: int, limit: int) -> Sequence[User]:
         """
         Search for users based on criteria
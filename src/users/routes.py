@@ -1,11 +1,14 @@
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, File, UploadFile, status, Query, HTTPException
+from fastapi import APIRouter, Depends, File, UploadFile, status, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from conf.messages import USER_NOT_FOUND
 from database.db import get_db
 from src.services.auth.auth_service import RoleChecker, get_current_user
+from src.services.etag import is_not_modified, not_modified
+from src.users.export_service import stream_user_export
 from src.users.models import User
 from src.users.schemas import RoleEnum, UserResponse, UserUpdate
 from src.users.users_service import UserService
@@ -40,13 +43,20 @@ async def get_user_info_by_id(
 @router.get("/{username}/profile", response_model=UserResponse)
 async def get_user_info_by_username(
     username: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Retrieve user information by username.
+    Responds with 304 Not Modified when the If-None-Match header matches the profile ETag.
     :param username: The username of the user to retrieve.
     :type username: str
+    :param request: The incoming request, used for conditional requests.
+    :type request: Request
+    :param response: The outgoing response, used to set the ETag header.
+    :type response: Response
     :param current_user: The current authenticated user, used to check permissions.
     :type current_user: User
     :param db: The database session.
@@ -55,15 +65,38 @@ async def get_user_info_by_username(
     :rtype: UserResponse
     """
     user_service = UserService(db)
+    etag = await user_service.get_profile_etag(username)
+    if etag and is_not_modified(request, etag):
+        return not_modified(etag)
     user = await user_service.get_user_by_username(username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=USER_NOT_FOUND,
         )
+    response.headers["ETag"] = etag
     return user
 
 
+@router.get("/me/export", response_class=StreamingResponse)
+async def export_user_data(
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Download all posts, comments and scores of the current user as NDJSON.
+    The export is streamed from server-side cursors, so accounts of any size can be exported.
+    :param current_user: The current authenticated user whose data is exported.
+    :type current_user: User
+    :return: A streaming NDJSON response.
+    :rtype: StreamingResponse
+    """
+    return StreamingResponse(
+        stream_user_export(current_user),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{current_user.username}-export.ndjson"'},
+    )
+
+
 @router.patch("/info", response_model=UserResponse)
 async def update_user_info(
     body: UserUpdate,
@@ -15,6 +15,7 @@ from conf.messages import (
     NOT_BANNED,
 )
 from src.services.auth.auth_service import Hash
+from src.services.etag import make_etag
 from src.users.models import User
 from src.users.repository import RoleRepository, TokenRepository, UserRepository
 from src.users.schemas import RoleEnum, UserCreate, UserUpdate, UserResponse
@@ -105,6 +106,17 @@ class UserService:
             posts_count = await self.user_repository.get_user_posts_count(user.id)
             return UserResponse.from_user(user, posts_count)
 
+    async def get_profile_etag(self, username: str) -> str | None:
+        """
+        Compute the ETag of a user profile from its modification time, role, status and post count.
+        :param username: The username of the user.
+        :type username: str
+        :return: The weak ETag if the user is found, otherwise None.
+        :rtype: str | None
+        """
+        version = await self.user_repository.get_user_version_by_username(username)
+        return make_etag("profile", version) if version else None
+
     async def activate_user(self, user: User):
         """
         Activate a user account.
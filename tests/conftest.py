@@ -68,7 +68,7 @@ def init_models_wrap():
 
             score = Score(post_id=1, user_id=user.id, score=4, id=1)
             session.add(score)
-            score1 = Score(post_id=1, user_id=user.id, score=5, id=2)
+            score1 = Score(post_id=1, user_id=2, score=5, id=2)
             session.add(score1)
 
             await session.commit()
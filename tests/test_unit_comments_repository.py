@@ -1,4 +1,5 @@
 import unittest
+from datetime import datetime
 from unittest.mock import MagicMock, AsyncMock
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -40,11 +41,15 @@ class TestAsyncComments(unittest.IsolatedAsyncioTestCase):
         self.session.commit = AsyncMock()
         self.session.refresh = AsyncMock()
         self.session.delete = AsyncMock()
+        self.session.flush = AsyncMock(side_effect=self._assign_id)
         self.comment_repository = CommentRepository(self.session)
 
     def tearDown(self):
         pass
 
+    def _assign_id(self):
+        self.session.add.call_args[0][0].id = 7
+
     async def test_add_comment(self):
         post_id = 1
 
@@ -58,6 +63,50 @@ class TestAsyncComments(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.comment, "Test comment")
         self.assertEqual(result.post_id, post_id)
         self.assertEqual(result.user_id, self.user.id)
+        self.assertEqual(result.path, "0000000007/")
+
+    async def test_add_reply(self):
+        parent = Comment(id=3, comment="Parent", post_id=1, user_id=2, path="0000000003/", depth=0)
+
+        result = await self.comment_repository.add_reply(parent=parent, body=self.comment_base, user=self.user)
+
+        self.session.add.assert_called_once()
+        self.session.commit.assert_awaited_once()
+        self.assertEqual(result.parent_id, 3)
+        self.assertEqual(result.post_id, 1)
+        self.assertEqual(result.depth, 1)
+        self.assertEqual(result.path, "0000000003/0000000007/")
+        sql = str(self.session.execute.call_args[0][0].compile())
+        self.assertIn("reply_count=(comments.reply_count +", sql)
+
+    async def test_get_first_replies(self):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [self.comment]
+        self.session.execute.return_value = mock_result
+
+        result = await self.comment_repository.get_first_replies([1, 2], 3)
+
+        self.assertEqual(result, [self.comment])
+        sql = str(self.session.execute.call_args[0][0].compile())
+        self.assertIn("LATERAL", sql)
+
+    async def test_get_first_replies_without_parents(self):
+        result = await self.comment_repository.get_first_replies([], 3)
+
+        self.assertEqual(result, [])
+        self.session.execute.assert_not_called()
+
+    async def test_get_subtree(self):
+        root = Comment(id=3, comment="Root", post_id=1, user_id=2, path="0000000003/")
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        self.session.execute.return_value = mock_result
+
+        await self.comment_repository.get_subtree(root, 50)
+
+        params = self.session.execute.call_args[0][0].compile().params
+        self.assertIn("0000000003/", params.values())
+        self.assertIn("00000000030", params.values())
 
     async def test_edit_comment(self):
         self.session.execute.return_value.scalar_one_or_none = lambda: self.comment
@@ -94,6 +143,21 @@ class TestAsyncComments(unittest.IsolatedAsyncioTestCase):
             post_id=1, limit=10, offset=0
         )
 
+    async def test_get_comment_by_post_all_after_cursor(self):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [self.comment]
+        self.session.execute.return_value = mock_result
+
+        result = await self.comment_repository.get_comment_by_post_all(
+            post_id=1, limit=10, offset=20, after=(datetime(2026, 1, 1), 5)
+        )
+
+        self.assertEqual(result, [self.comment])
+        sql = str(self.session.execute.call_args[0][0].compile())
+        self.assertIn("(comments.created_at, comments.id) <", sql)
+        self.assertIn("ORDER BY comments.created_at DESC, comments.id DESC", sql)
+        self.assertNotIn("OFFSET", sql)
+
     async def test_get_comment_by_post_user(self):
         comments = [
             Comment(id=1, comment="Comment 1", post_id=1, user_id=1),
@@ -156,6 +220,65 @@ class TestAsyncComments(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(result, self.comment)
 
+    async def test_exists_comment_within_window(self):
+        self.session.execute.return_value.scalar_one_or_none = lambda: self.comment
+
+        result = await self.comment_repository.exists_comment(comment="Test  COMMENT ", user_id=1, within=300)
+
+        self.assertEqual(result, self.comment)
+        stmt = self.session.execute.call_args[0][0]
+        sql = str(stmt.compile())
+        self.assertIn("comments.comment_hash =", sql)
+        self.assertIn("comments.created_at >=", sql)
+        self.assertIn(Comment.hash_comment("test comment"), stmt.compile().params.values())
+
+    def test_hash_comment_normalizes_text(self):
+        self.assertEqual(Comment.hash_comment("Nice  shot\n"), Comment.hash_comment("nice shot"))
+        self.assertNotEqual(Comment.hash_comment("nice shot"), Comment.hash_comment("nice shots"))
+
+    async def test_purge_comments_by_user(self):
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(None, False), (4, False), (4, False), (5, True)]
+        self.session.execute.return_value = mock_result
+
+        result = await self.comment_repository.purge_comments_by_user(user_id=1, batch_size=1000)
+
+        self.assertEqual(result, 4)
+        self.assertEqual(self.session.execute.await_count, 2)
+        delete_sql = str(self.session.execute.call_args_list[0][0][0].compile())
+        self.assertIn("DELETE FROM comments WHERE comments.id IN (SELECT comments.id", delete_sql)
+        update_stmt = self.session.execute.call_args_list[1][0][0]
+        self.assertIn("reply_count=(comments.reply_count - decrements.replies)", str(update_stmt.compile()))
+        self.session.commit.assert_not_called()
+
+    async def test_hide_comments_by_user(self):
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        self.session.execute.return_value = mock_result
+
+        result = await self.comment_repository.purge_comments_by_user(user_id=1, batch_size=1000, hide=True)
+
+        self.assertEqual(result, 0)
+        self.session.execute.assert_awaited_once()
+        sql = str(self.session.execute.call_args[0][0].compile())
+        self.assertIn("UPDATE comments SET is_hidden=", sql)
+        self.assertIn("comments.is_hidden IS false", sql)
+
+    async def test_search_comments(self):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [self.comment]
+        self.session.execute.return_value = mock_result
+
+        result = await self.comment_repository.search_comments(
+            "spam -ham", 20, user_id=1, after=(datetime(2026, 1, 1), 5)
+        )
+
+        self.assertEqual(result, [self.comment])
+        sql = str(self.session.execute.call_args[0][0].compile())
+        self.assertIn("to_tsvector('simple', comments.comment) @@ websearch_to_tsquery('simple',", sql)
+        self.assertIn("comments.user_id =", sql)
+        self.assertIn("(comments.created_at, comments.id) <", sql)
+
     async def test_delete_comment_by_post_id(self):
         post_id = 1
 
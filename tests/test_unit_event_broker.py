@@ -0,0 +1,31 @@
+import unittest
+
+from src.services.events import EventBroker, RESET_FRAME, sse_frame
+
+
+class TestEventBroker(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.broker = EventBroker(buffer_size=2, heartbeat=1)
+
+    async def test_publish_reaches_subscribers_of_the_post(self):
+        async with self.broker.subscribe(1) as subscription, self.broker.subscribe(2) as other:
+            await self.broker.publish(1, "comment.created", {"id": 5})
+
+            self.assertEqual(subscription.queue.get_nowait(), sse_frame("comment.created", {"id": 5}))
+            self.assertTrue(other.queue.empty())
+
+        self.assertEqual(self.broker._subscriptions, {})
+
+    async def test_slow_subscriber_is_reset(self):
+        async with self.broker.subscribe(1) as subscription:
+            for comment_id in range(3):
+                await self.broker.publish(1, "comment.created", {"id": comment_id})
+
+            frames = [frame async for frame in subscription.frames(heartbeat=1)]
+
+        self.assertTrue(subscription.closed)
+        self.assertEqual(frames, [RESET_FRAME])
+
+    def test_sse_frame(self):
+        self.assertEqual(sse_frame("score.created", {"score": 5}), b'event: score.created\ndata: {"score":5}\n\n')
@@ -2,8 +2,8 @@ import unittest
 from unittest.mock import MagicMock, AsyncMock
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import delete
-from src.urls.models import URLs
-from src.urls.repository import URLRepository
+from src.urls.models import StoredImage, URLs
+from src.urls.repository import StoredImageRepository, URLRepository
 
 from faker import Faker
 
@@ -79,4 +79,49 @@ class TestAsyncURLs(unittest.IsolatedAsyncioTestCase):
         called_stmt = self.session.execute.call_args[0][0]
         self.assertIsInstance(called_stmt, delete)
         self.assertEqual(called_stmt.whereclause.left.key, "post_id")
-        self.assertEqual(called_stmt.whereclause.right.value, post_id)
\ No newline at end of file
+        self.assertEqual(called_stmt.whereclause.right.value, post_id)
+
+class TestAsyncStoredImages(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.session = MagicMock(spec=AsyncSession)
+        self.session.execute = AsyncMock()
+        self.stored_image_repository = StoredImageRepository(self.session)
+        self.stored_image = StoredImage(
+            digest="a" * 64,
+            public_id=f"first_app/{'a' * 64}",
+            secure_url="http://example.com/image1.png",
+            ref_count=1,
+        )
+
+    async def test_get_image_by_digest(self):
+        self.session.execute.return_value.scalar_one_or_none = lambda: self.stored_image
+
+        result = await self.stored_image_repository.get_image_by_digest(self.stored_image.digest)
+
+        self.session.execute.assert_called_once()
+        self.assertEqual(result.public_id, self.stored_image.public_id)
+
+    async def test_add_reference(self):
+        self.session.execute.return_value.scalar_one = lambda: self.stored_image
+
+        result = await self.stored_image_repository.add_reference(
+            self.stored_image.digest, self.stored_image.public_id, self.stored_image.secure_url
+        )
+
+        self.session.execute.assert_called_once()
+        self.assertEqual(result.digest, self.stored_image.digest)
+
+    async def test_release_last_reference(self):
+        self.session.execute.return_value.scalar_one_or_none = lambda: self.stored_image.public_id
+
+        result = await self.stored_image_repository.release_reference(self.stored_image.public_id)
+
+        self.assertEqual(self.session.execute.await_count, 2)
+        self.assertEqual(result, self.stored_image.public_id)
+
+    async def test_release_shared_reference(self):
+        self.session.execute.return_value.scalar_one_or_none = lambda: None
+
+        result = await self.stored_image_repository.release_reference(self.stored_image.public_id)
+
+        self.assertIsNone(result)
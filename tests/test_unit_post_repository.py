@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import MagicMock, AsyncMock
 
 from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 from faker import Faker
 
@@ -167,6 +168,22 @@ class TestPosts(unittest.IsolatedAsyncioTestCase):
         self.assertIn(f"lower(tags.name) LIKE lower('%{tag}%')", sql)  # Обновлённое условие
         self.assertIn(f"lower(posts.description) LIKE lower('%{keyword}%')", sql)
 
+    async def test_get_post_rows(self):
+        row = {"id": 1, "image_url": self.post.image_url, "tags": [{"id": 1, "name": "tag_1"}]}
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = [row]
+        self.session.execute.return_value = mock_result
+
+        rows = await self.post_repository.get_post_rows(10, 0, None, "test")
+        self.session.execute.assert_awaited_once()
+        actual_stmt = self.session.execute.call_args[0][0]
+        sql = str(actual_stmt.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("json_agg", sql)
+        self.assertIn("lower(tags.name) LIKE lower('%test%')", sql)
+        self.assertNotIn("posts.original_image_url", sql)
+        self.assertIn("LIMIT 10", sql)
+        self.assertEqual(rows, [row])
+
     async def test_update_post(self):
         post = await self.post_repository.update_post_description(self.post, self.description)
         self.session.commit.assert_called_once()
@@ -180,3 +197,12 @@ class TestPosts(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(post.description, self.post.description)
         self.assertIsInstance(post, Post)
 
+
+    async def test_add_post_views(self):
+        await self.post_repository.add_post_views([(1, 3), (2, 1)])
+        self.session.execute.assert_awaited_once()
+        actual_stmt = self.session.execute.call_args[0][0]
+        sql = str(actual_stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("UPDATE posts SET view_count=(posts.view_count + increments.views)", sql)
+        self.assertIn("updated_at=posts.updated_at", sql)
+        self.assertIn("FROM (VALUES", sql)
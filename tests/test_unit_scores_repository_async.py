@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, AsyncMock
 from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.scores.models import Score
@@ -52,7 +53,7 @@ class TestScoreRepository(unittest.IsolatedAsyncioTestCase):
 
         updated_score = await self.score_repository.update_score(1, score_data)
         stmt = self.session.execute.call_args[0][0]
-        expected_stmt = select(Score).where(Score.id == 1)
+        expected_stmt = select(Score).where(Score.id == 1).with_for_update()
 
         self.assertEqual(str(stmt), str(expected_stmt))
         self.session.commit.assert_called_once()
@@ -101,3 +102,91 @@ class TestScoreRepository(unittest.IsolatedAsyncioTestCase):
 
         not_exists = await self.score_repository.score_exists(2, 2)
         self.assertFalse(not_exists)
+
+    async def test_rate_post(self):
+        row = {"owner_id": 2, "id": 4, "post_id": 1, "user_id": 1, "score": 5}
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.one_or_none.return_value = row
+        self.session.execute.return_value = mock_result
+
+        result = await self.score_repository.rate_post(1, 1, 5)
+        stmt = self.session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        self.assertIn("INSERT INTO scores", sql)
+        self.assertIn("ON CONFLICT (post_id, user_id) DO NOTHING", sql)
+        self.session.execute.assert_awaited_once()
+        self.session.commit.assert_called_once()
+        self.assertEqual(result, row)
+
+    async def test_adjust_histograms(self):
+        await self.score_repository.adjust_histograms([(1, 4, -1), (1, 5, 1), (2, 3, 1)])
+        stmt = self.session.execute.call_args[0][0]
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        self.session.execute.assert_awaited_once()
+        self.assertIn("ON CONFLICT (post_id) DO UPDATE SET count_1 = (post_score_histogram.count_1 + excluded.count_1)", sql)
+        self.assertEqual(params["count_4_m0"], -1)
+        self.assertEqual(params["count_5_m0"], 1)
+        self.assertEqual(params["count_3_m1"], 1)
+        self.session.commit.assert_not_called()
+
+    async def test_adjust_histograms_empty(self):
+        await self.score_repository.adjust_histograms([])
+        self.session.execute.assert_not_awaited()
+
+
+    async def test_get_histograms_by_post_ids(self):
+        row = {"post_id": 1, "count_1": 0, "count_2": 0, "count_3": 1, "count_4": 2, "count_5": 3}
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = [row]
+        self.session.execute.return_value = mock_result
+
+        result = await self.score_repository.get_histograms_by_post_ids([1, 2])
+        sql = str(self.session.execute.call_args[0][0])
+
+        self.session.execute.assert_awaited_once()
+        self.assertIn("post_score_histogram.post_id IN", sql)
+        self.assertEqual(result, [row])
+
+    async def test_apply_score_changes(self):
+        await self.score_repository.apply_score_changes([(1, 4, -1), (1, 5, 1)])
+        stats_stmt = self.session.execute.call_args_list[-1][0][0]
+        params = stats_stmt.compile().params
+
+        self.assertEqual(self.session.execute.await_count, 2)
+        self.assertIn("UPDATE score_stats", str(stats_stmt))
+        self.assertEqual(params["score_count_1"], 0)
+        self.assertEqual(params["score_sum_1"], 1)
+
+    async def test_rate_posts(self):
+        row = {"target_post_id": 1, "target_user_id": 1, "owner_id": 2, "id": 4, "post_id": 1, "user_id": 1, "score": 5}
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = [row]
+        self.session.execute.return_value = mock_result
+
+        result = await self.score_repository.rate_posts([(1, 1, 5), (2, 1, 3)])
+        sql = str(self.session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+
+        self.session.execute.assert_awaited_once()
+        self.session.commit.assert_called_once()
+        self.assertIn("ON CONFLICT (post_id, user_id) DO NOTHING", sql)
+        self.assertIn("INSERT INTO post_score_histogram", sql)
+        self.assertIn("UPDATE score_stats", sql)
+        self.assertEqual(result, {(1, 1): row})
+
+    async def test_purge_scores_by_user(self):
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(1, 5), (2, 3)]
+        self.session.execute.return_value = mock_result
+
+        result = await self.score_repository.purge_scores_by_user(1, 1000)
+        delete_stmt = self.session.execute.call_args_list[0][0][0]
+        sql = str(delete_stmt.compile(dialect=postgresql.dialect()))
+
+        self.assertEqual(result, [(1, 5), (2, 3)])
+        self.assertIn("DELETE FROM scores WHERE scores.id IN (SELECT scores.id", sql)
+        self.assertIn("RETURNING scores.post_id, scores.score", sql)
+        self.assertIn("UPDATE score_stats", str(self.session.execute.call_args_list[-1][0][0]))
+        self.session.commit.assert_not_called()
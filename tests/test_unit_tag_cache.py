@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from sqlalchemy import inspect
+
+from src.posts.repository import _tag_condition
+from src.tags.cache import TagCache
+from src.tags.models import Tag
+
+
+class TestTagCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache = TagCache()
+        self.cache.add({Tag(id=1, name="cat"), Tag(id=2, name="cats"), Tag(id=3, name="dog")})
+        self.cache._version = (3, 3)
+
+    def test_lookup(self):
+        found, missing = self.cache.lookup({"cat", "bird"})
+
+        self.assertEqual({(tag.id, tag.name) for tag in found}, {(1, "cat")})
+        self.assertEqual(missing, {"bird"})
+        self.assertTrue(inspect(next(iter(found))).detached)
+
+    def test_discard(self):
+        self.cache.discard("cat")
+
+        self.assertEqual(self.cache.lookup({"cat"})[1], {"cat"})
+
+    def test_match_ids(self):
+        self.assertEqual(sorted(self.cache.match_ids("CAT")), [1, 2])
+        self.assertEqual(self.cache.match_ids("bird"), [])
+
+    def test_suggest(self):
+        self.cache.add({Tag(id=2, name="cats")})
+        self.cache.add({Tag(id=4, name="caterpillar")})
+
+        suggestions = self.cache.suggest("cat", 10)
+
+        self.assertEqual([(tag.name, count) for tag, count in suggestions], [("cats", 2), ("cat", 1), ("caterpillar", 1)])
+        self.assertEqual([tag.name for tag, _ in self.cache.suggest("cat", 1)], ["cats"])
+        self.assertEqual(self.cache.suggest("bird", 10), [])
+
+    def test_suggest_after_changes(self):
+        self.assertEqual([tag.name for tag, _ in self.cache.suggest("c", 10)], ["cat", "cats"])
+
+        self.cache.add({Tag(id=4, name="cow")})
+        self.cache.add({Tag(id=4, name="cow")})
+        self.cache.discard("cat")
+
+        self.assertEqual([tag.name for tag, _ in self.cache.suggest("c", 10)], ["cow", "cats"])
+
+    def test_count_deleted_posts(self):
+        self.cache.add({Tag(id=1, name="cat")}, -1)
+        self.cache.add({Tag(id=5, name="bird")}, -1)
+
+        self.assertEqual([(tag.name, count) for tag, count in self.cache.suggest("", 10)], [("cats", 1), ("dog", 1), ("cat", 0)])
+        self.assertEqual(self.cache.lookup({"bird"})[1], {"bird"})
+
+    def test_tag_condition_uses_cached_ids(self):
+        with patch("src.posts.repository.tag_cache", self.cache):
+            cached_sql = str(_tag_condition("cat").compile())
+            wildcard_sql = str(_tag_condition("c_t").compile())
+            unknown_sql = str(_tag_condition("bird").compile())
+
+        self.assertIn("post_tag.tag_id IN", cached_sql)
+        self.assertNotIn("tags.name", cached_sql)
+        self.assertIn("lower(tags.name) LIKE lower(", wildcard_sql)
+        self.assertIn("lower(tags.name) LIKE lower(", unknown_sql)
@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import MagicMock, AsyncMock
+from datetime import datetime
+from unittest.mock import MagicMock, AsyncMock, patch
 
 from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,8 +8,10 @@ from faker import Faker
 
 from conf import const
 from src.posts.models import Post
+from src.tags.cache import TagCache
 from src.tags.repository import TagRepository
-from src.tags.models import Tag
+from src.tags.tag_service import TagService
+from src.tags.models import Tag, TagUsageBucket
 from src.users.models import User
 
 faker = Faker()
@@ -127,4 +130,81 @@ class TestContacts(unittest.IsolatedAsyncioTestCase):
         self.session.commit.assert_not_called()
         self.assertIsNone(result)
 
+    async def test_upsert_tags(self):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [self.tag_1, self.tag_2]
+        self.session.execute.return_value = mock_result
+        result = await self.tags_repository.upsert_tags({"tag_2", "tag_1"})
+        self.session.execute.assert_called_once()
+        stmt = str(self.session.execute.call_args[0][0])
+        self.assertIn("ON CONFLICT (name) DO UPDATE", stmt)
+        self.assertIn("RETURNING", stmt)
+        self.session.commit.assert_not_called()
+        self.assertEqual(result, {self.tag_1, self.tag_2})
+
+    async def test_upsert_tags_empty(self):
+        result = await self.tags_repository.upsert_tags(set())
+        self.session.execute.assert_not_called()
+        self.assertEqual(result, set())
+
+    async def test_suggest_tags(self):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [self.tag_1]
+        self.session.execute.return_value = mock_result
+        result = await self.tags_repository.suggest_tags("tag_", 5)
+        stmt = self.session.execute.call_args[0][0].compile()
+        self.assertIn("tags.name LIKE", str(stmt))
+        self.assertIn("ORDER BY tags.post_count DESC", str(stmt))
+        self.assertIn("tag\\_%", stmt.params.values())
+        self.assertEqual(result, [self.tag_1])
+
+    async def test_add_tag_usage(self):
+        bucket_start = TagUsageBucket.bucket_of(datetime(2026, 10, 19, 14, 35, 12))
+        await self.tags_repository.add_tag_usage({2: 1, 1: 3}, bucket_start)
+        self.assertEqual(self.session.execute.await_count, 2)
+        update_sql = str(self.session.execute.call_args_list[0][0][0].compile())
+        self.assertIn("UPDATE tags SET post_count=(tags.post_count + CASE tags.id WHEN", update_sql)
+        insert_stmt = self.session.execute.call_args_list[1][0][0].compile()
+        self.assertIn("ON CONFLICT (tag_id, bucket_start) DO UPDATE", str(insert_stmt))
+        self.assertIn(datetime(2026, 10, 19, 14), insert_stmt.params.values())
+        self.session.commit.assert_not_called()
+
+    async def test_add_tag_usage_empty(self):
+        await self.tags_repository.add_tag_usage({}, datetime(2026, 10, 19, 14))
+        self.session.execute.assert_not_called()
 
+    async def test_get_trending_tags(self):
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(self.tag_1, 4)]
+        self.session.execute.return_value = mock_result
+        result = await TagService(self.session).get_trending_tags(10)
+        sql = str(self.session.execute.call_args[0][0].compile())
+        self.assertIn("sum(tag_usage_buckets.uses)", sql)
+        self.assertIn("tag_usage_buckets.bucket_start >=", sql)
+        self.assertNotIn("post_tag", sql)
+        self.assertEqual(result[0]["recent_post_count"], 4)
+
+    async def test_get_or_create_tags(self):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [self.tag_1, self.tag_2]
+        self.session.execute.return_value = mock_result
+        result = await TagService(self.session).get_or_create_tags({"tag_1", "tag_2"})
+        self.session.execute.assert_called_once()
+        self.session.add.assert_not_called()
+        self.session.commit.assert_not_called()
+        self.session.refresh.assert_not_called()
+        self.assertEqual(result, {self.tag_1, self.tag_2})
+
+    async def test_get_or_create_tags_from_cache(self):
+        cache = TagCache()
+        cache.add({self.tag_1})
+        self.session.merge = AsyncMock(side_effect=lambda tag, load: tag)
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [self.tag_2]
+        self.session.execute.return_value = mock_result
+        with patch("src.tags.tag_service.tag_cache", cache):
+            result = await TagService(self.session).get_or_create_tags({"tag_1", "tag_2"})
+        self.session.merge.assert_awaited_once()
+        self.assertFalse(self.session.merge.call_args.kwargs["load"])
+        self.assertIn("ON CONFLICT (name) DO UPDATE", str(self.session.execute.call_args[0][0]))
+        self.assertEqual({(tag.id, tag.name) for tag in result}, {(1, "tag_1"), (2, "tag_2")})
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from src.moderation.word_filter import WordFilter, enforce_word_filter
+
+
+class TestWordFilter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.word_filter = WordFilter()
+        self.word_filter.load_terms(["# comment", "spam", "spammer", "~scam", "", "free.money"])
+
+    def test_check_matches_whole_words(self):
+        match = self.word_filter.check("SPAMMER alert: no spams, but Spam and a scam with free.money")
+
+        self.assertEqual(match.blocked, ["spammer", "spam", "free.money"])
+        self.assertEqual(match.flagged, ["scam"])
+
+    def test_check_without_terms(self):
+        match = WordFilter().check("spam")
+
+        self.assertEqual(match.blocked, [])
+        self.assertEqual(match.flagged, [])
+
+    def test_term_listed_twice_blocks(self):
+        self.word_filter.load_terms(["~scam", "scam"])
+
+        self.assertEqual(self.word_filter.check("scam").blocked, ["scam"])
+
+    async def test_reload_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "terms.txt"
+            path.write_text("spam\n")
+            word_filter = WordFilter(path)
+
+            self.assertTrue(await word_filter.reload())
+            self.assertFalse(await word_filter.reload())
+            self.assertEqual(word_filter.check("spam").blocked, ["spam"])
+
+            path.write_text("scam\n")
+            os.utime(path, (0, 0))
+            self.assertTrue(await word_filter.reload())
+            self.assertEqual(word_filter.check("spam").blocked, [])
+            self.assertEqual(word_filter.check("scam").blocked, ["scam"])
+
+    def test_enforce_word_filter(self):
+        with patch("src.moderation.word_filter.word_filter", self.word_filter):
+            enforce_word_filter("a scam", "comment")
+            with self.assertRaises(HTTPException) as context:
+                enforce_word_filter("buy spam", "comment")
+
+        self.assertEqual(context.exception.status_code, 400)